@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Microbenchmark: TEMPLATE_HTML_MINIFY, legacy regex vs utils.html_minify.
+
+By default the corpus is the .ntpl sources of the largest pages
+(cmp_5000_user and cmp_7040_admin), one document per component. Rendered
+pages can be added with --file, e.g. saved with:
+
+    curl -s http://localhost:5000/ > /tmp/home.html
+
+For each document it reports the time per call of the legacy multiline regex,
+minify_html() and the streaming HtmlMinifier (--chunk-kb chunks), the output
+size, and whether the new output matches the legacy one (it differs only
+inside pre, textarea, script, style, xmp and comments, which the regex did
+not skip).
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import re
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+COMPONENTS = ("cmp_5000_user", "cmp_7040_admin")
+
+LEGACY = re.compile(
+    r"^\s+<(?!pre\b|code\b|samp\b|kbd\b|var\b|textarea\b|xmp\b|script\b|style\b|template\b)([^>]+>)",
+    re.MULTILINE,
+)
+
+
+def _load_minifier():
+    # Loaded by path: importing the utils package pulls in the app config.
+    path = PROJECT_ROOT / "src" / "utils" / "html_minify.py"
+    spec = importlib.util.spec_from_file_location("html_minify", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _corpus(files: list[str]) -> list[tuple[str, str]]:
+    docs = []
+    for name in COMPONENTS:
+        sources = sorted((PROJECT_ROOT / "src" / "component" / name).rglob("*.ntpl"))
+        docs.append((f"{name} (*.ntpl)", "\n".join(p.read_text(encoding="utf-8") for p in sources)))
+    for file in files:
+        docs.append((file, Path(file).read_text(encoding="utf-8")))
+    return docs
+
+
+def _time(func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", action="append", default=[], help="rendered HTML page to add")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--chunk-kb", type=int, default=16)
+    args = parser.parse_args()
+
+    html_minify = _load_minifier()
+    chunk = args.chunk_kb * 1024
+
+    def stream(text: str) -> str:
+        minifier = html_minify.HtmlMinifier()
+        parts = [minifier.feed(text[i:i + chunk]) for i in range(0, len(text), chunk)]
+        parts.append(minifier.close())
+        return "".join(parts)
+
+    print(f"{'document':<40} {'KB':>6} {'legacy us':>10} {'new us':>8} {'stream us':>10} "
+          f"{'speedup':>8} {'out KB':>7}  same")
+    for label, text in _corpus(args.file):
+        legacy = LEGACY.sub(r"<\1", text)
+        output = html_minify.minify_html(text)
+        assert stream(text) == output
+
+        legacy_us = _time(lambda text=text: LEGACY.sub(r"<\1", text), args.iterations)
+        new_us = _time(lambda text=text: html_minify.minify_html(text), args.iterations)
+        stream_us = _time(lambda text=text: stream(text), args.iterations)
+        print(
+            f"{label[-40:]:<40} {len(text) / 1024:6.1f} {legacy_us:10.0f} {new_us:8.0f} "
+            f"{stream_us:10.0f} {legacy_us / new_us:7.1f}x {len(output) / 1024:7.1f}  "
+            f"{'yes' if output == legacy else 'no'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Microbenchmark: Neutral IPC record framing, legacy copy path vs scatter-gather.
+
+Runs renders against an in-process fake IPC server over a socketpair, so it
+needs no neutral-ipc server. For each path it reports the time per render and
+the bytes copied in user space per render:
+
+- legacy: header + content1 + content2 concatenation on send; recv() chunks,
+  b''.join() and decode on receive.
+- current: sendmsg() with the header and content buffers; recv_into() a
+  preallocated bytearray, decode once from a memoryview.
+"""
+
+from __future__ import annotations
+
+import argparse
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+def _bootstrap_path() -> None:
+    project_root = Path(__file__).resolve().parent.parent
+    sys.path.insert(0, str(project_root / "src"))
+
+
+_bootstrap_path()
+
+from neutral_ipc_template.neutral_ipc_template import (  # noqa: E402  pylint: disable=wrong-import-position
+    NeutralIpcClient,
+    NeutralIpcConnectionPool,
+    NeutralIpcRecord,
+)
+
+
+class _SocketPairPool(NeutralIpcConnectionPool):
+    """Pool that always hands out the client end of one socketpair."""
+
+    def __init__(self, conn):
+        super().__init__("", 0, 10)
+        self.conn = conn
+
+    def acquire(self):
+        return self.conn, True
+
+    def release(self, conn):
+        pass
+
+
+def _serve(conn, page: bytes) -> None:
+    """Fake IPC server: read each record and answer with a fixed page."""
+    header_len = NeutralIpcRecord.HEADER_LEN
+    result = b'{"status_code":"200"}'
+    response = NeutralIpcRecord.encode_record(
+        NeutralIpcRecord.CTRL_STATUS_OK, NeutralIpcRecord.CONTENT_JSON, result,
+        NeutralIpcRecord.CONTENT_TEXT, page,
+    )
+    while True:
+        header = conn.recv(header_len, socket.MSG_WAITALL)
+        if len(header) < header_len:
+            return
+        decoded = NeutralIpcRecord.decode_header(header)
+        remaining = decoded["length-1"] + decoded["length-2"]
+        while remaining:
+            remaining -= len(conn.recv(min(remaining, 1 << 20)))
+        conn.sendall(response)
+
+
+def _legacy_render(conn, schema: bytes, template: str) -> str:
+    """The framing used before scatter-gather I/O."""
+    length2 = len(template.encode("utf-8"))
+    header = NeutralIpcRecord.encode_header(
+        NeutralIpcRecord.CTRL_PARSE_TEMPLATE, NeutralIpcRecord.CONTENT_MSGPACK, len(schema),
+        NeutralIpcRecord.CONTENT_PATH, length2,
+    )
+    conn.sendall(header + schema + template.encode("utf-8"))
+    response = NeutralIpcRecord.decode_header(conn.recv(NeutralIpcRecord.HEADER_LEN, socket.MSG_WAITALL))
+
+    def read(length):
+        chunks = []
+        while length > 0:
+            chunk = conn.recv(min(8192, length))
+            chunks.append(chunk)
+            length -= len(chunk)
+        return b"".join(chunks).decode("utf-8")
+
+    read(response["length-1"])
+    return read(response["length-2"])
+
+
+def _current_render(pool, schema: bytes, template: str) -> str:
+    client = NeutralIpcClient(
+        NeutralIpcRecord.CTRL_PARSE_TEMPLATE, NeutralIpcRecord.CONTENT_MSGPACK, schema,
+        NeutralIpcRecord.CONTENT_PATH, template, pool=pool,
+    )
+    return client.start()["content-2"]
+
+
+def _bench(label, render, renders: int) -> None:
+    start = time.perf_counter()
+    for _ in range(renders):
+        render()
+    elapsed = (time.perf_counter() - start) / renders
+    print(f"{label:<8} {elapsed * 1e6:10.1f} us/render")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schema-kb", type=int, default=300, help="msgpack schema size")
+    parser.add_argument("--page-kb", type=int, default=100, help="rendered page size")
+    parser.add_argument("--renders", type=int, default=500)
+    args = parser.parse_args()
+
+    schema = b"s" * (args.schema_kb * 1024)
+    page = b"p" * (args.page_kb * 1024)
+    template = "/path/to/template.ntpl"
+    header_len = NeutralIpcRecord.HEADER_LEN
+    result_len = len(b'{"status_code":"200"}')
+
+    client_conn, server_conn = socket.socketpair()
+    threading.Thread(target=_serve, args=(server_conn, page), daemon=True).start()
+    pool = _SocketPairPool(client_conn)
+
+    # Send: (header + schema) then (+ template); receive: join + decode per content.
+    legacy_copies = (header_len + len(schema)) + (header_len + len(schema) + len(template))
+    legacy_copies += 2 * (result_len + len(page))
+    # Send: nothing; receive: decode once per content from the preallocated buffer.
+    current_copies = result_len + len(page)
+
+    print(f"schema {len(schema)} B, page {len(page)} B, {args.renders} renders")
+    print(f"legacy   {legacy_copies:10d} bytes copied/render")
+    print(f"current  {current_copies:10d} bytes copied/render")
+    _bench("legacy", lambda: _legacy_render(client_conn, schema, template), args.renders)
+    _bench("current", lambda: _current_render(pool, schema, template), args.renders)
+
+    client_conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
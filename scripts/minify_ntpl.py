@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Minify the .ntpl sources of the components for deployment.
+
+Applies the TEMPLATE_HTML_MINIFY minifier (utils.html_minify) to the template
+sources, so the template engine reads, parses and outputs less and the
+runtime pass has little left to strip.
+
+Without --dest or --in-place it only reports the savings. Never run it on a
+working tree you edit: use --dest to write a minified copy of the components
+directory, or --in-place on a deploy copy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import shutil
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _load_minifier():
+    # Loaded by path: importing the utils package pulls in the app config.
+    path = PROJECT_ROOT / "src" / "utils" / "html_minify.py"
+    spec = importlib.util.spec_from_file_location("html_minify", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--src", default=str(PROJECT_ROOT / "src" / "component"),
+                        help="components directory (default: src/component)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--dest", help="write a minified copy of --src here (must not exist)")
+    target.add_argument("--in-place", action="store_true", help="minify the files under --src")
+    args = parser.parse_args()
+
+    minify_html = _load_minifier().minify_html
+    src = Path(args.src).resolve()
+    root = src
+    if args.dest:
+        root = Path(args.dest).resolve()
+        if root.exists():
+            print(f"Destination exists: {root}", file=sys.stderr)
+            return 2
+        shutil.copytree(src, root, ignore=shutil.ignore_patterns("__pycache__"))
+
+    before = after = files = 0
+    for path in sorted(root.rglob("*.ntpl")):
+        text = path.read_text(encoding="utf-8")
+        minified = minify_html(text)
+        before += len(text.encode())
+        after += len(minified.encode())
+        files += 1
+        if minified != text and (args.dest or args.in_place):
+            path.write_text(minified, encoding="utf-8")
+
+    saved = before - after
+    print(f"{files} .ntpl files: {before} -> {after} bytes ({saved} saved, "
+          f"{saved / before * 100 if before else 0:.1f}%)")
+    if not (args.dest or args.in_place):
+        print("Dry run: use --dest DIR or --in-place to write the minified files.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Write .br/.zst/.gz siblings of the static files (public/ and component static/).
+
+The deploy step for compressed static files; the app only does the same at
+startup with COMPRESSION_PRECOMPRESS=true. Uses the
+COMPRESSION_* settings from config/.env; only missing or stale siblings are
+written, so it is safe to run repeatedly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+
+def _bootstrap_path() -> None:
+    """Ensure project src/ is importable when script is run from scripts/."""
+    project_root = Path(__file__).resolve().parent.parent
+    sys.path.insert(0, str(project_root / "src"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dirs", nargs="*", help="directories to process (default: public/ and enabled components)")
+    args = parser.parse_args()
+
+    _bootstrap_path()
+    from app.config import Config  # pylint: disable=import-error,import-outside-toplevel
+    from core.compression import compression  # pylint: disable=import-error,import-outside-toplevel
+
+    if not compression.encodings:
+        print("No usable encodings in COMPRESSION_ENCODINGS.", file=sys.stderr)
+        return 1
+
+    dirs = args.dirs or [Config.STATIC_FOLDER] + [
+        os.path.join(Config.COMPONENT_DIR, name, "static")
+        for name in sorted(os.listdir(Config.COMPONENT_DIR))
+        if name.startswith("cmp_") and os.path.isdir(os.path.join(Config.COMPONENT_DIR, name, "static"))
+    ]
+    print(f"Encodings: {', '.join(compression.encodings)}")
+    for directory in dirs:
+        written = compression.precompress_directory(directory)
+        print(f"{written:5d} written  {os.path.normpath(directory)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 """Initialize Flask application and register blueprints."""
 
 import ipaddress
+import logging
 import orjson
 import os
 from importlib import import_module
@@ -10,7 +11,12 @@ from flask import Flask, request, abort, g
 from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.routing import PathConverter
 
-from core.prepared_request import PreparedRequest
+from core.compression import compression
+from core.page_cache import page_cache
+from core.prepared_request import LightPreparedRequest, PreparedRequest
+from core.query_catalog import query_catalog
+from core.schema_encoder import SchemaEncoder
+from core.static_files import static_etags
 from utils.network import normalize_host, is_allowed_host
 
 from .config import Config
@@ -18,7 +24,9 @@ from .bootstrap_db import bootstrap_databases
 from .components import Components
 from .debug_guard import is_debug_enabled, is_wsgi_debug_enabled
 from .extensions import cache, limiter
+from .security_headers import SecurityHeaders
 
+logger = logging.getLogger(__name__)
 
 
 def _verify_before_request_order(app):
@@ -116,72 +124,12 @@ class TrustedProxyHeaderGuard: # pylint: disable=too-few-public-methods
         return self.app(environ, start_response)
 
 
-def add_security_headers(response): # pylint: disable=too-many-locals
+def add_security_headers(response):
     """Add security headers to the response."""
     from flask import g, current_app  # pylint: disable=import-outside-toplevel
 
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Strict-Transport-Security"] = (
-        "max-age=31536000; includeSubDomains"
-    )
-    response.headers["Referrer-Policy"] = current_app.config.get(
-        "REFERRER_POLICY", "strict-origin-when-cross-origin"
-    )
-    permissions_policy = current_app.config.get("PERMISSIONS_POLICY", "")
-    if permissions_policy:
-        response.headers["Permissions-Policy"] = permissions_policy
-
-    # Get nonce from Flask.g
-    nonce = getattr(g, "csp_nonce", None)
-    nonce_str = f" 'nonce-{nonce}'" if nonce else ""
-
-    # Content Security Policy
-    def get_csp_string(key):
-        return " ".join(filter(None, current_app.config.get(key, [])))
-
-    scripts = get_csp_string("CSP_ALLOWED_SCRIPT")
-    styles = get_csp_string("CSP_ALLOWED_STYLE")
-    images = get_csp_string("CSP_ALLOWED_IMG")
-    fonts = get_csp_string("CSP_ALLOWED_FONT")
-    connects = get_csp_string("CSP_ALLOWED_CONNECT")
-    frames = get_csp_string("CSP_ALLOWED_FRAME")
-
-    # CSP Unsafe options
-    # Note: When unsafe-inline or unsafe-eval is used, nonce is not compatible
-    script_unsafe = []
-    if current_app.config.get("CSP_ALLOWED_SCRIPT_UNSAFE_INLINE"):
-        script_unsafe.append("'unsafe-inline'")
-    if current_app.config.get("CSP_ALLOWED_SCRIPT_UNSAFE_EVAL"):
-        script_unsafe.append("'unsafe-eval'")
-
-    style_unsafe = []
-    if current_app.config.get("CSP_ALLOWED_STYLE_UNSAFE_INLINE"):
-        style_unsafe.append("'unsafe-inline'")
-
-    # Determine if nonce should be used (not compatible with unsafe-inline)
-    use_nonce = nonce and not script_unsafe and not style_unsafe
-    nonce_str = f" 'nonce-{nonce}'" if use_nonce else ""
-
-    script_unsafe_str = f" {' '.join(script_unsafe)}" if script_unsafe else ""
-    style_unsafe_str = f" {' '.join(style_unsafe)}" if style_unsafe else ""
-
-    csp = (
-        f"default-src 'self'; "
-        f"script-src 'self'{nonce_str}{script_unsafe_str} {scripts}; "
-        f"style-src 'self'{nonce_str}{style_unsafe_str} {styles}; "
-        f"img-src 'self' data: {images}; "
-        f"font-src 'self' {fonts}; "
-        f"connect-src 'self' {connects}; "
-        f"frame-src 'self' {frames}; "
-        f"frame-ancestors 'none'; "
-        f"base-uri 'self'; "
-        f"form-action 'self';"
-    )
-    response.headers["Content-Security-Policy"] = csp
-
-    return response
+    # Compiled in create_app; only the CSP nonce (from Flask.g) varies
+    return current_app.security_headers.apply(response, getattr(g, "csp_nonce", None))
 
 
 def create_app(config_class=Config, debug=None):
@@ -257,24 +205,49 @@ def create_app(config_class=Config, debug=None):
             bp_name = str(request.endpoint).split(".", 1)[0]
             component_bp = app.blueprints.get(bp_name)
 
+        # Anonymous page cache: a hit is served without building the request
+        page = page_cache.match(request, component_bp)
+        if page is not None:
+            cached = page_cache.serve(request, page)
+            if cached is not None:
+                return cached
+
         # Use request.path for security evaluation (full path)
         full_path = request.path
 
-        g.pr = PreparedRequest(request).build(
-            component_bp=component_bp,
-            full_path=full_path
-        )
+        # Light routes: manifest policy only, the rest is built on first use
+        pr = None
+        if LightPreparedRequest.matches(component_bp, full_path):
+            pr = LightPreparedRequest(request, component_bp, full_path)
+
+        if pr is None or not pr.allowed:
+            pr = PreparedRequest(request).build(
+                component_bp=component_bp,
+                full_path=full_path
+            )
+
+        g.pr = pr
         if not g.pr.allowed:
             # Design stage behavior: generic unauthorized response for all deny cases.
             return g.pr.view.render_error(401, HTTPStatus(401).phrase, "Unauthorized")
 
+        if page is not None:
+            page_cache.render_with_placeholders(g.pr, page)
+
     # Verify mandatory execution order: reject_disallowed_host must run before prepare_request_context
     # This is a security invariant - if order is wrong, the app must fail to start
     _verify_before_request_order(app)
 
+    # Registered first so it runs last: compresses the final body and headers
+    app.after_request(compression.compress_response)
+
     # Register security headers
+    app.security_headers = SecurityHeaders(app.config)
     app.after_request(add_security_headers)
 
+    # Registered last so it runs first: later handlers see the final page body
+    app.after_request(page_cache.store)
+
     class AnyExtensionConverter(PathConverter):  # pylint: disable=too-few-public-methods
         """Capture any path that contains a dot (like files with extension)."""
 
@@ -283,7 +256,39 @@ def create_app(config_class=Config, debug=None):
     app.url_map.converters["anyext"] = AnyExtensionConverter
     app.components = Components(app)
 
+    # Compile model queries once; in debug mode reload a model file when it changes
+    query_catalog.reload_on_change = app.debug
+    catalog_problems = query_catalog.preload(
+        app.config["MODEL_DIR"],
+        db_types={app.config["DB_PWA_TYPE"], app.config["DB_SAFE_TYPE"], app.config["DB_IMAGE_TYPE"]},
+    )
+    for problem in catalog_problems:
+        logger.warning("model %s", problem)
+
+    # Compressed siblings of static files, served by core.static_files.send_static;
+    # opt-in, deploys normally write them with scripts/precompress_static.py
+    static_dirs = [app.config["STATIC_FOLDER"], *app.components.static_dirs()]  # pylint: disable=no-member
+    if app.config.get("COMPRESSION_PRECOMPRESS") and compression.encodings:
+        for directory in static_dirs:
+            written = compression.precompress_directory(directory)
+            if app.debug and written:
+                print(f"✓ precompressed {written} files in {directory}")
+
+    # Content-hash ETags of the static files and their siblings, after precompression
+    if app.config.get("STATIC_ETAG_PRECOMPUTE"):
+        for directory in static_dirs:
+            static_etags.precompute(directory)
+
     # Pre-serialize schema for performance copy
     app.schema_json = orjson.dumps(app.components.schema)  # pylint: disable=no-member
 
+    # Immutable base layered under every request schema (see Schema._default)
+    app.schema_base = orjson.loads(app.schema_json)  # pylint: disable=no-member
+
+    # Base + route/schema.json per component, sharing untouched branches with the base
+    app.schema_snapshots = app.components.schema_snapshots(app.schema_base)  # pylint: disable=no-member
+
+    # Pre-encode the static schema once; renders only encode what a request changes
+    app.schema_encoder = SchemaEncoder(app.schema_base)  # pylint: disable=no-member
+
     return app
@@ -3,32 +3,35 @@
 from __future__ import annotations
 
 from core.model import Model
-from core.user import RESERVED_USERNAMES
+from core.schema_state import ensure_schema
+from core.user import RBAC_SCHEMA_STEPS, RBAC_SCHEMA_VERSION, RESERVED_USERNAMES
 
-
-
-
-def _run_operation(model, model_name: str, operation: str, data=None) -> None:
-    model.exec(model_name, operation, data)
-    if model.has_error:
-        detail = model.last_error or model.user_error or "Unknown database error"
-        raise RuntimeError(f"{model_name}.{operation} failed: {detail}")
+# Bump a scope's version whenever its setup-* operations change, so existing
+# databases run them again on the next bootstrap.
+APP_SCHEMA_VERSION = 1
+USER_SCHEMA_VERSION = 2
+SESSION_SCHEMA_VERSION = 1
+IMAGE_SCHEMA_VERSION = 2
 
 
 def _seed_reserved_usernames(model) -> None:
     """Insert the built-in reserved usernames into the blacklist."""
-    for username in RESERVED_USERNAMES:
-        _run_operation(
-            model,
-            "user",
-            "upsert-username-blacklist",
+    model.exec_many(
+        "user",
+        "upsert-username-blacklist",
+        [
             {
                 "username": username,
                 "reason": "reserved",
                 "expires_at": None,
                 "created": 0,
-            },
-        )
+            }
+            for username in RESERVED_USERNAMES
+        ],
+    )
+    if model.has_error:
+        detail = model.last_error or model.user_error or "Unknown database error"
+        raise RuntimeError(f"user.upsert-username-blacklist failed: {detail}")
 
 
 def bootstrap_databases(
@@ -39,15 +42,28 @@ def bootstrap_databases(
     db_image_url: str,
     db_image_type: str,
 ) -> None:
-    """Create/upgrade core schema in pwa/safe/image databases."""
+    """Create/upgrade core schema in pwa/safe/image databases.
+
+    Each scope runs only if its version recorded in schema_state is older
+    than the one defined here.
+    """
     pwa_model = Model(db_pwa_url, db_pwa_type.lower())
     safe_model = Model(db_safe_url, db_safe_type.lower())
     image_model = Model(db_image_url, db_image_type.lower())
 
-    _run_operation(pwa_model, "app", "setup-base")
-    _run_operation(pwa_model, "user", "setup-base")
-    _run_operation(pwa_model, "user", "setup-rbac")
-    _seed_reserved_usernames(pwa_model)
+    ensure_schema(pwa_model, db_pwa_url, "app", APP_SCHEMA_VERSION, [("app", "setup-base")])
+    ensure_schema(
+        pwa_model,
+        db_pwa_url,
+        "user",
+        USER_SCHEMA_VERSION,
+        [("user", "setup-base"), _seed_reserved_usernames],
+    )
+    ensure_schema(pwa_model, db_pwa_url, "rbac", RBAC_SCHEMA_VERSION, RBAC_SCHEMA_STEPS)
 
-    _run_operation(safe_model, "session", "setup-base")
-    _run_operation(image_model, "image", "setup-base")
+    ensure_schema(
+        safe_model, db_safe_url, "session", SESSION_SCHEMA_VERSION, [("session", "setup-base")]
+    )
+    ensure_schema(
+        image_model, db_image_url, "image", IMAGE_SCHEMA_VERSION, [("image", "setup-base")]
+    )
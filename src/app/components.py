@@ -9,7 +9,8 @@ from importlib import import_module
 from flask import Blueprint
 
 from constants import UUID_MAX_LEN, UUID_MIN_LEN
-from utils.utils import merge_dict, parse_vars
+from core.route_policy import RoutePolicy
+from utils.utils import merge_dict, merge_shared, parse_vars
 
 from .config import Config
 from .config_db import ensure_config_db, get_component_custom_override
@@ -168,6 +169,8 @@ class Components:
                     )
 
                 if hasattr(module, "bp") and module.bp is not None:
+                    # Route maps of the manifest, compiled once for request lookups
+                    module.bp.route_policy = RoutePolicy(component["manifest"])
                     self.app.register_blueprint(module.bp)
                     component["bp"] = module.bp.name
                     if self.app.debug:
@@ -190,6 +193,38 @@ class Components:
                 if self.app.debug:
                     print(f"✓ bp_schema for {component['name']} uuid:{uuid}")
 
+    def schema_snapshots(self, base):
+        """Return {uuid: base + route/schema.json} for components with a bp_schema.
+
+        Built once at startup so requests start from their component's schema
+        instead of merging the blueprint schema each time. A snapshot shares
+        every branch the blueprint schema does not touch with base.
+        """
+        snapshots = {}
+        for uuid, component in self.collection.items():
+            schema_path = self.schema["data"].get(uuid, {}).get("bp_schema")
+            if not schema_path:
+                continue
+
+            with open(schema_path, "r", encoding="utf-8") as file:
+                bp_schema = json.load(file)
+
+            snapshots[uuid] = merge_shared(base, bp_schema)
+            if self.app.debug:
+                size = len(json.dumps(bp_schema))
+                print(f"✓ schema snapshot for {component['name']} uuid:{uuid} (+{size} bytes)")
+
+        return snapshots
+
+    def static_dirs(self):
+        """Return the static/ directories of the registered components."""
+        dirs = []
+        for component in self.collection.values():
+            path = os.path.join(component["path"], "static")
+            if os.path.isdir(path):
+                dirs.append(path)
+        return dirs
+
     def _component_snip(self):
         for uuid, component in self.collection.items():
             if "ntpl" in component and os.path.isfile(component["ntpl"]):
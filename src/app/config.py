@@ -70,8 +70,31 @@ class Config: # pylint: disable=too-few-public-methods
     MODEL_DIR = os.path.join(BASE_DIR, "model")
     COMPONENT_DIR = os.path.join(BASE_DIR, "component")
 
+    # Anonymous full-response cache for routes that opt in ("page_cache" in manifest.json)
+    PAGE_CACHE_BACKEND = config.get('PAGE_CACHE_BACKEND', 'local')
+    PAGE_CACHE_MAX_ENTRIES = int(config.get('PAGE_CACHE_MAX_ENTRIES', 1000))
+    PAGE_CACHE_IGNORE_COOKIES = [
+        item.strip() for item in config.get('PAGE_CACHE_IGNORE_COOKIES', '').split(',') if item.strip()
+    ]
+
     STATIC_FOLDER = os.path.join(BASE_DIR, "..", "public")
     STATIC_CACHE_CONTROL = config.get('STATIC_CACHE_CONTROL', "max-age=14400")
+    # Response compression negotiated from Accept-Encoding (see core/compression.py)
+    COMPRESSION_ENCODINGS = [
+        item.strip().lower() for item in config.get('COMPRESSION_ENCODINGS', 'br,zstd,gzip').split(',')
+        if item.strip()
+    ]
+    COMPRESSION_MIN_SIZE = int(config.get('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_MIMETYPES = [
+        item.strip().lower() for item in config.get(
+            'COMPRESSION_MIMETYPES',
+            'text/html,text/css,text/plain,text/javascript,application/javascript,'
+            'application/json,application/manifest+json,application/xml,text/xml,image/svg+xml',
+        ).split(',') if item.strip()
+    ]
+    COMPRESSION_PRECOMPRESS = _env_bool(config.get('COMPRESSION_PRECOMPRESS'), False)
+    # Hash the static files at startup for their ETags (see core/static_files.py)
+    STATIC_ETAG_PRECOMPUTE = _env_bool(config.get('STATIC_ETAG_PRECOMPUTE'), True)
     CACHE_IMG = int(config.get('CACHE_IMG', 31536000))
     STATIC_CACHE_IMG_CONTROL = config.get(
         'STATIC_CACHE_IMG_CONTROL', "max-age=31536000, public, immutable"
@@ -115,6 +138,14 @@ class Config: # pylint: disable=too-few-public-methods
     SESSION_KEY = "SESSION"
     SESSION_TOKEN_LENGTH = int(config.get('SESSION_TOKEN_LENGTH', 32))
     SESSION_IDLE_EXPIRES_SECONDS = int(config.get('SESSION_IDLE_EXPIRES_SECONDS', 2592000))
+    # Runtime USER cache: local (in-process TTL + LRU), flask (Flask-Caching) or none
+    USER_CACHE_BACKEND = config.get('USER_CACHE_BACKEND', 'local')
+    USER_CACHE_TTL = int(config.get('USER_CACHE_TTL', 60))
+    USER_CACHE_MAX_ENTRIES = int(config.get('USER_CACHE_MAX_ENTRIES', 10000))
+    # Write-behind sliding-expiry updates (0 queue size = synchronous updates)
+    SESSION_TOUCH_QUEUE_SIZE = int(config.get('SESSION_TOUCH_QUEUE_SIZE', 10000))
+    SESSION_TOUCH_BATCH_SIZE = int(config.get('SESSION_TOUCH_BATCH_SIZE', 500))
+    SESSION_TOUCH_FLUSH_INTERVAL = float(config.get('SESSION_TOUCH_FLUSH_INTERVAL', 5))
     UTOKEN_KEY = "USER_SECURITY"
     UTOKEN_IDLE_EXPIRES_SECONDS = int(config.get('UTOKEN_IDLE_EXPIRES_SECONDS', 14400))
     FTOKEN_EXPIRES_SECONDS = int(config.get('FTOKEN_EXPIRES_SECONDS', 240))
@@ -202,6 +233,12 @@ class Config: # pylint: disable=too-few-public-methods
     else:
         DB_IMAGE = f"{DB_IMAGE_TYPE}://{DB_IMAGE_USER}:{DB_IMAGE_PASSWORD}@{DB_IMAGE_HOST}:{DB_IMAGE_PORT}/{DB_IMAGE_NAME}"  # pylint: disable=line-too-long
 
+    # Database connection pool (shared engine per DB URL, see core/engine.py)
+    DB_POOL_SIZE = int(config.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(config.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_PRE_PING = _env_bool(config.get('DB_POOL_PRE_PING'), True)
+    DB_POOL_RECYCLE = int(config.get('DB_POOL_RECYCLE', 1800))
+
     # Image processing
     IMAGE_THUMB_SIZE = int(config.get('IMAGE_THUMB_SIZE', 100))
     IMAGE_MEDIUM_WIDTH = int(config.get('IMAGE_MEDIUM_WIDTH', 420))
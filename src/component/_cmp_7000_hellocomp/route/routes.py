@@ -4,12 +4,13 @@
 
 import os
 
-from flask import Response, g, send_from_directory
+from flask import Response, g
 from hellocomp_0yt2sa import hellocomp
 
 from app.config import Config
 from app.extensions import require_header_set
 from core.request_handler import RequestHandler
+from core.static_files import send_static
 
 from . import bp  # pylint: disable=no-name-in-module
 from .hellocomp_handler import HelloCompRequestHandler
@@ -52,7 +53,7 @@ def hellocomp_catch_all(route) -> Response:
     if route:
         file_path = os.path.join(STATIC, route)
         if os.path.exists(file_path) and not os.path.isdir(file_path):
-            response = send_from_directory(STATIC, route)
+            response = send_static(STATIC, route)
             response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
             return response
 
@@ -1,8 +1,9 @@
 """Modern Drawer routes module."""
 
-from flask import Response, send_from_directory
+from flask import Response
 
 from app.config import Config
+from core.static_files import send_static
 
 from . import bp  # pylint: disable=no-name-in-module
 
@@ -12,7 +13,7 @@ STATIC = f"{bp.component['path']}/static"
 @bp.route("/css/moderndrawer.min.css", methods=["GET"])
 def moderndrawer_css() -> Response:
     """moderndrawer.css"""
-    response = send_from_directory(STATIC, "moderndrawer.min.css")
+    response = send_static(STATIC, "moderndrawer.min.css")
     response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
     return response
 
@@ -20,6 +21,6 @@ def moderndrawer_css() -> Response:
 @bp.route("/js/moderndrawer.min.js", methods=["GET"])
 def moderndrawer_js() -> Response:
     """moderndrawer.js"""
-    response = send_from_directory(STATIC, "moderndrawer.min.js")
+    response = send_static(STATIC, "moderndrawer.min.js")
     response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
     return response
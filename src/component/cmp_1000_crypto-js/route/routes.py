@@ -1,8 +1,9 @@
 """crypto-js routes module."""
 
-from flask import Response, send_from_directory
+from flask import Response
 
 from app.config import Config
+from core.static_files import send_static
 
 from . import bp  # pylint: disable=no-name-in-module
 
@@ -12,6 +13,6 @@ STATIC = f"{bp.component['path']}/static"
 @bp.route("/crypto-js.min.js", methods=["GET"])
 def crypto_js() -> Response:
     """Serve the vendored crypto-js bundle."""
-    response = send_from_directory(STATIC, "crypto-js.min.js")
+    response = send_static(STATIC, "crypto-js.min.js")
     response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
     return response
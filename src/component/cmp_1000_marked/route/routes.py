@@ -1,8 +1,9 @@
 """marked routes module."""
 
-from flask import Response, send_from_directory
+from flask import Response
 
 from app.config import Config
+from core.static_files import send_static
 
 from . import bp  # pylint: disable=no-name-in-module
 
@@ -12,6 +13,6 @@ STATIC = f"{bp.component['path']}/static"
 @bp.route("/marked.esm.js", methods=["GET"])
 def marked_esm() -> Response:
     """Serve the vendored marked ESM bundle."""
-    response = send_from_directory(STATIC, "marked.esm.js")
+    response = send_static(STATIC, "marked.esm.js")
     response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
     return response
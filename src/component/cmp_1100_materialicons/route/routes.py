@@ -1,8 +1,9 @@
 """materialicons routes module."""
 
-from flask import Response, send_from_directory
+from flask import Response
 
 from app.config import Config
+from core.static_files import send_static
 
 from . import bp  # pylint: disable=no-name-in-module
 
@@ -13,7 +14,7 @@ FONTS = f"{STATIC}/fonts"
 @bp.route("/materialdesignicons.min.css", methods=["GET"])
 def materialicons_css() -> Response:
     """Serve the vendored Material Design Icons stylesheet."""
-    response = send_from_directory(STATIC, "materialdesignicons.min.css")
+    response = send_static(STATIC, "materialdesignicons.min.css")
     response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
     return response
 
@@ -21,6 +22,6 @@ def materialicons_css() -> Response:
 @bp.route("/fonts/<path:filename>", methods=["GET"])
 def materialicons_font(filename: str) -> Response:
     """Serve the vendored Material Design Icons font files."""
-    response = send_from_directory(FONTS, filename)
+    response = send_static(FONTS, filename)
     response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
     return response
@@ -1,8 +1,9 @@
 """Back To Top routes module."""
 
-from flask import Response, send_from_directory
+from flask import Response
 
 from app.config import Config
+from core.static_files import send_static
 
 from . import bp  # pylint: disable=no-name-in-module
 
@@ -12,7 +13,7 @@ STATIC = f"{bp.component['path']}/static"
 @bp.route("/css/backtotop.min.css", methods=["GET"])
 def backtotop_css() -> Response:
     """backtotop.css"""
-    response = send_from_directory(STATIC, "backtotop.min.css")
+    response = send_static(STATIC, "backtotop.min.css")
     response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
     return response
 
@@ -20,6 +21,6 @@ def backtotop_css() -> Response:
 @bp.route("/js/backtotop.min.js", methods=["GET"])
 def backtotop_js() -> Response:
     """backtotop.js"""
-    response = send_from_directory(STATIC, "backtotop.min.js")
+    response = send_static(STATIC, "backtotop.min.js")
     response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
     return response
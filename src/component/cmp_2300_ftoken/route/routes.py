@@ -1,9 +1,10 @@
 """Ftoken routes module."""
 
-from flask import Response, g, send_from_directory
+from flask import Response, g
 
 from app.config import Config
 from app.extensions import require_header_set
+from core.static_files import send_static
 
 from . import bp  # pylint: disable=no-name-in-module
 from .ftoken_handler import FtokenRequestHandler
@@ -23,6 +24,6 @@ def ftoken(route, key, fetch_id, form_id) -> Response:
 @bp.route("/ftoken.min.js", methods=["GET"])
 def ftoken_js() -> Response:
     """ftoken.min.js"""
-    response = send_from_directory(STATIC, "ftoken.min.js")
+    response = send_static(STATIC, "ftoken.min.js")
     response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
     return response
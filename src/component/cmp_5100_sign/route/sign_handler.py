@@ -381,12 +381,7 @@ class SignPinRequestHandler(SignRequestHandler):
         user_id = pin_data["userId"]
 
         if target_kind == "signup":
-            unconfirmed = Config.DISABLED[UNCONFIRMED]
-            self.user.model.exec(
-                "user",
-                "delete-disabled",
-                {"reason": unconfirmed, "userId": user_id},
-            )
+            self.user.delete_user_disabled(user_id, Config.DISABLED[UNCONFIRMED])
 
         self.user.model.exec(
             "user",
@@ -2,11 +2,12 @@
 
 import os
 
-from flask import Response, g, send_from_directory
+from flask import Response, g
 
 from app.config import Config
 from app.extensions import limiter
 from core.request_handler import RequestHandler
+from core.static_files import send_static
 
 from . import bp  # pylint: disable=no-name-in-module
 
@@ -25,7 +26,7 @@ def service_worker() -> Response:
     else:
         static = STATIC
 
-    response = send_from_directory(static, "service-worker.js")
+    response = send_static(static, "service-worker.js")
     response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
     return response
 
@@ -38,7 +39,7 @@ def pwa_manifest_json(route) -> Response:
     """manifest.json requires variable replacement."""
 
     if CONFIG["public-has-manifest"]:
-        response = send_from_directory(PUBLIC, f"{DIR}/manifest.json")
+        response = send_static(PUBLIC, f"{DIR}/manifest.json")
         response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
         return response
 
@@ -61,7 +62,7 @@ def pwa_offline(route) -> Response:
     """offline.html variable replacement."""
 
     if CONFIG["public-has-offline"]:
-        response = send_from_directory(PUBLIC, f"{DIR}/offline.html")
+        response = send_static(PUBLIC, f"{DIR}/offline.html")
         response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
         return response
 
@@ -85,7 +86,7 @@ def pwa_static(relative_route) -> Response:
     file_path = os.path.join(static, route)
 
     if os.path.exists(file_path) and not os.path.isdir(file_path):
-        response = send_from_directory(static, route)
+        response = send_static(static, route)
         response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
         return response
 
@@ -1,10 +1,20 @@
-"""Image variant delivery routes."""
+"""Image variant delivery routes.
 
-from flask import Response
+Image data never changes for an imageId, so imageId and variant make the ETag.
+Revalidations get a 304 after the metadata checks, without loading the data.
+/p/<username> keeps its ETag in the cache beside the cached response, so a
+revalidation answers from the cache and agrees with the body it would send.
+"""
+
+import os
+
+from flask import Response, request
 
 from app.config import Config
 from app.extensions import cache, limiter
+from core.conditional import etag_for, has_validators, not_modified
 from core.image import Image
+from core.static_files import static_etags
 from core.user import User
 
 from . import bp  # pylint: disable=no-name-in-module
@@ -20,41 +30,84 @@ def _read_image_file(path: str) -> bytes:
         return file_obj.read()
 
 
+def _variant_etag(image_id: str, variant: str) -> str:
+    return etag_for("image", image_id, variant)
+
+
+def _placeholder_etag() -> str:
+    return static_etags.get(PROFILE_IMAGE, os.stat(PROFILE_IMAGE))
+
+
+def _not_modified(etag: str, cache_control: str) -> Response | None:
+    response = not_modified(etag)
+    if response is not None:
+        response.headers["Cache-Control"] = cache_control
+    return response
+
+
+def _profile_placeholder() -> Response:
+    response = Response(_read_image_file(PROFILE_IMAGE), mimetype="image/webp", status=200)
+    response.headers["Cache-Control"] = Config.STATIC_CACHE_IMG_PROFILE_CONTROL
+    response.set_etag(_placeholder_etag())
+    return response
+
+
 @bp.route("/p/<username>", methods=["GET"])
 @limiter.limit(Config.STATIC_LIMITS)
-@cache.cached(timeout=Config.CACHE_IMG)
 def get_username_image(username: str) -> Response:
     """Serve a profile image thumb variant or the default profile placeholder."""
+    if has_validators():
+        etag = cache.get(Image.etag_cache_key(request.path))
+        if etag is not None:
+            response = _not_modified(etag, Config.STATIC_CACHE_IMG_PROFILE_CONTROL)
+            if response is not None:
+                return response
+
+    response = _username_image(username)
+    return _not_modified(response.get_etag()[0], Config.STATIC_CACHE_IMG_PROFILE_CONTROL) or response
+
+
+@cache.cached(timeout=Config.CACHE_IMG)
+def _username_image(username: str) -> Response:
+    response = _resolve_username_image(username)
+    cache.set(Image.etag_cache_key(request.path), response.get_etag()[0], timeout=Config.CACHE_IMG)
+    return response
+
+
+def _resolve_username_image(username: str) -> Response:
     if not username:
-        response = Response(_read_image_file(PROFILE_IMAGE), mimetype="image/webp", status=200)
-        response.headers["Cache-Control"] = Config.STATIC_CACHE_IMG_PROFILE_CONTROL
-        return response
+        return _profile_placeholder()
 
     profile = User(Config.DB_PWA, Config.DB_PWA_TYPE).get_public_profile_by_username(username)
     image_id = str(profile.get("imageId") or "").strip()
     if not image_id:
-        response = Response(_read_image_file(PROFILE_IMAGE), mimetype="image/webp", status=200)
-        response.headers["Cache-Control"] = Config.STATIC_CACHE_IMG_PROFILE_CONTROL
-        return response
+        return _profile_placeholder()
 
     image_variant = Image().get_variant(image_id, "thumb")
     if image_variant is None:
-        response = Response(_read_image_file(PROFILE_IMAGE), mimetype="image/webp", status=200)
-        response.headers["Cache-Control"] = Config.STATIC_CACHE_IMG_PROFILE_CONTROL
-        return response
+        return _profile_placeholder()
 
     response = Response(image_variant.data, mimetype="image/webp", status=200)
     response.headers["Cache-Control"] = Config.STATIC_CACHE_IMG_PROFILE_CONTROL
     response.headers["X-Image-Width"] = str(image_variant.width)
     response.headers["X-Image-Height"] = str(image_variant.height)
+    response.set_etag(_variant_etag(image_id, "thumb"))
     return response
 
 
 @bp.route("/v/<image_id>/<variant>", methods=["GET"])
 @limiter.limit(Config.STATIC_LIMITS)
-@cache.cached(timeout=Config.CACHE_IMG)
 def get_image_variant(image_id: str, variant: str) -> Response:
     """Serve one stored image variant."""
+    if variant in Image.VARIANTS and has_validators():
+        response = _not_modified(_variant_etag(image_id, variant), Config.STATIC_CACHE_IMG_CONTROL)
+        if response is not None and Image().get_public_meta(image_id) is not None:
+            return response
+    return _image_variant(image_id, variant)
+
+
+@cache.cached(timeout=Config.CACHE_IMG)
+def _image_variant(image_id: str, variant: str) -> Response:
     image_variant = Image().get_public_variant(image_id, variant)
     if image_variant is None:
         response = Response(_read_image_file(NOT_FOUND_IMAGE), mimetype="image/webp", status=404)
@@ -65,6 +118,7 @@ def get_image_variant(image_id: str, variant: str) -> Response:
     response.headers["Cache-Control"] = Config.STATIC_CACHE_IMG_CONTROL
     response.headers["X-Image-Width"] = str(image_variant.width)
     response.headers["X-Image-Height"] = str(image_variant.height)
+    response.set_etag(_variant_etag(image_id, variant))
     return response
 
 
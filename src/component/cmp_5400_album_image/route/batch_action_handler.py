@@ -49,29 +49,16 @@ class AlbumImageBatchActionFormHandler(FormRequestHandler):
 
         image_ids = [i.strip() for i in image_ids_str.split(",") if i.strip()]
         img_helper = Image()
-        
-        success_count = 0
-        for image_id in image_ids:
-            meta = img_helper.get_meta(image_id)
-            if not meta or meta.get("profileId") != profile_id:
-                continue
 
-            if action == "delete":
-                if img_helper.delete_image(image_id=image_id, profile_id=profile_id):
-                    success_count += 1
-            elif action == "move":
-                if not target_album:
-                    continue
-                try:
-                    normalized = img_helper._normalize_album_code(target_album)  # pylint: disable=protected-access
-                    img_helper.model.exec(
-                        "image", 
-                        "update-album", 
-                        {"imageId": image_id, "albumCode": normalized}
-                    )
-                    success_count += 1
-                except ValueError: # Invalid album code
-                    continue
+        # One ownership query and one write transaction for the whole selection
+        success_count = 0
+        if action == "delete":
+            success_count = len(img_helper.delete_images(image_ids, profile_id))
+        elif action == "move" and target_album:
+            try:
+                success_count = len(img_helper.move_images(image_ids, profile_id, target_album))
+            except ValueError: # Invalid album code
+                success_count = 0
 
         if success_count == 0:
             self.schema_data["form_result"] = {
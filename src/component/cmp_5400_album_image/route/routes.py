@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import os
 
-from flask import Response, g, jsonify, request, send_from_directory
+from flask import Response, g, jsonify, request
 
 from app.config import Config
 from app.extensions import limiter, require_header_set
 from core.image import Image
 from core.request_handler import RequestHandler
+from core.static_files import send_static
 
 from . import bp  # pylint: disable=no-name-in-module
 
@@ -57,7 +58,7 @@ def serve_static(asset_path) -> Response:
     """Serve component static assets."""
     file_path = os.path.join(STATIC, asset_path)
     if os.path.exists(file_path) and not os.path.isdir(file_path):
-        response = send_from_directory(STATIC, asset_path)
+        response = send_static(STATIC, asset_path)
         response.headers["Cache-Control"] = Config.STATIC_CACHE_CONTROL
         return response
     return Response("404 Not Found", status=404)
@@ -79,9 +80,14 @@ def field_list() -> Response:
         limit = 50
         offset = 0
 
-    items = Image().list_by_profile(profile_id, album_code=album_code, limit=limit, offset=offset)
+    cursor = request.args.get("cursor", "")
+    image = Image()
+    items = image.list_by_profile(
+        profile_id, album_code=album_code, limit=limit, offset=offset, cursor=cursor
+    )
+    next_cursor = image.cursor_for(items[-1]) if items and len(items) >= limit else ""
     items = [_serialize_image_item(item) for item in items]
-    return jsonify({"success": True, "items": items}), 200
+    return jsonify({"success": True, "items": items, "next_cursor": next_cursor}), 200
 
 
 @bp.route("/field/albums", methods=["GET"])
@@ -352,6 +352,9 @@
         url.searchParams.set("album_code", currentAlbum(container));
         url.searchParams.set("limit", limit);
         url.searchParams.set("offset", offset);
+        if (append && container.dataset.cursor) {
+            url.searchParams.set("cursor", container.dataset.cursor);
+        }
 
         fetch(url.toString(), {
             headers: {
@@ -371,6 +374,7 @@
                 // Update offset for next batch
                 var newOffset = offset + items.length;
                 container.dataset.offset = String(newOffset);
+                container.dataset.cursor = payload.next_cursor || "";
 
                 // Show/hide pagination button
                 var pagination = container.querySelector(".album-image-field-pagination");
@@ -591,6 +595,7 @@
             albumInput.addEventListener("change", function () {
                 container.dataset.selectedIds = "";
                 container.dataset.offset = "0";
+                container.dataset.cursor = "";
                 setFieldValues(splitCsv(container.dataset.fieldsToFill), []);
                 setPreview(container.dataset.urlToFill || "", "");
                 showPending(container, []);
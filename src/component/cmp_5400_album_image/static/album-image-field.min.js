@@ -1 +1 @@
-!function(){"use strict";function e(e){return String(e||"").split(",").map((e=>e.trim())).filter(Boolean)}function t(e,t){e.forEach((function(e,n){var a=t[n]||"";document.querySelectorAll("."+e).forEach((function(e){e.value=a,e.dispatchEvent(new Event("change",{bubbles:!0})),e.dispatchEvent(new Event("input",{bubbles:!0}))}))}))}function n(e,t){e&&document.querySelectorAll("img."+e).forEach((function(e){e.src=t||"",e.classList.toggle("d-none",!t)}))}function a(e,t){var n=e.querySelector(".album-image-field-error");if(n){if(!t)return n.classList.add("d-none"),void(n.textContent="");n.textContent=t,n.classList.remove("d-none")}}function i(e){var t=e.querySelector(".album-image-dropzone");t&&"function"==typeof t.focus&&window.requestAnimationFrame((function(){document.body.contains(t)&&null!==t.offsetParent&&t.focus()}))}function l(e,t){var n=e.querySelector(".album-image-field-pending-grid"),i=e.querySelector(".album-image-upload-button"),r=e.querySelector(".album-image-reset-button"),d=parseInt(e.dataset.maxImages||"1",10),s=Array.from(t||[]).slice(0,Math.max(1,d));e._albumImagePendingFiles=s,i&&(i.disabled=0===s.length),r&&(r.disabled=0===s.length),s.length?n&&(n.classList.remove("d-none"),n.innerHTML="",s.forEach((function(t,i){var r=document.createElement("div");r.className="album-image-field-grid-item";var d=document.createElement("div");d.className="album-image-field-pending-thumb border rounded bg-white shadow-sm overflow-hidden d-flex flex-column h-100";var s=document.createElement("div");s.className="position-relative flex-grow-1";var o=document.createElement("img");o.alt=t.name||"pending-image-"+i,o.className="album-image-field-pending-preview d-none w-100";var u=document.createElement("div");u.className="album-image-field-pending-placeholder d-flex align-items-center justify-content-center h-100",u.textContent="";var c=e.querySelector(".album-image-field-remove-icon-template"),m=document.createElement("button");m.type="button",m.className="album-image-field-pending-remove btn btn-danger rounded-circle p-0 d-flex align-items-center justify-content-center shadow-sm",m.style.position="absolute",m.style.top="6px",m.style.left="6px",m.style.width="34px",m.style.height="34px",m.style.zIndex="30",m.style.fontSize="1.5rem",m.title="",c?m.innerHTML=c.innerHTML:m.textContent="×",m.addEventListener("click",(function(t){t.stopPropagation(),a(e,"");var n=(e._albumImagePendingFiles||[]).filter((function(e,t){return t!==i}));l(e,n)}));var f=e.querySelector(".album-image-field-spinner-template"),g=document.createElement("div");g.className="album-image-field-thumb-spinner d-none position-absolute top-0 start-0 w-100 h-100 align-items-center justify-content-center bg-white bg-opacity-75",g.style.zIndex="40",f&&(g.innerHTML=f.innerHTML),s.appendChild(o),s.appendChild(u),s.appendChild(m),s.appendChild(g);var b=document.createElement("div");b.className="p-2 border-top text-center w-100",b.style.backgroundColor="#f8f9fa";var p=document.createElement("div");p.className="album-image-field-pending-name small text-truncate text-muted",p.textContent=t.name||"",b.appendChild(p),d.appendChild(s),d.appendChild(b),r.appendChild(d),n.appendChild(r),function(e){return new Promise((function(t){if(e&&String(e.type||"").startsWith("image/")){var n=new FileReader;n.onload=function(e){t(e&&e.target?String(e.target.result||""):"")},n.onerror=function(){t("")},n.readAsDataURL(e)}else t("")}))}(t).then((function(e){if(n.contains(r)){if(e)return o.src=e,o.classList.remove("d-none"),void u.classList.add("d-none");o.removeAttribute("src"),o.classList.add("d-none"),u.classList.remove("d-none")}}))}))):n&&(n.innerHTML="",n.classList.add("d-none"))}function r(e){var t=e.dataset.forceAlbum||"";if(t)return t;var n=e.querySelector(".album-image-field-album");return n?String(n.value||"gallery").trim():"gallery"}function d(e){return e.dataset.forceAlbum?Promise.resolve():fetch(e.dataset.albumsUrl,{headers:{"Requested-With-Ajax":"true"}}).then((function(e){return e.json()})).then((function(t){t.success?(a(e,""),function(e,t){var n=e.querySelector(".album-image-field-album-select");if(n){var a=n.querySelector("option[value='']"),i=a?a.textContent:"...",l=[],r=document.createDocumentFragment(),d=document.createElement("option");d.value="",d.textContent=i,r.appendChild(d),t.forEach((function(e){var t=String(e||"").trim();if(t&&-1===l.indexOf(t)){l.push(t);var n=document.createElement("option");n.value=t,n.textContent=t,r.appendChild(n)}})),n.innerHTML="",n.appendChild(r)}}(e,t.items||[])):a(e,t.error||"")})).catch((function(){a(e,"")}))}function s(t,n){var i=parseInt(t.dataset.listLimit||t.dataset.limit||"50",10),l=n?parseInt(t.dataset.offset||"0",10):0,d=new URL(t.dataset.listUrl,window.location.origin);d.searchParams.set("album_code",r(t)),d.searchParams.set("limit",i),d.searchParams.set("offset",l),fetch(d.toString(),{headers:{"Requested-With-Ajax":"true"}}).then((function(e){return e.json()})).then((function(r){if(r.success){a(t,"");var d=r.items||[];!function(e,t,n,a){var i=e.querySelector(".album-image-field-grid");i&&(a||(i.innerHTML=""),t.forEach((function(e){var t=document.createElement("div");t.className="album-image-field-grid-item";var a=document.createElement("button");a.type="button",a.className="album-image-field-thumb btn btn-light w-100 p-0",a.dataset.imageId=e.imageId,a.dataset.thumbUrl=e.thumbUrl||"",a.dataset.mediumUrl=e.mediumUrl||"",a.dataset.fullUrl=e.fullUrl||"",-1!==n.indexOf(e.imageId)&&a.classList.add("is-selected");var l=document.createElement("img");l.src=e.thumbUrl||"",l.alt=e.albumCode||"image",a.appendChild(l);var r=document.createElement("span");r.className="img-zoomable mdi mdi-magnify-plus btn btn-primary rounded-circle position-absolute d-flex align-items-center justify-content-center p-0 shadow",r.title="View Full Resolution",r.dataset.zoomSrc=e.fullUrl||"",a.appendChild(r);var d=document.createElement("span");d.className="album-image-selection-icon mdi mdi-check btn btn-light rounded-circle position-absolute d-flex align-items-center justify-content-center p-0 shadow-sm border",d.style.pointerEvents="none",a.appendChild(d),t.appendChild(a),i.appendChild(t)})))}(t,d,e(t.dataset.selectedIds),n);var s=l+d.length;t.dataset.offset=String(s);var o=t.querySelector(".album-image-field-pagination");o&&(d.length>=i?o.classList.remove("d-none"):o.classList.add("d-none"))}else a(t,r.error||"")})).catch((function(){a(t,"")}))}function o(i,l){var o=Array.from(l||[]),u=parseInt(i.dataset.uploadDelayMs||"100",10);if(o.length){var c=i.querySelector(".album-image-upload-button"),m=i.querySelector(".album-image-reset-button"),f=c?c.querySelector(".album-image-upload-spinner"):null;c&&(c.disabled=!0),m&&(m.disabled=!0),f&&f.classList.remove("d-none");var g=r(i),b=[],p=o.length-1,v=function(){if(p<0){c&&(c.disabled=!1),f&&f.classList.add("d-none"),m&&(m.disabled=!1),d(i),function(a,i){var l=i.map((function(e){return e.imageId}));a.dataset.selectedIds=l.join(","),t(e(a.dataset.fieldsToFill),l),n(a.dataset.urlToFill||"",i[0]?i[0].thumbUrl:""),s(a)}(i,b),i._albumImagePendingFiles=[];var l=i.querySelector(".album-image-field-pending-grid");l&&(l.classList.add("d-none"),l.innerHTML="")}else{var r=o[p],h=new FormData;h.append("images",r),h.append("album_code",g);var y=i.querySelectorAll(".album-image-field-pending-grid .album-image-field-grid-item")[p],E=null;y&&(E=y.querySelector(".album-image-field-thumb-spinner"))&&E.classList.remove("d-none"),fetch(i.dataset.uploadUrl,{method:"POST",headers:{"Requested-With-Ajax":"true"},body:h}).then((function(e){return e.json()})).then((function(e){if(!e.success)return a(i,e.error||""),c&&(c.disabled=!1),m&&(m.disabled=!1),f&&f.classList.add("d-none"),void(E&&E.classList.add("d-none"));b=b.concat(e.items||[]),o.splice(p,1),i._albumImagePendingFiles=o,y&&y.remove(),p--,window.setTimeout(v,u)})).catch((function(){a(i,""),c&&(c.disabled=!1),m&&(m.disabled=!1),f&&f.classList.add("d-none"),E&&E.classList.add("d-none")}))}};v()}}function u(r){if("true"!==r.dataset.initialized){r.dataset.initialized="true";var u=r.querySelector(".album-image-dropzone"),c=r.querySelector(".album-image-field-input"),m=parseInt(r.dataset.maxImages||"1",10),f=Math.random().toString(36).substr(2,6),g=r.querySelector(".album-image-field-album");if(g){var b="album-input-"+f;g.id=b,(v=g.nextElementSibling)&&"LABEL"===v.tagName&&v.setAttribute("for",b)}var p=r.querySelector(".album-image-field-album-select");if(p){var v,h="album-select-"+f;p.id=h,(v=p.nextElementSibling)&&"LABEL"===v.tagName&&v.setAttribute("for",h)}u&&c&&(m>1&&(c.multiple=!0),u.hasAttribute("tabindex")||u.setAttribute("tabindex","0"),u.hasAttribute("role")||u.setAttribute("role","button"),u.addEventListener("click",(function(){u.focus(),c.click()})),c.addEventListener("change",(function(){a(r,""),l(r,c.files),c.value=""})),["dragenter","dragover"].forEach((function(e){u.addEventListener(e,(function(e){e.preventDefault(),u.classList.add("is-dragover")}))})),["dragleave","dragend","drop"].forEach((function(e){u.addEventListener(e,(function(e){e.preventDefault(),u.classList.remove("is-dragover")}))})),u.addEventListener("drop",(function(e){a(r,""),l(r,e.dataTransfer.files)})),u.addEventListener("paste",(function(e){var t=function(e){var t=e&&e.clipboardData;if(!t)return[];var n=[];return Array.from(t.items||[]).forEach((function(e){if(e&&"file"===e.kind){var t=e.getAsFile?e.getAsFile():null;t&&String(t.type||"").startsWith("image/")&&n.push(t)}})),n.length?n:Array.from(t.files||[]).filter((function(e){return String(e.type||"").startsWith("image/")}))}(e);t.length&&(e.preventDefault(),a(r,""),l(r,t))})));var y=r.querySelector(".album-image-upload-button"),E=r.querySelector(".album-image-reset-button");y&&y.addEventListener("click",(function(){o(r,r._albumImagePendingFiles||[])})),E&&E.addEventListener("click",(function(){l(r,[])})),g&&(g.addEventListener("change",(function(){r.dataset.selectedIds="",r.dataset.offset="0",t(e(r.dataset.fieldsToFill),[]),n(r.dataset.urlToFill||"",""),l(r,[]),s(r)})),p&&p.addEventListener("change",(function(){p.value&&(g.value=p.value,g.dispatchEvent(new Event("change",{bubbles:!0})),p.value="")})));var L=r.querySelector(".album-image-load-more");L&&L.addEventListener("click",(function(){s(r,!0)})),r.addEventListener("click",(function(a){var i=a.target.closest(".album-image-field-thumb");if(i){var l=i.dataset.imageId||"",d=parseInt(r.dataset.maxImages||"1",10),s=e(r.dataset.selectedIds);if(d>1){var o=s.indexOf(l);-1===o?s.length<d&&s.push(l):s.splice(o,1)}else s=-1!==s.indexOf(l)?[]:[l];r.dataset.selectedIds=s.join(","),t(e(r.dataset.fieldsToFill),s),r.querySelectorAll(".album-image-field-thumb").forEach((function(e){e.classList.toggle("is-selected",-1!==s.indexOf(e.dataset.imageId))}));var u=r.querySelector(".album-image-field-thumb.is-selected");n(r.dataset.urlToFill||"",u?u.dataset.thumbUrl:"")}})),d(r).finally((function(){s(r)})),i(r)}}function c(){document.querySelectorAll(".album-image-field").forEach(u)}window.__albumImageFieldVisibilityEventsInitialized||(window.__albumImageFieldVisibilityEventsInitialized=!0,["shown.bs.collapse","shown.bs.modal","shown.bs.offcanvas","shown.bs.tab"].forEach((function(e){document.addEventListener(e,(function(e){var t;(t=e.target)&&"function"==typeof t.querySelectorAll&&t.querySelectorAll(".album-image-field").forEach(i)}))}))),document.addEventListener("DOMContentLoaded",c),window.addEventListener("neutralFetchCompleted",c)}();
\ No newline at end of file
+!function(){"use strict";function e(e){return String(e||"").split(",").map((e=>e.trim())).filter(Boolean)}function t(e,t){e.forEach((function(e,n){var a=t[n]||"";document.querySelectorAll("."+e).forEach((function(e){e.value=a,e.dispatchEvent(new Event("change",{bubbles:!0})),e.dispatchEvent(new Event("input",{bubbles:!0}))}))}))}function n(e,t){e&&document.querySelectorAll("img."+e).forEach((function(e){e.src=t||"",e.classList.toggle("d-none",!t)}))}function a(e,t){var n=e.querySelector(".album-image-field-error");if(n){if(!t)return n.classList.add("d-none"),void(n.textContent="");n.textContent=t,n.classList.remove("d-none")}}function i(e){var t=e.querySelector(".album-image-dropzone");t&&"function"==typeof t.focus&&window.requestAnimationFrame((function(){document.body.contains(t)&&null!==t.offsetParent&&t.focus()}))}function l(e,t){var n=e.querySelector(".album-image-field-pending-grid"),i=e.querySelector(".album-image-upload-button"),r=e.querySelector(".album-image-reset-button"),d=parseInt(e.dataset.maxImages||"1",10),s=Array.from(t||[]).slice(0,Math.max(1,d));e._albumImagePendingFiles=s,i&&(i.disabled=0===s.length),r&&(r.disabled=0===s.length),s.length?n&&(n.classList.remove("d-none"),n.innerHTML="",s.forEach((function(t,i){var r=document.createElement("div");r.className="album-image-field-grid-item";var d=document.createElement("div");d.className="album-image-field-pending-thumb border rounded bg-white shadow-sm overflow-hidden d-flex flex-column h-100";var s=document.createElement("div");s.className="position-relative flex-grow-1";var o=document.createElement("img");o.alt=t.name||"pending-image-"+i,o.className="album-image-field-pending-preview d-none w-100";var u=document.createElement("div");u.className="album-image-field-pending-placeholder d-flex align-items-center justify-content-center h-100",u.textContent="";var c=e.querySelector(".album-image-field-remove-icon-template"),m=document.createElement("button");m.type="button",m.className="album-image-field-pending-remove btn btn-danger rounded-circle p-0 d-flex align-items-center justify-content-center shadow-sm",m.style.position="absolute",m.style.top="6px",m.style.left="6px",m.style.width="34px",m.style.height="34px",m.style.zIndex="30",m.style.fontSize="1.5rem",m.title="",c?m.innerHTML=c.innerHTML:m.textContent="×",m.addEventListener("click",(function(t){t.stopPropagation(),a(e,"");var n=(e._albumImagePendingFiles||[]).filter((function(e,t){return t!==i}));l(e,n)}));var f=e.querySelector(".album-image-field-spinner-template"),g=document.createElement("div");g.className="album-image-field-thumb-spinner d-none position-absolute top-0 start-0 w-100 h-100 align-items-center justify-content-center bg-white bg-opacity-75",g.style.zIndex="40",f&&(g.innerHTML=f.innerHTML),s.appendChild(o),s.appendChild(u),s.appendChild(m),s.appendChild(g);var b=document.createElement("div");b.className="p-2 border-top text-center w-100",b.style.backgroundColor="#f8f9fa";var p=document.createElement("div");p.className="album-image-field-pending-name small text-truncate text-muted",p.textContent=t.name||"",b.appendChild(p),d.appendChild(s),d.appendChild(b),r.appendChild(d),n.appendChild(r),function(e){return new Promise((function(t){if(e&&String(e.type||"").startsWith("image/")){var n=new FileReader;n.onload=function(e){t(e&&e.target?String(e.target.result||""):"")},n.onerror=function(){t("")},n.readAsDataURL(e)}else t("")}))}(t).then((function(e){if(n.contains(r)){if(e)return o.src=e,o.classList.remove("d-none"),void u.classList.add("d-none");o.removeAttribute("src"),o.classList.add("d-none"),u.classList.remove("d-none")}}))}))):n&&(n.innerHTML="",n.classList.add("d-none"))}function r(e){var t=e.dataset.forceAlbum||"";if(t)return t;var n=e.querySelector(".album-image-field-album");return n?String(n.value||"gallery").trim():"gallery"}function d(e){return e.dataset.forceAlbum?Promise.resolve():fetch(e.dataset.albumsUrl,{headers:{"Requested-With-Ajax":"true"}}).then((function(e){return e.json()})).then((function(t){t.success?(a(e,""),function(e,t){var n=e.querySelector(".album-image-field-album-select");if(n){var a=n.querySelector("option[value='']"),i=a?a.textContent:"...",l=[],r=document.createDocumentFragment(),d=document.createElement("option");d.value="",d.textContent=i,r.appendChild(d),t.forEach((function(e){var t=String(e||"").trim();if(t&&-1===l.indexOf(t)){l.push(t);var n=document.createElement("option");n.value=t,n.textContent=t,r.appendChild(n)}})),n.innerHTML="",n.appendChild(r)}}(e,t.items||[])):a(e,t.error||"")})).catch((function(){a(e,"")}))}function s(t,n){var i=parseInt(t.dataset.listLimit||t.dataset.limit||"50",10),l=n?parseInt(t.dataset.offset||"0",10):0,d=new URL(t.dataset.listUrl,window.location.origin);d.searchParams.set("album_code",r(t)),d.searchParams.set("limit",i),d.searchParams.set("offset",l),n&&t.dataset.cursor&&d.searchParams.set("cursor",t.dataset.cursor),fetch(d.toString(),{headers:{"Requested-With-Ajax":"true"}}).then((function(e){return e.json()})).then((function(r){if(r.success){a(t,"");var d=r.items||[];!function(e,t,n,a){var i=e.querySelector(".album-image-field-grid");i&&(a||(i.innerHTML=""),t.forEach((function(e){var t=document.createElement("div");t.className="album-image-field-grid-item";var a=document.createElement("button");a.type="button",a.className="album-image-field-thumb btn btn-light w-100 p-0",a.dataset.imageId=e.imageId,a.dataset.thumbUrl=e.thumbUrl||"",a.dataset.mediumUrl=e.mediumUrl||"",a.dataset.fullUrl=e.fullUrl||"",-1!==n.indexOf(e.imageId)&&a.classList.add("is-selected");var l=document.createElement("img");l.src=e.thumbUrl||"",l.alt=e.albumCode||"image",a.appendChild(l);var r=document.createElement("span");r.className="img-zoomable mdi mdi-magnify-plus btn btn-primary rounded-circle position-absolute d-flex align-items-center justify-content-center p-0 shadow",r.title="View Full Resolution",r.dataset.zoomSrc=e.fullUrl||"",a.appendChild(r);var d=document.createElement("span");d.className="album-image-selection-icon mdi mdi-check btn btn-light rounded-circle position-absolute d-flex align-items-center justify-content-center p-0 shadow-sm border",d.style.pointerEvents="none",a.appendChild(d),t.appendChild(a),i.appendChild(t)})))}(t,d,e(t.dataset.selectedIds),n);var s=l+d.length;t.dataset.offset=String(s),t.dataset.cursor=r.next_cursor||"";var o=t.querySelector(".album-image-field-pagination");o&&(d.length>=i?o.classList.remove("d-none"):o.classList.add("d-none"))}else a(t,r.error||"")})).catch((function(){a(t,"")}))}function o(i,l){var o=Array.from(l||[]),u=parseInt(i.dataset.uploadDelayMs||"100",10);if(o.length){var c=i.querySelector(".album-image-upload-button"),m=i.querySelector(".album-image-reset-button"),f=c?c.querySelector(".album-image-upload-spinner"):null;c&&(c.disabled=!0),m&&(m.disabled=!0),f&&f.classList.remove("d-none");var g=r(i),b=[],p=o.length-1,v=function(){if(p<0){c&&(c.disabled=!1),f&&f.classList.add("d-none"),m&&(m.disabled=!1),d(i),function(a,i){var l=i.map((function(e){return e.imageId}));a.dataset.selectedIds=l.join(","),t(e(a.dataset.fieldsToFill),l),n(a.dataset.urlToFill||"",i[0]?i[0].thumbUrl:""),s(a)}(i,b),i._albumImagePendingFiles=[];var l=i.querySelector(".album-image-field-pending-grid");l&&(l.classList.add("d-none"),l.innerHTML="")}else{var r=o[p],h=new FormData;h.append("images",r),h.append("album_code",g);var y=i.querySelectorAll(".album-image-field-pending-grid .album-image-field-grid-item")[p],E=null;y&&(E=y.querySelector(".album-image-field-thumb-spinner"))&&E.classList.remove("d-none"),fetch(i.dataset.uploadUrl,{method:"POST",headers:{"Requested-With-Ajax":"true"},body:h}).then((function(e){return e.json()})).then((function(e){if(!e.success)return a(i,e.error||""),c&&(c.disabled=!1),m&&(m.disabled=!1),f&&f.classList.add("d-none"),void(E&&E.classList.add("d-none"));b=b.concat(e.items||[]),o.splice(p,1),i._albumImagePendingFiles=o,y&&y.remove(),p--,window.setTimeout(v,u)})).catch((function(){a(i,""),c&&(c.disabled=!1),m&&(m.disabled=!1),f&&f.classList.add("d-none"),E&&E.classList.add("d-none")}))}};v()}}function u(r){if("true"!==r.dataset.initialized){r.dataset.initialized="true";var u=r.querySelector(".album-image-dropzone"),c=r.querySelector(".album-image-field-input"),m=parseInt(r.dataset.maxImages||"1",10),f=Math.random().toString(36).substr(2,6),g=r.querySelector(".album-image-field-album");if(g){var b="album-input-"+f;g.id=b,(v=g.nextElementSibling)&&"LABEL"===v.tagName&&v.setAttribute("for",b)}var p=r.querySelector(".album-image-field-album-select");if(p){var v,h="album-select-"+f;p.id=h,(v=p.nextElementSibling)&&"LABEL"===v.tagName&&v.setAttribute("for",h)}u&&c&&(m>1&&(c.multiple=!0),u.hasAttribute("tabindex")||u.setAttribute("tabindex","0"),u.hasAttribute("role")||u.setAttribute("role","button"),u.addEventListener("click",(function(){u.focus(),c.click()})),c.addEventListener("change",(function(){a(r,""),l(r,c.files),c.value=""})),["dragenter","dragover"].forEach((function(e){u.addEventListener(e,(function(e){e.preventDefault(),u.classList.add("is-dragover")}))})),["dragleave","dragend","drop"].forEach((function(e){u.addEventListener(e,(function(e){e.preventDefault(),u.classList.remove("is-dragover")}))})),u.addEventListener("drop",(function(e){a(r,""),l(r,e.dataTransfer.files)})),u.addEventListener("paste",(function(e){var t=function(e){var t=e&&e.clipboardData;if(!t)return[];var n=[];return Array.from(t.items||[]).forEach((function(e){if(e&&"file"===e.kind){var t=e.getAsFile?e.getAsFile():null;t&&String(t.type||"").startsWith("image/")&&n.push(t)}})),n.length?n:Array.from(t.files||[]).filter((function(e){return String(e.type||"").startsWith("image/")}))}(e);t.length&&(e.preventDefault(),a(r,""),l(r,t))})));var y=r.querySelector(".album-image-upload-button"),E=r.querySelector(".album-image-reset-button");y&&y.addEventListener("click",(function(){o(r,r._albumImagePendingFiles||[])})),E&&E.addEventListener("click",(function(){l(r,[])})),g&&(g.addEventListener("change",(function(){r.dataset.selectedIds="",r.dataset.offset="0",r.dataset.cursor="",t(e(r.dataset.fieldsToFill),[]),n(r.dataset.urlToFill||"",""),l(r,[]),s(r)})),p&&p.addEventListener("change",(function(){p.value&&(g.value=p.value,g.dispatchEvent(new Event("change",{bubbles:!0})),p.value="")})));var L=r.querySelector(".album-image-load-more");L&&L.addEventListener("click",(function(){s(r,!0)})),r.addEventListener("click",(function(a){var i=a.target.closest(".album-image-field-thumb");if(i){var l=i.dataset.imageId||"",d=parseInt(r.dataset.maxImages||"1",10),s=e(r.dataset.selectedIds);if(d>1){var o=s.indexOf(l);-1===o?s.length<d&&s.push(l):s.splice(o,1)}else s=-1!==s.indexOf(l)?[]:[l];r.dataset.selectedIds=s.join(","),t(e(r.dataset.fieldsToFill),s),r.querySelectorAll(".album-image-field-thumb").forEach((function(e){e.classList.toggle("is-selected",-1!==s.indexOf(e.dataset.imageId))}));var u=r.querySelector(".album-image-field-thumb.is-selected");n(r.dataset.urlToFill||"",u?u.dataset.thumbUrl:"")}})),d(r).finally((function(){s(r)})),i(r)}}function c(){document.querySelectorAll(".album-image-field").forEach(u)}window.__albumImageFieldVisibilityEventsInitialized||(window.__albumImageFieldVisibilityEventsInitialized=!0,["shown.bs.collapse","shown.bs.modal","shown.bs.offcanvas","shown.bs.tab"].forEach((function(e){document.addEventListener(e,(function(e){var t;(t=e.target)&&"function"==typeof t.querySelectorAll&&t.querySelectorAll(".album-image-field").forEach(i)}))}))),document.addEventListener("DOMContentLoaded",c),window.addEventListener("neutralFetchCompleted",c)}();
\ No newline at end of file
@@ -217,8 +217,10 @@ class AdminImageRequestHandler(AdminRequestHandler):
             "order": "created",
             "limit": 33,
             "offset": 0,
+            "cursor": "",
             "has_more": False,
             "next_offset": 0,
+            "next_cursor": "",
             "images": [],
             "exact_image_search": False,
             "exact_image": {},
@@ -258,17 +260,26 @@ class AdminImageRequestHandler(AdminRequestHandler):
         except (TypeError, ValueError):
             requested_offset = 0
         state["offset"] = max(0, requested_offset)
+        state["cursor"] = (request.values.get("cursor") or "").strip()
         return state
 
     def _resolve_profile_summaries(self, profile_ids: set[str]) -> dict[str, dict]:
         """Resolve user/profile display data for image rows."""
+        ids = sorted(profile_id for profile_id in profile_ids if profile_id)
+        if not ids:
+            return {}
+
+        result = self.user.model.exec("user", "get-profiles-by-profileids", {"profileIds": ids})
+        rows_by_id = {
+            str(row[0]): row
+            for row in (result.get("rows", []) if result else [])
+            if row
+        }
+
         summaries = {}
-        for profile_id in profile_ids:
-            if not profile_id:
-                continue
-            result = self.user.model.exec("user", "get-profile-by-profileid", {"profileId": profile_id})
-            rows = result.get("rows", []) if result else []
-            if not rows or not rows[0]:
+        for profile_id in ids:
+            row = rows_by_id.get(profile_id)
+            if not row:
                 summaries[profile_id] = {
                     "profileId": profile_id,
                     "userId": "",
@@ -277,7 +288,6 @@ class AdminImageRequestHandler(AdminRequestHandler):
                     "locale": "",
                 }
                 continue
-            row = rows[0]
             summaries[profile_id] = {
                 "profileId": row[0] or "",
                 "userId": row[1] or "",
@@ -295,10 +305,13 @@ class AdminImageRequestHandler(AdminRequestHandler):
             disabled_reason=state["disabled_filter"],
             limit=state["limit"] + 1,
             offset=state["offset"],
+            cursor=state["cursor"],
         )
         state["has_more"] = len(images) > state["limit"]
         state["images"] = images[: state["limit"]]
         state["next_offset"] = state["offset"] + len(state["images"])
+        if state["has_more"] and state["order"] == "created":
+            state["next_cursor"] = image_helper.cursor_for(state["images"][-1])
 
         disabled_labels = {
             int(code): name
@@ -446,6 +459,8 @@ class AdminUserRequestHandler(AdminRequestHandler):
             "filter_role": "",
             "disabled_filter": "",
             "order": "created",
+            "cursor": "",
+            "next_cursor": "",
             "users": [],
             "disabled_options": AdminRequestHandler._build_disabled_options(),
             "can_full": False,
@@ -478,6 +493,7 @@ class AdminUserRequestHandler(AdminRequestHandler):
             "disabled_date",
         }
         state["order"] = requested_order if requested_order in allowed_orders else "created"
+        state["cursor"] = (request.values.get("cursor") or "").strip()
         return state
 
     def _fill_user_list(self, state: dict) -> None:
@@ -488,7 +504,10 @@ class AdminUserRequestHandler(AdminRequestHandler):
             disabled_reason=state["disabled_filter"],
             limit=100,
             offset=0,
+            cursor=state["cursor"],
         )
+        if len(state["users"]) == 100:
+            state["next_cursor"] = self.user.admin_users_cursor(state["users"][-1], state["order"])
 
         disabled_labels = {
             int(code): name
@@ -710,6 +729,8 @@ class AdminProfileRequestHandler(AdminRequestHandler):
             "filter_role": "",
             "disabled_filter": "",
             "order": "created",
+            "cursor": "",
+            "next_cursor": "",
             "users": [],
             "disabled_options": AdminRequestHandler._build_profile_disabled_options(),
             "can_full": False,
@@ -742,6 +763,7 @@ class AdminProfileRequestHandler(AdminRequestHandler):
             "disabled_date",
         }
         state["order"] = requested_order if requested_order in allowed_orders else "created"
+        state["cursor"] = (request.values.get("cursor") or "").strip()
         return state
 
     def _fill_profile_list(self, state: dict) -> None:
@@ -752,7 +774,10 @@ class AdminProfileRequestHandler(AdminRequestHandler):
             disabled_reason=state["disabled_filter"],
             limit=100,
             offset=0,
+            cursor=state["cursor"],
         )
+        if len(state["users"]) == 100:
+            state["next_cursor"] = self.user.admin_profiles_cursor(state["users"][-1], state["order"])
 
         disabled_labels = {
             int(code): name
@@ -2,11 +2,12 @@
 
 import os
 
-from flask import Response, g, send_from_directory
+from flask import Response, g
 
 from app.config import Config
 from app.extensions import limiter
 from core.request_handler import RequestHandler
+from core.static_files import send_static
 
 from . import bp  # pylint: disable=no-name-in-module
 
@@ -17,7 +18,7 @@ def serve_static_file(asset_path) -> Response:
     """static file"""
     file_path = os.path.join(Config.STATIC_FOLDER, asset_path)
     if os.path.exists(file_path) and not os.path.isdir(file_path):
-        response = send_from_directory(Config.STATIC_FOLDER, asset_path)
+        response = send_static(Config.STATIC_FOLDER, asset_path)
         response.headers['Cache-Control'] = Config.STATIC_CACHE_CONTROL
         return response
 
@@ -0,0 +1,185 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Response compression negotiated from Accept-Encoding.
+
+Dynamic responses (rendered pages, JSON...) are compressed on the fly by the
+compress_response after_request when their type is in COMPRESSION_MIMETYPES
+and they are at least COMPRESSION_MIN_SIZE bytes.
+
+Static files are never compressed per request: precompress_directory()
+writes .br/.zst/.gz siblings once (per deploy with scripts/precompress_static.py,
+or at startup when COMPRESSION_PRECOMPRESS is set) and core.static_files.send_static() serves
+the best fresh sibling the client accepts.
+
+gzip is always available; br needs the "brotli" package and zstd the
+"zstandard" package, each used only when installed. COMPRESSION_ENCODINGS
+sets which ones are used and the server preference between equal q-values.
+"""
+
+import gzip
+import mimetypes
+import os
+import tempfile
+
+from flask import Response, request
+
+from app.config import Config
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is optional
+    zstandard = None
+
+
+def _gzip(data: bytes, best: bool) -> bytes:
+    return gzip.compress(data, compresslevel=9 if best else 6, mtime=0)
+
+
+def _brotli(data: bytes, best: bool) -> bytes:
+    return brotli.compress(data, quality=11 if best else 4)
+
+
+def _zstd(data: bytes, best: bool) -> bytes:
+    return zstandard.ZstdCompressor(level=19 if best else 3).compress(data)
+
+
+# Installed encodings: name -> (sibling file suffix, compress function)
+ENCODINGS = {"gzip": (".gz", _gzip)}
+if brotli is not None:
+    ENCODINGS["br"] = (".br", _brotli)
+if zstandard is not None:
+    ENCODINGS["zstd"] = (".zst", _zstd)
+
+_SUFFIXES = tuple(suffix for suffix, _compress in ENCODINGS.values())
+
+# Statuses that never carry a compressible body
+_NO_BODY_STATUS = {204, 206, 304}
+
+
+class Compression:
+    """Encoding negotiation, on-the-fly compression and precompressed siblings."""
+
+    def __init__(self, encodings=(), min_size: int = 1024, types=()):
+        self.encodings = [name for name in encodings if name in ENCODINGS]
+        self.min_size = min_size
+        self.mimetypes = set(types)
+
+    def accepted(self, accept_encodings) -> list:
+        """Usable encodings the client accepts, best first."""
+        ranked = [
+            (accept_encodings.quality(name), -index, name)
+            for index, name in enumerate(self.encodings)
+        ]
+        return [name for quality, _index, name in sorted(ranked, reverse=True) if quality > 0]
+
+    def compress_response(self, response: Response) -> Response:
+        """after_request: compress a dynamic response for the client."""
+        if (
+            not self.encodings
+            or response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200
+            or response.status_code in _NO_BODY_STATUS
+            or response.mimetype not in self.mimetypes
+            or "Content-Encoding" in response.headers
+            or response.cache_control.no_transform
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        accepted = self.accepted(request.accept_encodings)
+        if not accepted:
+            return response
+
+        encoding = accepted[0]
+        compressed = ENCODINGS[encoding][1](data, False)
+        if len(compressed) >= len(data):
+            return response
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f"{etag}-{encoding}", weak)
+        return response
+
+    def is_compressible(self, path: str) -> bool:
+        """Whether a static file has a compressible type."""
+        return mimetypes.guess_type(path)[0] in self.mimetypes
+
+    def precompressed(self, path: str, accept_encodings):
+        """Return (sibling path, encoding) of the best fresh sibling the client accepts, or None."""
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        for encoding in self.accepted(accept_encodings):
+            sibling = path + ENCODINGS[encoding][0]
+            try:
+                if os.stat(sibling).st_mtime >= mtime:
+                    return sibling, encoding
+            except OSError:
+                continue
+        return None
+
+    def precompress_directory(self, directory: str) -> int:
+        """Write missing or stale compressed siblings of the files under directory.
+
+        A sibling is only written when smaller than the file. Returns the
+        number of files written; unwritable directories are skipped.
+        """
+        written = 0
+        for root, _dirs, files in os.walk(directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith(_SUFFIXES) or not self.is_compressible(path):
+                    continue
+                try:
+                    written += self._precompress_file(path)
+                except OSError:
+                    continue
+        return written
+
+    def _precompress_file(self, path: str) -> int:
+        stat = os.stat(path)
+        if stat.st_size < self.min_size:
+            return 0
+
+        written = 0
+        data = None
+        for encoding in self.encodings:
+            suffix, compress = ENCODINGS[encoding]
+            sibling = path + suffix
+            if os.path.exists(sibling) and os.stat(sibling).st_mtime >= stat.st_mtime:
+                continue
+            if data is None:
+                with open(path, "rb") as file:
+                    data = file.read()
+            compressed = compress(data, True)
+            if len(compressed) >= len(data):
+                continue
+            # Atomic replace: other workers may be precompressing or serving it
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".precompress-")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(compressed)
+                os.replace(tmp_path, sibling)
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+            written += 1
+        return written
+
+
+compression = Compression(
+    Config.COMPRESSION_ENCODINGS, Config.COMPRESSION_MIN_SIZE, Config.COMPRESSION_MIMETYPES
+)
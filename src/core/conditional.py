@@ -0,0 +1,50 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Conditional GET: validators and 304 responses decided before the body.
+
+Routes that can name the representation they would send (a content hash, an
+immutable record id) compute its ETag first, ask not_modified() whether the
+client already has it and only then load the body. If-None-Match takes
+precedence over If-Modified-Since, as in RFC 9110.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+
+from flask import Response, request
+from werkzeug.http import is_resource_modified
+
+_CONDITIONAL_METHODS = {"GET", "HEAD"}
+
+
+def etag_for(*parts) -> str:
+    """Strong ETag value identifying a representation by its parts."""
+    return hashlib.sha256("\0".join(map(str, parts)).encode()).hexdigest()[:32]
+
+
+def has_validators() -> bool:
+    """Whether the request carries If-None-Match or If-Modified-Since."""
+    return request.method in _CONDITIONAL_METHODS and bool(
+        request.if_none_match or request.if_modified_since
+    )
+
+
+def not_modified(etag: str, last_modified: float | None = None) -> Response | None:
+    """304 response when the request validators match, None otherwise.
+
+    last_modified is a timestamp, used only when there is no If-None-Match.
+    """
+    if not has_validators():
+        return None
+
+    modified = None
+    if last_modified is not None:
+        modified = datetime.fromtimestamp(last_modified, tz=timezone.utc)
+    if is_resource_modified(request.environ, etag=etag, last_modified=modified):
+        return None
+
+    response = Response(status=304)
+    response.set_etag(etag)
+    if modified is not None:
+        response.last_modified = modified
+    return response
@@ -0,0 +1,92 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Process-wide SQLAlchemy engine registry.
+
+Engines (and their connection pools) are created once per (db_url, db_type) and
+shared by every Model instance in the process, so building Session, User or Image
+objects per request does not create new engines or connection pools.
+
+The registry is fork-safe: when the process forks (gunicorn/uwsgi preload), the
+child discards the inherited engines without closing the parent's connections
+and lazily creates its own on first use.
+"""
+
+import os
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+from app.config import Config
+
+_engines: dict[tuple[str, str], Engine] = {}
+_engines_lock = threading.Lock()
+_engines_pid = os.getpid()
+
+
+def _is_memory_sqlite(db_url: str) -> bool:
+    return db_url.startswith("sqlite") and (":memory:" in db_url or db_url.rstrip("/") == "sqlite:")
+
+
+def _engine_options(db_url: str) -> dict:
+    """Build create_engine() pool options from Config."""
+    options = {
+        "pool_pre_ping": Config.DB_POOL_PRE_PING,
+        "pool_recycle": Config.DB_POOL_RECYCLE,
+    }
+
+    # In-memory SQLite uses SingletonThreadPool, which has no overflow setting.
+    if not _is_memory_sqlite(db_url):
+        options["pool_size"] = Config.DB_POOL_SIZE
+        options["max_overflow"] = Config.DB_MAX_OVERFLOW
+
+    return options
+
+
+def _discard_inherited_engines() -> None:
+    """Drop engines inherited from the parent process without closing its connections."""
+    global _engines_pid  # pylint: disable=global-statement
+    for engine in _engines.values():
+        engine.dispose(close=False)
+    _engines.clear()
+    _engines_pid = os.getpid()
+
+
+def _reset_after_fork() -> None:
+    """Fork hook: the lock may have been held by another parent thread, so recreate it."""
+    global _engines_lock  # pylint: disable=global-statement
+    _engines_lock = threading.Lock()
+    _discard_inherited_engines()
+
+
+def get_engine(db_url: str, db_type: str) -> Engine:
+    """Return the shared engine for db_url/db_type, creating it on first use."""
+    key = (str(db_url), str(db_type).lower())
+
+    if _engines_pid != os.getpid():
+        with _engines_lock:
+            if _engines_pid != os.getpid():
+                _discard_inherited_engines()
+
+    engine = _engines.get(key)
+    if engine is not None:
+        return engine
+
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = create_engine(key[0], **_engine_options(key[0]))
+            _engines[key] = engine
+        return engine
+
+
+def dispose_engines() -> None:
+    """Close all pooled connections and empty the registry (shutdown, tests)."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
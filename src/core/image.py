@@ -16,6 +16,7 @@ from app.extensions import cache
 from constants import DELETED
 from core.model import Model
 from core.user import User
+from utils.cursor import decode_cursor, encode_cursor
 
 
 @dataclass
@@ -50,7 +51,9 @@ class Image:
 
     _ALBUM_RE = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
     DEFAULT_ALBUM_CODES = ("gallery", "profile")
+    VARIANTS = ("thumb", "medium", "full")
     LEGACY_DELETED_REASON = 1
+    IN_BATCH_SIZE = 500
 
     def __init__(
         self,
@@ -123,6 +126,11 @@ class Image:
         """Normalize one public image link into a cache path prefix."""
         return urlsplit(str(link_or_path or "").strip()).path.rstrip("/")
 
+    @staticmethod
+    def etag_cache_key(path: str) -> str:
+        """Cache key of the ETag kept beside the cached view response of path."""
+        return f"view-etag/{path}"
+
     @staticmethod
     def _normalize_mode(image: PilImage.Image) -> PilImage.Image:
         """Normalize image mode preserving alpha when available."""
@@ -220,7 +228,7 @@ class Image:
             if normalized_album not in album_codes and len(album_codes) >= Config.IMAGE_MAX_ALBUMS:
                 raise ValueError(f"Limit of albums reached (Max: {Config.IMAGE_MAX_ALBUMS})")
 
-        uploaded_items = []
+        rows = []
         total_size = 0
 
         for file_item in files:
@@ -230,14 +238,9 @@ class Image:
             data = file_item.read()
             file_item.stream.seek(0)
             processed = self._process_image(data)
-            image_id = str(uuid.uuid4())
-            now = int(time.time())
-
-            result = self.model.exec(
-                "image",
-                "insert",
+            rows.append(
                 {
-                    "imageId": image_id,
+                    "imageId": str(uuid.uuid4()),
                     "profileId": profile_id,
                     "albumCode": normalized_album,
                     "thumbImg": processed.thumb_img,
@@ -252,19 +255,24 @@ class Image:
                     "thumbBytes": processed.thumb_bytes,
                     "mediumBytes": processed.medium_bytes,
                     "fullBytes": processed.full_bytes,
-                    "created": now,
-                },
+                    "created": int(time.time()),
+                }
             )
-            if not result or self.model.has_error:
-                raise RuntimeError(self.model.last_error or "Image insert failed.")
 
+        # All images of one upload are committed together (or not at all)
+        result = self.model.exec_many("image", "insert", rows)
+        if not result or self.model.has_error:
+            raise RuntimeError(self.model.last_error or "Image insert failed.")
+
+        uploaded_items = []
+        for row in rows:
             item = {
-                "imageId": image_id,
+                "imageId": row["imageId"],
                 "profileId": profile_id,
                 "albumCode": normalized_album,
-                "created": now,
+                "created": row["created"],
             }
-            item.update(self._variant_urls(image_id))
+            item.update(self._variant_urls(row["imageId"]))
             uploaded_items.append(item)
 
         if not uploaded_items:
@@ -278,8 +286,13 @@ class Image:
         album_code: str | None = None,
         limit: int = 20,
         offset: int = 0,
+        cursor: str = "",
     ) -> list[dict]:
-        """List metadata rows for one profile."""
+        """List metadata rows for one profile.
+
+        When cursor (from cursor_for()) is valid, rows after it are returned
+        by keyset and offset is ignored.
+        """
         query = "list-by-profileid"
         params = {
             "profileId": profile_id,
@@ -290,11 +303,23 @@ class Image:
             query = "list-by-profileid-albumcode"
             params["albumCode"] = self._normalize_album_code(album_code)
 
+        position = decode_cursor(cursor, "created")
+        if position:
+            query = f"{query}-after"
+            params["cursor_value"], params["cursor_id"] = position
+
         rows = self._result_rows_to_dicts(self.model.exec("image", query, params))
         for row in rows:
             row.update(self._variant_urls(row["imageId"]))
         return rows
 
+    @staticmethod
+    def cursor_for(row: dict) -> str:
+        """Cursor pointing after row for list_by_profile()/admin_list_images()."""
+        if not row:
+            return ""
+        return encode_cursor("created", row.get("created"), row.get("imageId"))
+
     def list_album_codes(self, profile_id: str) -> list[str]:
         """Return known album codes for one profile plus defaults."""
         rows = self._result_rows_to_dicts(
@@ -360,8 +385,8 @@ class Image:
             height=int(meta[variant_info["height"]]),
         )
 
-    def get_public_variant(self, image_id: str, variant: str) -> ImageVariant | None:
-        """Return one public image variant only when the owner profile is public."""
+    def get_public_meta(self, image_id: str) -> dict | None:
+        """Return metadata for one image only when the owner profile is public."""
         meta = self.get_meta(image_id)
         if not meta:
             return None
@@ -373,16 +398,24 @@ class Image:
         if not User(Config.DB_PWA, Config.DB_PWA_TYPE).get_public_profile_by_profileid(profile_id):
             return None
 
+        return meta
+
+    def get_public_variant(self, image_id: str, variant: str) -> ImageVariant | None:
+        """Return one public image variant only when the owner profile is public."""
+        if self.get_public_meta(image_id) is None:
+            return None
+
         return self.get_variant(image_id, variant)
 
     def invalidate_public_username_cache(self, username: str, profile_image_link: str = "") -> None:
-        """Invalidate one cached public profile image response by username."""
+        """Invalidate one cached public profile image response and its ETag by username."""
         profile_path = self._cache_path(profile_image_link)
         normalized = str(username or "").strip()
         if not profile_path or not normalized:
             return
+        path = f"{profile_path}/{normalized}"
         try:
-            cache.delete(f"view/{profile_path}/{normalized}")
+            cache.delete_many(f"view/{path}", self.etag_cache_key(path))
         except Exception:  # pragma: no cover - cache backend errors should not block app flows
             return
 
@@ -404,14 +437,13 @@ class Image:
         if not variant_path:
             return
 
-        result = self.model.exec(
+        rows = self.model.exec_iter(
             "image",
-            "list-by-profileid-all",
-            {"profileId": normalized_profile_id, "limit": 10000, "offset": 0},
+            "list-imageids-by-profileid-all",
+            {"profileId": normalized_profile_id},
         )
-        rows = self._result_rows_to_dicts(result)
-        for row in rows:
-            image_id = str(row.get("imageId") or "").strip()
+        for (image_id,) in rows:
+            image_id = str(image_id or "").strip()
             if not image_id:
                 continue
             for variant in ("thumb", "medium", "full"):
@@ -457,47 +489,95 @@ class Image:
         if not profile_id:
             return False
 
-        # Get all images for this profile (including disabled ones)
-        result = self.model.exec(
+        # Collect ids before writing: SQLite keeps the read lock while streaming
+        image_ids = [
+            image_id
+            for (image_id,) in self.model.exec_iter(
+                "image", "list-imageids-by-profileid-all", {"profileId": profile_id}
+            )
+            if image_id
+        ]
+        if self.model.has_error:
+            return False
+
+        disabled_by_image = {}
+        for start in range(0, len(image_ids), self.IN_BATCH_SIZE):
+            disabled_by_image.update(
+                self._admin_disabled_by_image_ids(image_ids[start:start + self.IN_BATCH_SIZE])
+            )
+
+        pending = [image_id for image_id in image_ids if str(image_id) not in disabled_by_image]
+        return self._disable_images(pending, "Deleted by profile")
+
+    def delete_images(self, image_ids: list, profile_id: str) -> list[str]:
+        """Disable several images of one profile in one transaction.
+
+        Returns the ids that were deleted; ids that do not belong to the profile
+        or are already disabled are skipped.
+        """
+        owned = self._active_owned_image_ids(image_ids, profile_id)
+        if not owned or not self._disable_images(owned, "Deleted by user"):
+            return []
+        return owned
+
+    def move_images(self, image_ids: list, profile_id: str, album_code: str) -> list[str]:
+        """Move several images of one profile to album_code in one transaction.
+
+        Raises ValueError for an invalid album code. Returns the moved ids; ids
+        that do not belong to the profile or are disabled are skipped.
+        """
+        normalized_album = self._normalize_album_code(album_code)
+        owned = self._active_owned_image_ids(image_ids, profile_id)
+        if not owned:
+            return []
+
+        result = self.model.exec_many(
             "image",
-            "list-by-profileid-all",
-            {"profileId": profile_id, "limit": 10000, "offset": 0}
+            "update-album",
+            [{"imageId": image_id, "albumCode": normalized_album} for image_id in owned],
+            per_row=True,
         )
-        rows = self._result_rows_to_dicts(result)
-        if not rows:
-            return True
+        if not result:
+            return []
+        return [owned[item["index"]] for item in result["results"] if item["success"]]
 
-        now = int(time.time())
-        success = True
-        for row in rows:
-            image_id = row.get("imageId")
-            if not image_id:
-                continue
+    def _active_owned_image_ids(self, image_ids: list, profile_id: str) -> list[str]:
+        """Filter image_ids down to active images owned by profile_id."""
+        ids = list(dict.fromkeys(str(image_id) for image_id in image_ids if image_id))
+        if not ids or not profile_id:
+            return []
 
-            # Check if already disabled
-            disabled_rows = self.model.exec(
+        owned = set()
+        for start in range(0, len(ids), self.IN_BATCH_SIZE):
+            result = self.model.exec(
                 "image",
-                "admin-get-image-disabled-by-imageid",
-                {"imageId": image_id}
+                "list-active-imageids-by-profileid-imageids",
+                {"profileId": profile_id, "imageIds": ids[start:start + self.IN_BATCH_SIZE]},
             )
-            if disabled_rows and disabled_rows.get("rows"):
-                continue
+            owned.update(str(row[0]) for row in (result or {}).get("rows") or [])
+        return [image_id for image_id in ids if image_id in owned]
 
-            disable_result = self.model.exec(
-                "image",
-                "upsert-image-disabled",
+    def _disable_images(self, image_ids: list, description: str) -> bool:
+        """Add the DELETED disabled reason to several images in one transaction."""
+        if not image_ids:
+            return True
+
+        now = int(time.time())
+        result = self.model.exec_many(
+            "image",
+            "upsert-image-disabled",
+            [
                 {
                     "reason": int(Config.DISABLED[DELETED]),
                     "imageId": image_id,
-                    "description": "Deleted by profile",
+                    "description": description,
                     "created": now,
                     "modified": now,
-                },
-            )
-            if not disable_result or not disable_result.get("success"):
-                success = False
-
-        return success
+                }
+                for image_id in image_ids
+            ],
+        )
+        return bool(result and result.get("success"))
 
     def is_image_disabled(self, image_id: str) -> bool:
         """Check if an image is disabled."""
@@ -508,6 +588,21 @@ class Image:
         )
         return bool(result and result.get("rows"))
 
+    def _admin_disabled_by_image_ids(self, image_ids: list) -> dict[str, list[dict]]:
+        """Fetch disabled rows for several images with one IN query, grouped by imageId."""
+        ids = list(dict.fromkeys(str(image_id) for image_id in image_ids if image_id))
+        if not ids:
+            return {}
+        result = self.model.exec(
+            "image",
+            "admin-get-image-disabled-by-imageids",
+            {"imageIds": ids},
+        )
+        grouped = {}
+        for row in self._result_rows_to_dicts(result):
+            grouped.setdefault(str(row.pop("imageId")), []).append(row)
+        return grouped
+
     def admin_list_images(
         self,
         order_by: str = "created",
@@ -515,8 +610,13 @@ class Image:
         disabled_reason: str = "",
         limit: int = 100,
         offset: int = 0,
+        cursor: str = "",
     ) -> list[dict]:
-        """List images for admin views including disabled entries."""
+        """List images for admin views including disabled entries.
+
+        For the "created" order a cursor from cursor_for() selects keyset
+        pagination; other orders use limit/offset.
+        """
         query_map = {
             "created": "admin-list-images-created",
             "disabled_created_date": "admin-list-images-disabled-created-date",
@@ -527,6 +627,7 @@ class Image:
         disabled_reason = str(disabled_reason or "").strip()
         target_limit = max(1, int(limit))
         current_offset = max(0, int(offset))
+        position = decode_cursor(cursor, "created") if query == "admin-list-images-created" else None
         deleted_reasons = {
             int(Config.DISABLED[DELETED]),
             self.LEGACY_DELETED_REASON,
@@ -534,28 +635,31 @@ class Image:
         visible_rows = []
 
         while len(visible_rows) < target_limit:
+            params = {
+                "search": search,
+                "disabled_reason": disabled_reason,
+                "limit": target_limit,
+                "offset": current_offset,
+            }
+            if position:
+                params["cursor_value"], params["cursor_id"] = position
             result = self.model.exec(
                 "image",
-                query,
-                {
-                    "search": search,
-                    "disabled_reason": disabled_reason,
-                    "limit": target_limit,
-                    "offset": current_offset,
-                },
+                f"{query}-after" if position else query,
+                params,
             )
             rows = self._result_rows_to_dicts(result)
             if not rows:
                 break
 
             current_offset += len(rows)
+            if position:
+                position = (int(rows[-1]["created"]), str(rows[-1]["imageId"]))
+            disabled_by_image = self._admin_disabled_by_image_ids(
+                [row.get("imageId") for row in rows]
+            )
             for row in rows:
-                disabled_rows = self.model.exec(
-                    "image",
-                    "admin-get-image-disabled-by-imageid",
-                    {"imageId": row.get("imageId")},
-                )
-                row["disabled"] = self._result_rows_to_dicts(disabled_rows)
+                row["disabled"] = disabled_by_image.get(str(row.get("imageId")), [])
                 if any(int(item.get("reason")) in deleted_reasons for item in row["disabled"] if item.get("reason") is not None):
                     continue
                 visible_rows.append(row)
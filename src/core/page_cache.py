@@ -0,0 +1,249 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Full-response cache for anonymous GET requests to routes that opt in.
+
+A component opts in per route in manifest.json:
+
+    "page_cache": {"/": 300, "/news": 60}
+
+Keys are route prefixes relative to the manifest route, as in "security"; the
+most specific prefix wins and its value is the TTL in seconds (0 disables).
+
+Only anonymous requests are cached: GET, not AJAX, no session and no dev admin
+session cookie. The key covers what such a page can depend on: scheme, host,
+path, query arguments, the language Accept-Language negotiates and the request
+cookies (the UTOKEN cookie only by presence; the tab detection cookie and
+PAGE_CACHE_IGNORE_COOKIES are left out). Opting a route in asserts its output
+depends on nothing else.
+
+Per-request values are never stored: a cacheable render runs with secret
+placeholders for CSP_NONCE, LTOKEN and CONTEXT->UTOKEN and every response, hit
+or miss, gets its own values substituted in. The UTOKEN and tab detection
+cookies are recomputed per response; other Set-Cookie headers are stored. A
+hit is served from before_request without building PreparedRequest, so it
+touches neither the databases nor the template engine.
+
+Backends (PAGE_CACHE_BACKEND):
+
+- "local": in-process TTL + LRU (default).
+- "flask": the Flask-Caching instance from app.extensions.
+- "none": caching disabled.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import orjson
+from flask import Response, current_app, g
+
+from app.config import Config
+from app.extensions import cache as flask_cache
+from utils.nonce import get_nonce
+from utils.sbase64url import sbase64url_sha256
+from utils.tokens import ltoken_create, utoken_update
+
+from .prepared_request import PreparedRequest
+from .route_policy import normalize_route_path, route_policy
+from .session_dev import SessionDev
+
+AJAX_HEADER = "Requested-With-Ajax"
+
+# Headers rebuilt for every response instead of being stored
+_RESPONSE_HEADERS = {"content-length", "set-cookie"}
+
+
+class LocalPageCache:
+    """In-process TTL + LRU store."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Return the stored value or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: int) -> None:
+        """Store value for ttl seconds, evicting the least recently used entries when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+class FlaskPageCache:
+    """Store backed by the app's Flask-Caching instance."""
+
+    PREFIX = "page_cache:"
+
+    def __init__(self, cache=flask_cache):
+        self.cache = cache
+
+    def get(self, key: str):
+        """Return the stored value or None."""
+        return self.cache.get(self.PREFIX + key)
+
+    def set(self, key: str, value, ttl: int) -> None:
+        """Store value for ttl seconds."""
+        self.cache.set(self.PREFIX + key, value, timeout=ttl)
+
+    def clear(self) -> None:
+        """Flask-Caching has no prefix clear; entries expire by TTL."""
+
+
+class CacheablePage:  # pylint: disable=too-few-public-methods
+    """Cache key and TTL of a cacheable request."""
+
+    __slots__ = ("key", "ttl")
+
+    def __init__(self, key: str, ttl: int):
+        self.key = key
+        self.ttl = ttl
+
+
+def _placeholder(name: str) -> str:
+    # Same in every process sharing a backend, unguessable without SECRET_KEY.
+    return sbase64url_sha256(f"page-cache:{name}:{Config.SECRET_KEY}")
+
+
+class PageCache:
+    """Anonymous full-response cache over a pluggable backend."""
+
+    def __init__(self, backend=None, ignore_cookies=()):
+        self.backend = backend
+        self.ignore_cookies = {Config.UTOKEN_KEY, Config.TAB_CHANGES_KEY, *ignore_cookies}
+        self.nonce = _placeholder("nonce")
+        self.ltoken = _placeholder("ltoken")
+        self.utoken = _placeholder("utoken")
+        self._placeholders = (self.nonce.encode(), self.ltoken.encode(), self.utoken.encode())
+
+    def match(self, req, component_bp) -> CacheablePage | None:
+        """Return the CacheablePage for req, or None when it must not be cached."""
+        if self.backend is None or req.method != "GET" or req.headers.get(AJAX_HEADER):
+            return None
+
+        manifest = getattr(component_bp, "manifest", None)
+        if not isinstance(manifest, dict) or not isinstance(manifest.get("page_cache"), dict):
+            return None
+
+        cookies = req.cookies
+        if Config.SESSION_KEY in cookies or SessionDev.get_auth_cookie_key() in cookies:
+            return None
+
+        ttl = route_policy(component_bp).lookup(normalize_route_path(req.path)).page_cache
+        if isinstance(ttl, bool) or not ttl or ttl <= 0:
+            return None
+
+        languages = current_app.schema_base["data"]["current"]["site"]["languages"]  # pylint: disable=no-member
+        key = orjson.dumps([
+            req.scheme,
+            req.host.lower(),
+            req.path,
+            sorted(req.args.items(multi=True)),
+            req.accept_languages.best_match(languages) or "",
+            Config.UTOKEN_KEY in cookies,
+            sorted(item for item in cookies.items(multi=True) if item[0] not in self.ignore_cookies),
+        ])
+        return CacheablePage(hashlib.sha256(key).hexdigest(), ttl)
+
+    def serve(self, req, page: CacheablePage) -> Response | None:
+        """Build the response for a cache hit, or return None on a miss."""
+        entry = self.backend.get(page.key)
+        if entry is None:
+            return None
+
+        utoken, utoken_cookie = utoken_update(req.cookies.get(Config.UTOKEN_KEY))
+        response = Response(
+            self._substitute(entry["body"], get_nonce(), utoken),
+            status=entry["status"],
+            headers=entry["headers"],
+        )
+        cookies = {**utoken_cookie, **PreparedRequest.tab_changes_cookie(utoken, None)}
+        for cookie_params in cookies.values():
+            response.set_cookie(**cookie_params)
+        return response
+
+    def render_with_placeholders(self, pr, page: CacheablePage) -> None:
+        """Swap the request's per-request values for placeholders before it renders."""
+        data = pr.schema_data
+        g.page_cache = (page, data["CSP_NONCE"], data["CONTEXT"]["UTOKEN"])
+        data["CSP_NONCE"] = self.nonce
+        data["LTOKEN"] = self.ltoken
+        data["CONTEXT"]["UTOKEN"] = self.utoken
+
+    def store(self, response: Response) -> Response:
+        """after_request: cache a placeholder render and give it its real values."""
+        pending = g.pop("page_cache", None)
+        if pending is None or response.direct_passthrough or response.is_streamed:
+            return response
+
+        page, nonce, utoken = pending
+        body = response.get_data()
+
+        if response.status_code == 200 and response.mimetype == "text/html":
+            per_request = (f"{Config.UTOKEN_KEY}=", f"{Config.TAB_CHANGES_KEY}=")
+            headers = [
+                (name, value) for name, value in response.headers.items()
+                if name.lower() not in _RESPONSE_HEADERS
+            ]
+            headers.extend(
+                ("Set-Cookie", value) for value in response.headers.getlist("Set-Cookie")
+                if not value.startswith(per_request)
+            )
+            self.backend.set(
+                page.key, {"status": response.status_code, "headers": headers, "body": body}, page.ttl
+            )
+
+        response.set_data(self._substitute(body, nonce, utoken))
+        if "Location" in response.headers:
+            location = response.headers["Location"].encode()
+            response.headers["Location"] = self._substitute(location, nonce, utoken).decode()
+        return response
+
+    def clear(self) -> None:
+        """Drop every cached page (tests)."""
+        if self.backend is not None:
+            self.backend.clear()
+
+    def _substitute(self, data: bytes, nonce: str, utoken: str) -> bytes:
+        # Bodies are stored encoded; bytes.replace skips a decode/encode per hit.
+        nonce_ph, ltoken_ph, utoken_ph = self._placeholders
+        return (
+            data.replace(nonce_ph, nonce.encode())
+            .replace(ltoken_ph, ltoken_create(utoken).encode())
+            .replace(utoken_ph, utoken.encode())
+        )
+
+
+def create_backend(name: str, max_entries: int):
+    """Build the backend selected by PAGE_CACHE_BACKEND."""
+    name = (name or "").strip().lower()
+    if max_entries <= 0 or name in ("", "none"):
+        return None
+    if name == "flask":
+        return FlaskPageCache()
+    return LocalPageCache(max_entries)
+
+
+page_cache = PageCache(
+    create_backend(Config.PAGE_CACHE_BACKEND, Config.PAGE_CACHE_MAX_ENTRIES),
+    Config.PAGE_CACHE_IGNORE_COOKIES,
+)
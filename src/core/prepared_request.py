@@ -17,13 +17,12 @@ and may cause undefined behavior.
 from dataclasses import dataclass, field
 from typing import Any
 import os
-import json
 import logging
-from functools import lru_cache
+
+from flask import current_app
 
 from app.config import Config
 from constants import DELETED
-from utils import merge_dict
 from utils.tokens import (
     utoken_extract,
     utoken_update,
@@ -31,6 +30,7 @@ from utils.tokens import (
 )
 from utils.sbase64url import sbase64url_md5
 from utils.nonce import get_nonce
+from .route_policy import normalize_route_path, route_policy
 from .schema import Schema
 from .session import Session
 from .user import User
@@ -39,21 +39,6 @@ from .template import Template
 logger = logging.getLogger(__name__)
 
 
-# Cache for parsed blueprint schemas to avoid reading JSON on every request
-@lru_cache(maxsize=128)
-def _load_bp_schema_cached(schema_path: str) -> dict:
-    """Load and parse blueprint schema with caching.
-
-    Args:
-        schema_path: Path to the schema JSON file
-
-    Returns:
-        Parsed JSON as dict
-    """
-    with open(schema_path, "r", encoding="utf-8") as file:
-        return json.load(file)
-
-
 @dataclass
 class PreparedRequest:  # pylint: disable=too-many-instance-attributes
     """Core bootstrap object shared for the current request.
@@ -82,21 +67,13 @@ class PreparedRequest:  # pylint: disable=too-many-instance-attributes
     # Request object (required)
     req: Any
 
-    # Core objects (initialized by build())
-    schema: Any | None = None
-    session: Any | None = None
-    user: Any | None = None
-    view: Any | None = None
-
     # Shared request data (initialized by build())
-    schema_data: dict = field(default_factory=dict)
-    schema_local_data: dict = field(default_factory=dict)
     ajax_request: bool = False
 
     # Routing/policy context
     route_path: str = "/"
     policy: dict | None = None
-    allowed_roles: list[str] | None = None
+    allowed_roles: frozenset[str] | None = None
     route_require_auth: bool | None = None
 
     # Access decision (fail closed by default)
@@ -108,50 +85,93 @@ class PreparedRequest:  # pylint: disable=too-many-instance-attributes
     _component_bp: Any = None
     _component_uuid: str | None = None
 
+    # Core objects and request data, built on first access (see the properties)
+    _schema: Any = None
+    _data: dict = field(default_factory=dict)
+    _session: Any = None
+    _user: Any = None
+    _view: Any = None
+    _request_user: dict | None = None
+    _materialized: bool = False
+
     def build(self, component_bp=None, full_path: str = "") -> "PreparedRequest":
-        """Build all request-scoped core context and evaluate policies.
+        """Build the request context needed for the access decision and evaluate policies.
 
         Args:
             component_bp: The component blueprint
             full_path: Full request path (for security policy evaluation)
 
         Stages:
-        1. Core schema initialization
+        1. Core schema initialization (component snapshot, blueprint schema included)
         2. Component context setup (including CURRENT_BP_SCHEMA)
-        3. Blueprint schema merge
-        4. Core objects initialization (Session, User, Template)
-        5. Context materialization (user, tokens, cookies)
-        6. Route/policy resolution
-        7. Policy evaluation (auth → status → roles)
+        3. Route/policy resolution
+        4. Policy evaluation (auth → status → roles)
+
+        The policy checks load the request user, which only touches the DB when
+        the request carries a session cookie. Session, User and Template, and
+        the per-request schema fields (USER, session data, tokens, cookies),
+        are built on first access of session, user, view, schema or schema_data.
         """
         self._component_bp = component_bp
 
-        # Stage 1: Initialize schema (needed for everything else)
-        self.schema = Schema(self.req)
-        self.schema_data = self.schema.properties["data"]
-        self.schema_local_data = self.schema.properties["inherit"]["data"]
+        # Stage 1: Initialize schema (needed for everything else). It starts from
+        # the component's precomputed snapshot, route/schema.json already merged.
+        self._schema = Schema(self.req, self._bp_component_uuid())
+        self._data = self._schema.properties["data"]
+
+        # Detect AJAX request
+        self.ajax_request = bool(self._data["CONTEXT"]["HEADERS"].get("Requested-With-Ajax"))
 
         # Stage 2: Setup component context (establishes CURRENT_BP_SCHEMA)
         # Note: CURRENT_COMP_ROUTE will be set by RequestHandler
         self._setup_component_context()
 
-        # Stage 3: Merge blueprint-specific schema
-        self._merge_bp_schema()
-
-        # Stage 4: Initialize remaining core objects
-        self._init_core_objects()
-
-        # Stage 5: Materialize request context
-        self._materialize_context()
-
-        # Stage 6: Resolve route security policy (uses full path)
+        # Stage 3: Resolve route security policy (uses full path)
         self._resolve_route_policy(full_path)
 
-        # Stage 7: Evaluate security policy
+        # Stage 4: Evaluate security policy
         self._evaluate_policy()
 
         return self
 
+    @property
+    def schema(self):
+        """Request Schema, with the request context materialized."""
+        self._materialize()
+        return self._schema
+
+    @property
+    def schema_data(self) -> dict:
+        """Schema data, with the request context materialized."""
+        self._materialize()
+        return self._data
+
+    @property
+    def schema_local_data(self) -> dict:
+        """Schema inherit data, with the request context materialized."""
+        self._materialize()
+        return self._schema.properties["inherit"]["data"]
+
+    @property
+    def view(self):
+        """Request Template, with the request context materialized."""
+        self._materialize()
+        return self._view
+
+    @property
+    def session(self):
+        """Request Session, created on first access."""
+        if self._session is None:
+            self._session = Session(self._data["CONTEXT"]["SESSION"])
+        return self._session
+
+    @property
+    def user(self):
+        """User model, created on first access."""
+        if self._user is None:
+            self._user = User()
+        return self._user
+
     def _setup_component_context(self) -> None:
         """Setup component context variables in schema data.
 
@@ -170,7 +190,7 @@ class PreparedRequest:  # pylint: disable=too-many-instance-attributes
         Note: CURRENT_COMP_ROUTE is intentionally left for RequestHandler to set,
         as it has access to the actual component-relative route from the route handler.
         """
-        data = self.schema_data
+        data = self._data
 
         # CURRENT_COMP_ROUTE will be set by RequestHandler with the actual route
         # We only set a placeholder here for backward compatibility
@@ -186,7 +206,7 @@ class PreparedRequest:  # pylint: disable=too-many-instance-attributes
         if self._component_bp and hasattr(self._component_bp, "component"):
             component = self._component_bp.component
             name = component.get("name")
-            uuid = component.get("manifest", {}).get("uuid")
+            uuid = self._bp_component_uuid()
             neutral_route = getattr(self._component_bp, "neutral_route", neutral_route)
 
         data["CURRENT_NEUTRAL_ROUTE"] = neutral_route
@@ -201,83 +221,68 @@ class PreparedRequest:  # pylint: disable=too-many-instance-attributes
             else data.get("CURRENT_COMP_PATH", "")
         )
 
-        # Blueprint schema path (critical for _merge_bp_schema)
+        # Blueprint schema path (merged into the component's schema snapshot)
         if uuid and uuid in data:
             data["CURRENT_BP_SCHEMA"] = data[uuid].get("bp_schema")
         else:
             data["CURRENT_BP_SCHEMA"] = None
 
-    def _merge_bp_schema(self) -> None:
-        """Merge component-specific schema into main schema.
+    def _bp_component_uuid(self) -> str | None:
+        """UUID of the component owning the blueprint, if any."""
+        component = getattr(self._component_bp, "component", None)
+        if not component:
+            return None
+        return component.get("manifest", {}).get("uuid")
 
-        Fail closed: if schema exists but cannot be loaded, raise exception.
-        Uses cached schema to avoid repeated file I/O.
-        """
-        schema_path = self.schema_data.get("CURRENT_BP_SCHEMA")
-        if not schema_path:
+    def _materialize(self) -> None:
+        """Build the Template and the request context once, on first access."""
+        if self._materialized or self._schema is None:
             return
-
-        # Use cached schema to avoid repeated file reads
-        try:
-            cached_schema = _load_bp_schema_cached(schema_path)
-            merge_dict(self.schema.properties, cached_schema)
-        except Exception:  # pylint: disable=broad-except
-            # Fail closed: schema errors propagate (request will fail)
-            # Invalidate cache on error and retry once
-            _load_bp_schema_cached.cache_clear()
-            cached_schema = _load_bp_schema_cached(schema_path)
-            merge_dict(self.schema.properties, cached_schema)
-
-    def _init_core_objects(self) -> None:
-        """Initialize core framework objects that depend on schema."""
-        self.session = Session(self.schema_data["CONTEXT"]["SESSION"])
-        self.user = User()
-        self.view = Template(self.schema)
-
-        # Detect AJAX request
-        self.ajax_request = bool(
-            self.schema_data["CONTEXT"]["HEADERS"].get("Requested-With-Ajax")
-        )
+        self._materialized = True
+        self._view = Template(self._schema)
+        self._materialize_context()
 
     def _materialize_context(self) -> None:
         """Build request context: session, user, tokens, cookies."""
-        # Session handling
+        data = self._data
+
+        # Request user first: it reads the session id from the session cookie
+        data["USER"] = self._get_current_user()
+
+        # Session handling: one SELECT, memoized by Session for cookie and properties
         session_id, session_cookie = self.session.get()
-        self.schema_data["CONTEXT"]["SESSION"] = session_id
+        data["CONTEXT"]["SESSION"] = session_id
 
         # Session data
-        session_data = self.session.get_session_properties() if session_id else {}
-        self.schema_data["CONTEXT"]["SESSION_DATA"] = (
-            session_data if isinstance(session_data, dict) else {}
-        )
-
-        # Request user (rebuilt from DB per request, not persisted in session)
-        self.schema_data["USER"] = self._build_request_user(
-            self.schema_data["CONTEXT"]["SESSION_DATA"]
-        )
-        self.schema_data["CONTEXT"]["SESSION_DATA"].pop("user", None)
-        self.schema_data["CONTEXT"]["SESSION_DATA"].pop("user_data", None)
-        # Add localdev role if SessionDev session is active
-        self._add_localdev_role_if_session_dev()
+        data["CONTEXT"]["SESSION_DATA"] = dict(self.session.properties) if session_id else {}
+        data["CONTEXT"]["SESSION_DATA"].pop("user", None)
+        data["CONTEXT"]["SESSION_DATA"].pop("user_data", None)
 
         # Session flags
-        self.schema_data["HAS_SESSION"] = "true" if session_id else None
-        self.schema_data["HAS_SESSION_STR"] = "true" if session_id else "false"
+        data["HAS_SESSION"] = "true" if session_id else None
+        data["HAS_SESSION_STR"] = "true" if session_id else "false"
 
         # Security tokens
-        self.schema_data["CSP_NONCE"] = get_nonce()
+        data["CSP_NONCE"] = get_nonce()
         self._parse_utoken()
-        self.schema_data["LTOKEN"] = ltoken_create(
-            self.schema_data["CONTEXT"]["UTOKEN"]
-        )
+        data["LTOKEN"] = ltoken_create(data["CONTEXT"]["UTOKEN"])
 
         # Non-AJAX: setup cookies
         if not self.ajax_request:
             self._setup_cookies(session_cookie)
 
-    def _build_request_user(self, session_data: dict) -> dict:
-        """Build schema_data['USER'] from session identity and current DB state."""
-        user_id = self._extract_session_user_id(session_data)
+    def _build_request_user(self) -> dict:
+        """Build the request user from session identity and current DB state.
+
+        Requests without a session cookie get the anonymous user without
+        creating the Session or User objects, so they do no DB I/O.
+        """
+        if not self._data["CONTEXT"]["SESSION"]:
+            return User._default_runtime_user()  # pylint: disable=protected-access
+
+        user_id = self._extract_session_user_id(self.session.properties)
+        if not user_id:
+            return User._default_runtime_user()  # pylint: disable=protected-access
         return self.user.get_runtime_user(user_id)
 
     @staticmethod
@@ -306,12 +311,17 @@ class PreparedRequest:  # pylint: disable=too-many-instance-attributes
 
         session_dev = SessionDev()
         if session_dev.check_session():
-            self._get_current_user()["profile_roles"]["localdev"] = "localdev"
+            self._request_user["profile_roles"]["localdev"] = "localdev"
 
     def _get_current_user(self) -> dict:
-        """Return normalized request user data."""
-        user = self.schema_data.get("USER", {})
-        return user if isinstance(user, dict) else {}
+        """Return normalized request user data, built on first use."""
+        if self._request_user is None:
+            user = self._build_request_user()
+            self._request_user = user if isinstance(user, dict) else {}
+            if self._request_user:
+                # Add localdev role if SessionDev session is active
+                self._add_localdev_role_if_session_dev()
+        return self._request_user
 
     def _parse_utoken(self) -> None:
         """Parse/update UTOKEN for form submission protection."""
@@ -322,48 +332,56 @@ class PreparedRequest:  # pylint: disable=too-many-instance-attributes
         else:
             utoken_token, utoken_cookie = utoken_extract(utoken_cookie_value)
 
-        self.schema_data["CONTEXT"]["UTOKEN"] = utoken_token
+        self._data["CONTEXT"]["UTOKEN"] = utoken_token
 
         if not self.ajax_request:
-            self.view.add_cookie({**utoken_cookie})
+            self._view.add_cookie({**utoken_cookie})
 
     def _setup_cookies(self, session_cookie: dict) -> None:
         """Setup all non-AJAX cookies."""
-        # Tab change detection cookie
-        detect = "start"
-        detect += self.schema_data["CONTEXT"].get("UTOKEN") or "none"
-        detect += self.schema_data["CONTEXT"].get("SESSION") or "none"
-
+        data = self._data
         cookies = {
             **session_cookie,
-            Config.TAB_CHANGES_KEY: {
-                "key": Config.TAB_CHANGES_KEY,
-                "value": sbase64url_md5(detect),
-            },
+            **self.tab_changes_cookie(
+                data["CONTEXT"].get("UTOKEN"),
+                data["CONTEXT"].get("SESSION"),
+            ),
             Config.THEME_KEY: {
                 "key": Config.THEME_KEY,
-                "value": self.schema_data["current"]["theme"]["theme"],
+                "value": data["current"]["theme"]["theme"],
             },
             Config.THEME_COLOR_KEY: {
                 "key": Config.THEME_COLOR_KEY,
-                "value": self.schema_data["current"]["theme"]["color"],
+                "value": data["current"]["theme"]["color"],
             },
             Config.LANG_KEY: {
                 "key": Config.LANG_KEY,
-                "value": self.schema.properties["inherit"]["locale"]["current"],
+                "value": self._schema.properties["inherit"]["locale"]["current"],
             },
         }
 
-        self.view.add_cookie(cookies)
+        self._view.add_cookie(cookies)
+
+    @staticmethod
+    def tab_changes_cookie(utoken: str | None, session_id: str | None) -> dict:
+        """Tab change detection cookie: changes whenever UTOKEN or session change."""
+        detect = "start" + (utoken or "none") + (session_id or "none")
+        return {
+            Config.TAB_CHANGES_KEY: {
+                "key": Config.TAB_CHANGES_KEY,
+                "value": sbase64url_md5(detect),
+            },
+        }
 
     def _resolve_route_policy(self, route: str) -> None:
         """Resolve route metadata and security policy from blueprint manifest.
 
-        Policy keys in manifest are relative to component route.
-        They are expanded with component route for matching against full request path.
+        Policy keys in manifest are relative to component route. They are
+        expanded and compiled once per manifest (core.route_policy), so this
+        is a single longest-prefix lookup of the full request path.
         """
         # Normalize route path (use full path as-is)
-        self.route_path = self._normalize_route_path(route)
+        self.route_path = normalize_route_path(route)
 
         # Reset policy state
         self.policy = None
@@ -371,7 +389,7 @@ class PreparedRequest:  # pylint: disable=too-many-instance-attributes
         self.route_require_auth = None
 
         # Ensure we have component UUID and blueprint
-        self._component_uuid = self.schema_data.get("CURRENT_COMP_UUID")
+        self._component_uuid = self._data.get("CURRENT_COMP_UUID")
         if not self._component_uuid:
             # No component UUID - policy remains None, will be denied in _evaluate_policy
             return
@@ -391,31 +409,10 @@ class PreparedRequest:  # pylint: disable=too-many-instance-attributes
 
         self.policy = security
 
-        # Get component route for expanding relative policy keys
-        # e.g., component route="/admin", policy key "/users" → expanded "/admin/users"
-        component_route = manifest.get("route", "")
-
-        # Resolve routes_auth policy
-        routes_auth = security.get("routes_auth")
-        if isinstance(routes_auth, dict):
-            self.route_require_auth = self._resolve_policy_by_prefix(
-                self.route_path, routes_auth, expected_type=bool,
-                component_route=component_route
-            )
-
-        # Resolve routes_role policy
-        routes_role = security.get("routes_role")
-        if isinstance(routes_role, dict):
-            matched_roles = self._resolve_policy_by_prefix(
-                self.route_path, routes_role, expected_type=list,
-                component_route=component_route
-            )
-            if matched_roles is not None:
-                self.allowed_roles = [
-                    str(role).strip().lower()
-                    for role in matched_roles
-                    if str(role).strip()
-                ]
+        # Resolve routes_auth and routes_role (roles normalized at compile time)
+        rules = route_policy(self._component_bp).lookup(self.route_path)
+        self.route_require_auth = rules.require_auth
+        self.allowed_roles = rules.roles
 
     def _evaluate_policy(self) -> None:
         """Evaluate core security policy: auth → status → roles.
@@ -486,9 +483,8 @@ class PreparedRequest:  # pylint: disable=too-many-instance-attributes
 
         # Check if user has any of the allowed roles
         user_role_map = self._get_current_user().get("profile_roles", {})
-        user_roles = set(user_role_map.keys())
 
-        if not user_roles.intersection(set(self.allowed_roles)):
+        if self.allowed_roles.isdisjoint(user_role_map):
             self._deny(403, "role_not_allowed")
             return
 
@@ -541,94 +537,73 @@ class PreparedRequest:  # pylint: disable=too-many-instance-attributes
                 "route_path": self.route_path,
                 "deny_reason": reason,
                 "deny_status": status,
-                "user_id": self._get_current_user().get("id"),
-                "has_session": self.schema_data.get("HAS_SESSION") == "true",
+                "user_id": (self._request_user or {}).get("id"),
+                "has_session": self._session is not None and self._session.load() is not None,
             }
         )
 
-    @staticmethod
-    def _normalize_route_path(route: str) -> str:
-        """Normalize route path for policy lookup.
-
-        Rules:
-        - Empty path -> /
-        - Ensure leading slash
-        - Remove trailing slash except root
-        """
-        path = (route or "").strip()
 
-        if not path:
-            return "/"
+class LightPreparedRequest:
+    """PreparedRequest stand-in for light routes (manifest "light_routes").
 
-        if not path.startswith("/"):
-            path = f"/{path}"
+    Light routes serve the same public content to everyone (static files,
+    scripts, image variants). Only the manifest security policy is evaluated,
+    and only an anonymous-safe one (no auth, roles "*") is accepted here;
+    user status restrictions do not apply. Anything else goes through the
+    full build instead.
 
-        # Remove trailing slash except for root
-        if len(path) > 1 and path.endswith("/"):
-            path = path.rstrip("/")
+    No schema, session, user or template is built up front: the first read of
+    any PreparedRequest attribute (a handler creating a RequestHandler, an
+    error page...) builds the full PreparedRequest and delegates to it.
+    """
 
-        return path or "/"
+    def __init__(self, req, component_bp=None, full_path: str = ""):
+        self._prepared = None
+        self._component_bp = component_bp
+        self._full_path = full_path
+        self.req = req
+
+        policy = PreparedRequest(req)
+        policy._component_bp = component_bp  # pylint: disable=protected-access
+        policy._data = {"CURRENT_COMP_UUID": policy._bp_component_uuid()}  # pylint: disable=protected-access
+        policy._resolve_route_policy(full_path)  # pylint: disable=protected-access
+
+        self.route_path = policy.route_path
+        self.policy = policy.policy
+        self.allowed_roles = policy.allowed_roles
+        self.route_require_auth = policy.route_require_auth
+        self.allowed = policy.route_require_auth is False and policy.allowed_roles == {"*"}
+        self.deny_status = None
+        self.deny_reason = None
 
     @staticmethod
-    def _route_matches_prefix(route_path: str, prefix_path: str) -> bool:
-        """Check if route_path matches the given prefix.
-
-        - Root prefix "/" matches all routes
-        - Otherwise matches exact or prefix with segment boundary
-        """
-        if prefix_path == "/":
-            return True
-        return (
-            route_path == prefix_path or
-            route_path.startswith(f"{prefix_path}/")
-        )
-
-    def _resolve_policy_by_prefix(
-        self,
-        route_path: str,
-        policy_map: dict | None,
-        expected_type: type,
-        component_route: str = ""
-    ) -> Any:
-        """Resolve policy by prefix matching (most specific wins).
-
-        Args:
-            route_path: Normalized route path (full request path)
-            policy_map: Dict mapping relative path prefixes to policy values
-            expected_type: Expected type of policy value
-            component_route: Component's base route for expanding relative keys
-
-        Returns:
-            Best matching policy value or None if no match
-        """
-        if not isinstance(policy_map, dict):
-            return None
-
-        best_prefix: str | None = None
-        best_value: Any = None
-
-        for prefix, value in policy_map.items():
-            # Expand relative policy key with component route
-            # e.g., prefix="/users" + component_route="/admin" → expanded="/admin/users"
-            if component_route and prefix.startswith("/"):
-                expanded_prefix = component_route + prefix
-            else:
-                expanded_prefix = prefix
-
-            normalized_prefix = self._normalize_route_path(expanded_prefix)
-
-            if not self._route_matches_prefix(route_path, normalized_prefix):
-                continue
+    def matches(component_bp, full_path: str) -> bool:
+        """Whether the request path is declared light in the blueprint manifest."""
+        manifest = getattr(component_bp, "manifest", None)
+        if not isinstance(manifest, dict) or not isinstance(manifest.get("light_routes"), dict):
+            return False
+
+        return route_policy(component_bp).lookup(normalize_route_path(full_path)).light is True
+
+    @property
+    def prepared(self) -> PreparedRequest:
+        """The full PreparedRequest, built on first use."""
+        if self._prepared is None:
+            self._prepared = PreparedRequest(self.req).build(
+                component_bp=self._component_bp,
+                full_path=self._full_path,
+            )
+        return self._prepared
 
-            if not isinstance(value, expected_type):
-                continue
+    def __getattr__(self, name):
+        # Only reached for attributes not set in __init__
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.prepared, name)
 
-            # Most specific (longest) prefix wins
-            if best_prefix is None or len(normalized_prefix) > len(best_prefix):
-                best_prefix = normalized_prefix
-                best_value = value
 
-        return best_value
 def clear_bp_schema_cache() -> None:
-    """Clear the blueprint schema cache. Useful for development/hot reloading."""
-    _load_bp_schema_cached.cache_clear()
+    """Rebuild the blueprint schema snapshots. Useful for development/hot reloading."""
+    current_app.schema_snapshots = current_app.components.schema_snapshots(  # pylint: disable=no-member
+        current_app.schema_base  # pylint: disable=no-member
+    )
@@ -0,0 +1,204 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Compiled catalog of JSON-defined SQL queries.
+
+Model JSON files (src/model/*.json and component model_dir overrides) are read,
+validated and compiled once. Dialect aliases ("@sqlite": "@portable") are resolved
+ahead of time and every statement is kept as a ready-to-execute TextClause, so
+Model.exec() does no file I/O, JSON parsing or text() construction per call.
+
+In debug mode the catalog can reload a file when its mtime changes.
+"""
+
+import json
+import os
+import re
+import threading
+from typing import NamedTuple, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.sql.elements import TextClause
+
+from app.config import Config
+
+DEFAULT_TYPE = '@portable'
+
+# "IN :name" (without parentheses) marks a list parameter expanded at execution.
+_EXPANDING_PARAM = re.compile(r"\bIN\s+:(\w+)", re.IGNORECASE)
+
+
+class CompiledStatement(NamedTuple):
+    """One SQL statement with its pre-built TextClause and operation type."""
+
+    sql: str
+    clause: TextClause
+    operation: Optional[str]
+
+
+class CompiledQuery(NamedTuple):
+    """A catalogued operation: a single statement or a transaction (list)."""
+
+    statements: tuple
+    is_transaction: bool
+
+
+def get_operation_type(sql: str) -> Optional[str]:
+    """Return 'SELECT', 'INSERT', 'UPDATE', 'DELETE' or None for a SQL statement."""
+    sql_upper = sql.lstrip()[:6].upper()
+    if sql_upper.startswith("INSERT"):
+        return "INSERT"
+    if sql_upper.startswith("UPDATE"):
+        return "UPDATE"
+    if sql_upper.startswith("DELETE"):
+        return "DELETE"
+    if sql_upper.startswith("SELECT"):
+        return "SELECT"
+    return None
+
+
+def compile_statement(sql: str) -> CompiledStatement:
+    """Build a CompiledStatement from a raw SQL string.
+
+    Parameters written as "IN :name" are bound as expanding parameters, so they
+    take a list/tuple of values: {"name": ["a", "b"]}.
+    """
+    clause = text(sql)
+    expanding = dict.fromkeys(_EXPANDING_PARAM.findall(sql))
+    if expanding:
+        clause = clause.bindparams(*(bindparam(name, expanding=True) for name in expanding))
+    return CompiledStatement(sql, clause, get_operation_type(sql))
+
+
+class InvalidQueryError(ValueError):
+    """Raised when a catalogued operation has an invalid definition."""
+
+
+class _CatalogFile:  # pylint: disable=too-few-public-methods
+    """Parsed content of one model JSON file plus resolved queries per db_type."""
+
+    def __init__(self, path: str, content: dict, mtime: float):
+        self.path = path
+        self.content = content
+        self.mtime = mtime
+        self.resolved = {}
+
+
+class QueryCatalog:
+    """Process-wide cache of compiled model queries keyed by (file, key, db_type)."""
+
+    def __init__(self, model_dir: str = None):
+        self.model_dir = model_dir
+        self.reload_on_change = False
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def file_path(self, name: str, model_dir: str = None) -> str:
+        """Return the JSON file path for a model name."""
+        return os.path.join(model_dir or self.model_dir, f"{name}.json")
+
+    def get(self, name: str, key: str, db_type: str, model_dir: str = None) -> Optional[CompiledQuery]:
+        """Return the compiled query for name/key/db_type, or None if the key is undefined.
+
+        Raises:
+            OSError: model file cannot be read
+            json.JSONDecodeError: model file is not valid JSON
+            InvalidQueryError: the operation definition is not a string or list of strings
+        """
+        catalog_file = self._get_file(self.file_path(name, model_dir))
+        if not isinstance(catalog_file.content, dict):
+            raise InvalidQueryError(f"{catalog_file.path} must be a JSON object")
+        cache_key = (key, db_type)
+
+        try:
+            return catalog_file.resolved[cache_key]
+        except KeyError:
+            pass
+
+        query = self._resolve(catalog_file.content.get(key, {}), db_type, key)
+        catalog_file.resolved[cache_key] = query
+        return query
+
+    def preload(self, model_dir: str = None, db_types=()) -> list[str]:
+        """Load every JSON file in model_dir and pre-resolve all keys for db_types.
+
+        Returns a list of human readable problems found (empty when valid).
+        """
+        base_dir = model_dir or self.model_dir
+        problems = []
+
+        if not base_dir or not os.path.isdir(base_dir):
+            return problems
+
+        for filename in sorted(os.listdir(base_dir)):
+            if not filename.endswith(".json"):
+                continue
+
+            name = filename[:-5]
+            try:
+                catalog_file = self._get_file(self.file_path(name, base_dir))
+            except (OSError, json.JSONDecodeError) as e:
+                problems.append(f"{filename}: {e}")
+                continue
+
+            if not isinstance(catalog_file.content, dict):
+                problems.append(f"{filename}: must be a JSON object")
+                continue
+
+            for key in catalog_file.content:
+                for db_type in db_types:
+                    try:
+                        if self.get(name, key, db_type, base_dir) is None:
+                            problems.append(f"{filename}: '{key}' has no SQL for @{db_type}")
+                    except InvalidQueryError as e:
+                        problems.append(f"{filename}: {e}")
+
+        return problems
+
+    def clear(self) -> None:
+        """Forget all loaded files (tests, hot reload)."""
+        with self._lock:
+            self._files.clear()
+
+    def _get_file(self, path: str) -> _CatalogFile:
+        catalog_file = self._files.get(path)
+
+        if catalog_file is not None:
+            if not self.reload_on_change or os.stat(path).st_mtime == catalog_file.mtime:
+                return catalog_file
+
+        with self._lock:
+            current = self._files.get(path)
+            if current is not None and current is not catalog_file:
+                return current
+
+            mtime = os.stat(path).st_mtime
+            with open(path, "r", encoding="utf-8") as file:
+                content = json.load(file)
+
+            catalog_file = _CatalogFile(path, content, mtime)
+            self._files[path] = catalog_file
+            return catalog_file
+
+    @staticmethod
+    def _resolve(entry, db_type: str, key: str) -> Optional[CompiledQuery]:
+        if not isinstance(entry, dict):
+            raise InvalidQueryError(f"Invalid SQL content type for key '{key}'")
+
+        sql_content = entry.get(f"@{db_type}", entry.get(DEFAULT_TYPE, ""))
+        if isinstance(sql_content, str) and sql_content.startswith('@'):
+            sql_content = entry.get(sql_content, "")
+
+        if not sql_content:
+            return None
+
+        if isinstance(sql_content, str):
+            return CompiledQuery((compile_statement(sql_content),), False)
+
+        if isinstance(sql_content, list) and all(isinstance(sql, str) for sql in sql_content):
+            return CompiledQuery(tuple(compile_statement(sql) for sql in sql_content), True)
+
+        raise InvalidQueryError(f"Invalid SQL content type for key '{key}'")
+
+
+# Shared catalog for the process; Model.exec() resolves every query through it.
+query_catalog = QueryCatalog(Config.MODEL_DIR)
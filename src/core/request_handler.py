@@ -73,6 +73,13 @@ class RequestHandler:
         """
         return self.view.render()
 
+    async def render_route_async(self):
+        """Async variant of render_route() for async views (ASGI deployments).
+
+        The template render is awaited instead of blocking the worker.
+        """
+        return await self.view.render_async()
+
     def render_error(self, status: int = 404, message: str = "", param: str = ""):
         """Render error response.
 
@@ -0,0 +1,136 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Route rules of a component manifest, compiled once for per-request lookups.
+
+The manifest prefix maps (security "routes_auth" and "routes_role",
+"light_routes", "page_cache") have keys relative to the manifest route and
+the most specific prefix wins. RoutePolicy expands and normalizes the keys
+once into a trie of path segments, roles into normalized frozensets, so one
+walk of the request path resolves every map.
+
+Components compiles the policy of each blueprint at startup (bp.route_policy);
+route_policy() compiles it on first use for blueprints created elsewhere.
+"""
+
+from typing import Any
+
+# Position of each map's value in a trie node, and its manifest location
+_AUTH, _ROLES, _LIGHT, _PAGE_CACHE = range(4)
+_MAPS = (
+    (_AUTH, ("security", "routes_auth"), bool),
+    (_ROLES, ("security", "routes_role"), list),
+    (_LIGHT, ("light_routes",), bool),
+    (_PAGE_CACHE, ("page_cache",), int),
+)
+
+
+def normalize_route_path(route: str) -> str:
+    """Normalize route path for policy lookup.
+
+    Rules:
+    - Empty path -> /
+    - Ensure leading slash
+    - Remove trailing slash except root
+    """
+    path = (route or "").strip()
+
+    if not path:
+        return "/"
+
+    if not path.startswith("/"):
+        path = f"/{path}"
+
+    # Remove trailing slash except for root
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/")
+
+    return path or "/"
+
+
+def _segments(path: str) -> list[str]:
+    """Segments of a normalized path; "/" has none."""
+    return path[1:].split("/") if path != "/" else []
+
+
+def _normalize_roles(roles: list) -> frozenset:
+    return frozenset(str(role).strip().lower() for role in roles if str(role).strip())
+
+
+class RouteRules:  # pylint: disable=too-few-public-methods
+    """Most specific value of each manifest map for a route (None: not mapped)."""
+
+    __slots__ = ("require_auth", "roles", "light", "page_cache")
+
+    def __init__(self, values: list):
+        self.require_auth, self.roles, self.light, self.page_cache = values
+
+
+class _Node:  # pylint: disable=too-few-public-methods
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        self.children = {}
+        self.values = None
+
+
+class RoutePolicy:
+    """Prefix trie over the route maps of one manifest."""
+
+    def __init__(self, manifest: dict):
+        self._root = _Node()
+        component_route = manifest.get("route", "") if isinstance(manifest, dict) else ""
+
+        for index, keys, expected_type in _MAPS:
+            policy_map = manifest
+            for key in keys:
+                policy_map = policy_map.get(key) if isinstance(policy_map, dict) else None
+            if not isinstance(policy_map, dict):
+                continue
+
+            for prefix, value in policy_map.items():
+                if not isinstance(value, expected_type):
+                    continue
+                # e.g., prefix="/users" + component_route="/admin" → "/admin/users"
+                if component_route and prefix.startswith("/"):
+                    prefix = component_route + prefix
+                if expected_type is list:
+                    value = _normalize_roles(value)
+                self._insert(normalize_route_path(prefix), index, value)
+
+    def _insert(self, path: str, index: int, value: Any) -> None:
+        node = self._root
+        for segment in _segments(path):
+            node = node.children.setdefault(segment, _Node())
+        if node.values is None:
+            node.values = [None] * len(_MAPS)
+        # Keys normalizing to the same prefix: the first one wins
+        if node.values[index] is None:
+            node.values[index] = value
+
+    def lookup(self, route_path: str) -> RouteRules:
+        """Resolve every map for a normalized route path (longest prefix wins)."""
+        node = self._root
+        found = list(node.values) if node.values is not None else [None] * len(_MAPS)
+        for segment in _segments(route_path):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.values is not None:
+                for index, value in enumerate(node.values):
+                    if value is not None:
+                        found[index] = value
+        return RouteRules(found)
+
+
+def route_policy(component_bp) -> RoutePolicy | None:
+    """Compiled RoutePolicy of a blueprint, None if it has no manifest."""
+    policy = getattr(component_bp, "route_policy", None)
+    if policy is not None:
+        return policy
+
+    manifest = getattr(component_bp, "manifest", None)
+    if not isinstance(manifest, dict):
+        return None
+    policy = RoutePolicy(manifest)
+    component_bp.route_policy = policy
+    return policy
@@ -3,7 +3,6 @@
 import os
 from functools import lru_cache
 
-import orjson
 import woothee
 from flask import current_app
 
@@ -11,6 +10,7 @@ from app.config import Config
 from constants import TMP_DIR, RBAC_DEFAULT_ROLES
 from utils.utils import get_ip, merge_dict
 from utils.network import normalize_host, is_allowed_host
+from utils.cow import CowDict
 from .session_dev import SessionDev
 
 
@@ -23,8 +23,9 @@ def _parse_ua_cached(ua_string: str) -> dict:
 class Schema:
     """Schema"""
 
-    def __init__(self, req):
+    def __init__(self, req, component_uuid=None):
         self.req = req
+        self.component_uuid = component_uuid
         self.context = {}
         self.headers = req.headers
         self.properties = {}
@@ -39,7 +40,12 @@ class Schema:
         self.set_theme()
 
     def _default(self) -> None:
-        self.properties = orjson.loads(current_app.schema_json)  # pylint: disable=no-member
+        # Copy-on-write over the shared base, or the component's snapshot of it
+        # (base + route/schema.json): only branches a request touches are copied
+        base = current_app.schema_snapshots.get(  # pylint: disable=no-member
+            self.component_uuid, current_app.schema_base  # pylint: disable=no-member
+        )
+        self.properties = CowDict(base)
         self.data = self.properties['data']
         self.local_data = self.properties['inherit']['data']
         self.properties['config']['cache_disable'] = Config.NEUTRAL_CACHE_DISABLE
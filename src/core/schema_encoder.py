@@ -0,0 +1,87 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Incremental msgpack encoding of the request schema.
+
+Most of a request schema is the merged component schema built once at startup
+(app.schema_json); a request only changes a few branches (CONTEXT, USER,
+current site/theme, locale...). SchemaEncoder pre-encodes the base schema once,
+keeping the encoded bytes of every branch down to a fixed depth, and per render
+encodes only the branches that differ from the base. The output is one plain
+msgpack map, identical in content to msgpack.packb(properties).
+
+A branch is reused when it is the base object itself (shared, not copied, as
+in a CowDict request schema) or equal to it; otherwise it is encoded,
+recursing into dicts down to the depth.
+"""
+
+import struct
+
+import msgpack
+
+
+def _pack(value) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _map_header(length: int) -> bytes:
+    if length < 16:
+        return bytes((0x80 | length,))
+    if length < 0x10000:
+        return b'\xde' + struct.pack('>H', length)
+    return b'\xdf' + struct.pack('>I', length)
+
+
+class _Node:  # pylint: disable=too-few-public-methods
+    """Pre-encoded base branch: value, its msgpack bytes and encoded children."""
+
+    __slots__ = ('value', 'encoded', 'children')
+
+    def __init__(self, value, depth: int):
+        self.value = value
+        self.encoded = _pack(value)
+        self.children = None
+        if depth > 0 and isinstance(value, dict):
+            self.children = {
+                key: (_pack(key), _Node(child, depth - 1)) for key, child in value.items()
+            }
+
+
+class SchemaEncoder:
+    """msgpack encoder that reuses the pre-encoded bytes of an immutable base schema."""
+
+    def __init__(self, base: dict, depth: int = 3):
+        self.base = base
+        self.depth = depth
+        self._root = _Node(base, depth)
+
+    @property
+    def base_size(self) -> int:
+        """Size in bytes of the encoded base schema."""
+        return len(self._root.encoded)
+
+    def encode(self, properties: dict) -> bytes:
+        """Return msgpack bytes for properties, encoding only what differs from the base."""
+        parts = []
+        self._encode(properties, self._root, parts)
+        return b''.join(parts)
+
+    def _encode(self, value, node: _Node, parts: list) -> None:
+        if value is node.value:
+            parts.append(node.encoded)
+            return
+
+        if node.children is not None and isinstance(value, dict):
+            parts.append(_map_header(len(value)))
+            children = node.children
+            # dict.items: read the mapping as stored, without copy-on-write copies
+            for key, child_value in dict.items(value):
+                child = children.get(key)
+                if child is None:
+                    parts.append(_pack(key))
+                    parts.append(_pack(child_value))
+                else:
+                    parts.append(child[0])
+                    self._encode(child_value, child[1], parts)
+            return
+
+        parts.append(node.encoded if value == node.value else _pack(value))
@@ -0,0 +1,120 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Versioned schema state.
+
+Each schema scope (a group of setup-* operations, e.g. "user" or "rbac") records
+the version it was last migrated to in the schema_state table of its database.
+ensure_schema() runs a scope's operations only when the stored version is older
+than the one the code expects, then remembers the scope as ready in-process, so
+request-time objects (User, Session, ...) only check an in-memory flag instead
+of issuing DDL.
+
+In-memory SQLite databases live in the connection, one per thread and engine
+(SingletonThreadPool), so their flags are kept per thread and tied to the
+engine they were set on: a new thread or a new engine starts unmarked.
+"""
+
+import threading
+import time
+
+from .engine import get_engine
+
+_ready: set[tuple[str, str]] = set()
+_ready_lock = threading.Lock()
+_memory_ready = threading.local()
+
+
+def _is_memory_sqlite(db_url: str) -> bool:
+    return str(db_url).startswith("sqlite") and ":memory:" in str(db_url)
+
+
+def run_operation(model, model_name: str, operation: str, data=None) -> None:
+    """Execute a model operation, raising RuntimeError if it fails."""
+    model.exec(model_name, operation, data)
+    if model.has_error:
+        detail = model.last_error or model.user_error or "Unknown database error"
+        raise RuntimeError(f"{model_name}.{operation} failed: {detail}")
+
+
+def _memory_engines() -> dict:
+    """Engines on which this thread marked in-memory scopes ready, by (db_url, scope)."""
+    engines = getattr(_memory_ready, "engines", None)
+    if engines is None:
+        engines = _memory_ready.engines = {}
+    return engines
+
+
+def is_schema_ready(db_url: str, scope: str) -> bool:
+    """Return True if scope is known to be current for db_url in this process."""
+    key = (str(db_url), scope)
+    if key in _ready:
+        return True
+    if _is_memory_sqlite(db_url):
+        engine = _memory_engines().get(key)
+        return engine is not None and engine is get_engine(key[0], "sqlite")
+    return False
+
+
+def mark_schema_ready(db_url: str, scope: str) -> None:
+    """Remember scope as current for db_url.
+
+    In-memory SQLite databases are marked for this thread and engine only.
+    """
+    key = (str(db_url), scope)
+    if _is_memory_sqlite(db_url):
+        _memory_engines()[key] = get_engine(key[0], "sqlite")
+    else:
+        _ready.add(key)
+
+
+def reset_schema_ready() -> None:
+    """Forget every ready flag (tests)."""
+    global _memory_ready  # pylint: disable=global-statement
+    with _ready_lock:
+        _ready.clear()
+        _memory_ready = threading.local()
+
+
+def get_schema_version(model, scope: str) -> int:
+    """Return the recorded version of scope, 0 if it was never migrated."""
+    run_operation(model, "app", "setup-schema-state")
+    result = model.exec("app", "get-schema-version", {"scope": scope})
+    if model.has_error:
+        detail = model.last_error or model.user_error or "Unknown database error"
+        raise RuntimeError(f"app.get-schema-version failed: {detail}")
+    rows = result.get("rows") or []
+    return int(rows[0][0]) if rows else 0
+
+
+def ensure_schema(model, db_url: str, scope: str, version: int, steps) -> bool:
+    """Bring scope up to version by running steps once.
+
+    steps is a sequence of (model_name, operation) tuples or callables that
+    receive the model. Returns True if the steps were run, False if the scope
+    was already current.
+    """
+    if is_schema_ready(db_url, scope):
+        return False
+
+    with _ready_lock:
+        if is_schema_ready(db_url, scope):
+            return False
+
+        migrated = False
+        if get_schema_version(model, scope) < version:
+            for step in steps:
+                if callable(step):
+                    step(model)
+                else:
+                    run_operation(model, *step)
+
+            run_operation(
+                model,
+                "app",
+                "set-schema-version",
+                {"scope": scope, "version": version, "modified": int(time.time())},
+            )
+            migrated = True
+
+        mark_schema_ready(db_url, scope)
+        return migrated
@@ -7,6 +7,7 @@ import time
 from app.config import Config
 from constants import SECONDS_MINUTE
 from .model import Model
+from .session_touch import session_touch_queue
 
 
 class Session:
@@ -15,37 +16,27 @@ class Session:
     def __init__(self, session_id, db_url=Config.DB_SAFE, db_type=Config.DB_SAFE_TYPE):
         """session"""
         self.model = Model(db_url, db_type)
+        self._db_url = db_url
+        self._db_type = db_type
         self._session_id = session_id
         self.now = int(time.time())
+        self._loaded = False
+        self._row = None
+        self._properties = None
+        self._cookie = None
 
-    def get(self) -> tuple[str | None, dict]:
-        """get session"""
-        if not self._session_id:
-            return None, {}
-
-        result = self.model.exec('session', 'get', {
-            "sessionId": self._session_id,
-            "open": Config.SESSION_OPEN['true'],
-            "now": self.now
-        })
-
-        if not result or not result.get('rows') or not result['rows'][0]:
-            return None, {}
-
-        modified = result['rows'][0][4]
-        expire = result['rows'][0][5]
-
-        # Update session if modified more than 15 minutes ago
-        if (self.now - modified) > (SECONDS_MINUTE * 15):
-            session_cookie = self.update(self._session_id)
-            return self._session_id, session_cookie
+    def load(self) -> dict | None:
+        """Fetch the open session row once per instance and memoize it.
 
-        return self._session_id, self.create_session_cookie(self._session_id, max(0, expire - self.now))
+        Returns a dict with sessionId, userId, ua, properties, modified and expire,
+        or None if there is no open, unexpired session.
+        """
+        if self._loaded:
+            return self._row
 
-    def get_session_properties(self) -> dict:
-        """Return stored session properties for current session, if any."""
+        self._loaded = True
         if not self._session_id:
-            return {}
+            return None
 
         result = self.model.exec('session', 'get', {
             "sessionId": self._session_id,
@@ -54,35 +45,97 @@ class Session:
         })
 
         if not result or not result.get('rows') or not result['rows'][0]:
-            return {}
+            return None
+
+        row = result['rows'][0]
+        self._row = {
+            "sessionId": row[0],
+            "userId": row[1],
+            "ua": row[2],
+            "properties": row[3],
+            "modified": row[4],
+            "expire": row[5],
+        }
+        return self._row
+
+    @property
+    def expire(self) -> int | None:
+        """Expiry timestamp of the loaded session, None if there is no session."""
+        row = self.load()
+        return row["expire"] if row else None
+
+    @property
+    def properties(self) -> dict:
+        """Stored session properties of the loaded session (parsed once)."""
+        if self._properties is not None:
+            return self._properties
+
+        row = self.load()
+        raw = row["properties"] if row else None
+        props = {}
+        if raw:
+            try:
+                props = json.loads(raw)
+            except (TypeError, ValueError, json.JSONDecodeError):
+                props = {}
+
+        self._properties = props if isinstance(props, dict) else {}
+        return self._properties
+
+    @property
+    def cookie(self) -> dict:
+        """Session cookie for the response, refreshing the sliding expiry at most once."""
+        if self._cookie is not None:
+            return self._cookie
+
+        row = self.load()
+        if row is None:
+            self._cookie = {}
+        elif (self.now - row["modified"]) > (SECONDS_MINUTE * 15):
+            # Update session if modified more than 15 minutes ago, written behind
+            # by the touch queue when possible.
+            expire = self.now + Config.SESSION_IDLE_EXPIRES_SECONDS
+            if session_touch_queue.touch(
+                self._db_url, self._db_type, self._session_id, self.now, expire
+            ):
+                self._cookie = self.create_session_cookie(
+                    self._session_id, Config.SESSION_IDLE_EXPIRES_SECONDS
+                )
+            else:
+                self._cookie = self.update(self._session_id)
+            if not self.model.has_error:
+                row["modified"] = self.now
+                row["expire"] = expire
+        else:
+            self._cookie = self.create_session_cookie(
+                self._session_id, max(0, row["expire"] - self.now)
+            )
+
+        return self._cookie
 
-        raw = result['rows'][0][3]
-        if not raw:
-            return {}
+    def get(self) -> tuple[str | None, dict]:
+        """get session"""
+        if self.load() is None:
+            return None, {}
 
-        try:
-            props = json.loads(raw)
-        except (TypeError, ValueError, json.JSONDecodeError):
-            return {}
+        return self._session_id, self.cookie
 
-        return props if isinstance(props, dict) else {}
+    def get_session_properties(self) -> dict:
+        """Return stored session properties for current session, if any."""
+        return self.properties
 
     def close(self) -> dict:
         """close session"""
-        if self._session_id:
-            result = self.model.exec('session', 'get', {
+        if self.load() is not None:
+            self.model.exec('session', 'close', {
                 "sessionId": self._session_id,
-                "open": Config.SESSION_OPEN['true'],
+                "open": Config.SESSION_OPEN['false'],
+                "modified": self.now,
                 "now": self.now
             })
-
-            if result and result.get('success'):
-                self.model.exec('session', 'close', {
-                    "sessionId": self._session_id,
-                    "open": Config.SESSION_OPEN['false'],
-                    "modified": self.now,
-                    "now": self.now
-                })
+            self._row = None
+            self._properties = None
+            self._cookie = None
 
         return self.delete_session_cookie()
 
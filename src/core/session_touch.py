@@ -0,0 +1,129 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Write-behind queue for session sliding-expiry updates ("touches").
+
+Session.cookie used to run a session/update on the request thread whenever a
+session was older than 15 minutes. Touches are now buffered in-process and
+flushed by a background thread as one executemany transaction per database, so
+request latency no longer includes the expiry bump and concurrent users do not
+queue single-row UPDATEs on the SQLite write lock.
+
+- Touches for the same session are coalesced (the latest one wins).
+- The buffer is bounded; touch() returns False when it is full (or the queue is
+  disabled) and the caller falls back to a synchronous update.
+- The buffer is drained at interpreter exit; a forked child starts empty.
+"""
+
+import atexit
+import logging
+import os
+import threading
+
+from app.config import Config
+from .model import Model
+
+logger = logging.getLogger(__name__)
+
+
+def _is_memory_sqlite(db_url: str) -> bool:
+    return str(db_url).startswith("sqlite") and ":memory:" in str(db_url)
+
+
+class SessionTouchQueue:
+    """Bounded buffer of pending session updates flushed by a daemon thread."""
+
+    def __init__(self, flush_interval: float, batch_size: int, max_size: int):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_size = max_size
+        self._pending = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def touch(self, db_url: str, db_type: str, session_id: str, modified: int, expire: int) -> bool:
+        """Queue a sliding-expiry update. Return False if it was not queued."""
+        # In-memory SQLite lives per connection, the flush thread would not see it.
+        if self.max_size <= 0 or self._stopping or _is_memory_sqlite(db_url):
+            return False
+
+        with self._lock:
+            rows = self._pending.setdefault((str(db_url), db_type), {})
+            if session_id not in rows:
+                if self._size >= self.max_size:
+                    return False
+                self._size += 1
+            rows[session_id] = {"sessionId": session_id, "modified": modified, "expire": expire}
+            self._ensure_thread()
+            full = self._size >= self.batch_size
+
+        if full:
+            self._wakeup.set()
+        return True
+
+    def pending(self) -> int:
+        """Number of sessions waiting to be flushed."""
+        return self._size
+
+    def flush(self) -> int:
+        """Write all pending touches now. Returns the number of sessions flushed."""
+        with self._lock:
+            pending, self._pending, self._size = self._pending, {}, 0
+
+        flushed = 0
+        for (db_url, db_type), rows in pending.items():
+            model = Model(db_url, db_type)
+            model.exec_many('session', 'update', list(rows.values()))
+            if model.has_error:
+                logger.warning("Session touch flush failed for %s: %s", db_type, model.last_error)
+                continue
+            flushed += len(rows)
+
+        return flushed
+
+    def stop(self) -> None:
+        """Stop the flush thread and drain the buffer (shutdown)."""
+        self._stopping = True
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=max(1.0, self.flush_interval * 2))
+        self.flush()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="session-touch-flush", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning("Session touch flush error: %s", e)
+
+    def _reset_after_fork(self) -> None:
+        """Fork hook: the parent's thread and lock do not survive; start empty."""
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending = {}
+        self._size = 0
+        self._thread = None
+
+
+session_touch_queue = SessionTouchQueue(
+    Config.SESSION_TOUCH_FLUSH_INTERVAL,
+    Config.SESSION_TOUCH_BATCH_SIZE,
+    Config.SESSION_TOUCH_QUEUE_SIZE,
+)
+
+atexit.register(session_touch_queue.stop)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=session_touch_queue._reset_after_fork)  # pylint: disable=protected-access
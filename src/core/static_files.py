@@ -0,0 +1,105 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Static file responses for component and public assets.
+
+send_static() is a drop-in for flask.send_from_directory() that serves the
+precompressed sibling (.br/.zst/.gz, see core.compression) the client
+accepts, with the Content-Type of the original file. Each representation is
+a file of its own with a strong ETag from its content hash, so ETags agree
+between workers and servers whatever the file mtimes. Revalidations are
+answered with 304 before the file is opened; send_file() handles Range.
+
+The hashes are computed at startup with STATIC_ETAG_PRECOMPUTE, otherwise on
+first use, and recomputed when a file's mtime or size changes.
+"""
+
+import hashlib
+import mimetypes
+import os
+import stat as stat_module
+
+from flask import Response, current_app, request, send_file
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+from .compression import compression
+from .conditional import not_modified
+
+
+class StaticEtags:
+    """Content-hash ETags of static files by path, revalidated by mtime and size."""
+
+    def __init__(self):
+        self._etags = {}
+
+    def get(self, path: str, stat: os.stat_result) -> str:
+        """ETag of path, hashing it only when new or changed."""
+        entry = self._etags.get(path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 16), b""):
+                digest.update(chunk)
+        etag = digest.hexdigest()[:32]
+        self._etags[path] = (stat.st_mtime_ns, stat.st_size, etag)
+        return etag
+
+    def precompute(self, directory: str) -> int:
+        """Hash every file under directory; returns the number of files hashed."""
+        hashed = 0
+        for root, _dirs, files in os.walk(directory):
+            for name in files:
+                path = os.path.abspath(os.path.join(root, name))
+                try:
+                    self.get(path, os.stat(path))
+                except OSError:
+                    continue
+                hashed += 1
+        return hashed
+
+
+static_etags = StaticEtags()
+
+
+def send_static(directory: str, filename: str) -> Response:
+    """Send directory/filename, precompressed when possible; 404 if missing."""
+    path = safe_join(os.fspath(directory), filename)
+    if path is None:
+        raise NotFound()
+    if not os.path.isabs(path):
+        path = os.path.join(current_app.root_path, path)
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except OSError as exc:
+        raise NotFound() from exc
+    if not stat_module.S_ISREG(stat.st_mode):
+        raise NotFound()
+
+    compressible = bool(compression.encodings) and compression.is_compressible(path)
+    served, encoding = path, None
+    if compressible:
+        variant = compression.precompressed(path, request.accept_encodings)
+        if variant is not None:
+            try:
+                stat = os.stat(variant[0])
+                served, encoding = variant
+            except OSError:
+                pass
+
+    etag = static_etags.get(served, stat)
+    response = not_modified(etag, stat.st_mtime)
+    if response is None:
+        response = send_file(
+            served,
+            mimetype=mimetypes.guess_type(path)[0],
+            etag=etag,
+            last_modified=stat.st_mtime,
+        )
+        if encoding is not None:
+            response.headers["Content-Encoding"] = encoding
+    if compressible:
+        response.vary.add("Accept-Encoding")
+    return response
@@ -2,16 +2,16 @@
 
 """template and response"""
 
-import json
-import re
+import asyncio
 
+import msgpack
 from flask import Response, current_app, make_response
 
 from app.config import Config
+from utils.html_minify import minify_html
 
 if Config.NEUTRAL_IPC:
-    import msgpack
-    from neutral_ipc_template import NeutralIpcTemplate, NeutralIpcRecord
+    from neutral_ipc_template import AsyncNeutralIpcTemplate, NeutralIpcTemplate, NeutralIpcRecord
 else:
     from neutraltemplate import NeutralTemplate
 
@@ -33,23 +33,76 @@ class Template:
 
     def render(self, tpl=None, headers=None) -> Response:
         """render template and return response"""
-        tpl = tpl or self.data['TEMPLATE_LAYOUT']
+        template = self._create_template(tpl or self.data['TEMPLATE_LAYOUT'])
+        error = self._finish_render(template, template.render(), headers)
+        if error:
+            return self.render_error(*error)
+        return self.response
+
+    async def render_async(self, tpl=None, headers=None) -> Response:
+        """render template without blocking the event loop (async views)
+
+        Under NEUTRAL_IPC the render is awaited on the asyncio IPC client, so
+        many renders overlap on one loop; the in-process engine runs in a
+        worker thread.
+        """
+        template = self._create_template(tpl or self.data['TEMPLATE_LAYOUT'], asynchronous=True)
+        error = self._finish_render(template, await self._render_async(template), headers)
+        if error:
+            return await self.render_error_async(*error)
+        return self.response
+
+    def render_error(
+        self, status_code=404, status_text="Not Found", status_param=""
+    ) -> Response:
+        """render template ERROR and return response"""
+        self._prepare_error(status_code, status_text, status_param)
+        template = self._create_template(self.data['TEMPLATE_ERROR'])
+        return self._finish_error(status_code, template.render())
 
+    async def render_error_async(
+        self, status_code=404, status_text="Not Found", status_param=""
+    ) -> Response:
+        """render template ERROR without blocking the event loop"""
+        self._prepare_error(status_code, status_text, status_param)
+        template = self._create_template(self.data['TEMPLATE_ERROR'], asynchronous=True)
+        return self._finish_error(status_code, await self._render_async(template))
+
+    def _create_template(self, tpl, asynchronous=False):
+        """Template for tpl; every entry point (pages and errors) shares this path.
+
+        The schema is encoded once per render with msgpack, never through
+        JSON. The app's SchemaEncoder reuses the pre-encoded static schema and
+        encodes only the branches this request changed.
+        """
+        schema_msgpack = self._encode_schema()
         if Config.NEUTRAL_IPC:
-            schema_msgpack = msgpack.packb(self.schema.properties, use_bin_type=True)
-            template = NeutralIpcTemplate(tpl, schema_msgpack, schema_type=NeutralIpcRecord.CONTENT_MSGPACK)
-        else:
-            template = NeutralTemplate(tpl, schema_obj=self.schema.properties)
+            template_class = AsyncNeutralIpcTemplate if asynchronous else NeutralIpcTemplate
+            return template_class(tpl, schema_msgpack, schema_type=NeutralIpcRecord.CONTENT_MSGPACK)
+        return NeutralTemplate(tpl, schema_msgpack=schema_msgpack)
+
+    def _encode_schema(self) -> bytes:
+        encoder = getattr(current_app, "schema_encoder", None)
+        if encoder is None:
+            return msgpack.packb(self.schema.properties, use_bin_type=True)
+        return encoder.encode(self.schema.properties)
+
+    @staticmethod
+    async def _render_async(template) -> str:
+        if Config.NEUTRAL_IPC:
+            return await template.render()
+        return await asyncio.to_thread(template.render)
+
+    def _finish_render(self, template, contents, headers=None):
+        """Build self.response from a rendered template.
 
-        self.contents = template.render().lstrip('\n\r\t ')
+        Returns (status_code, status_text, status_param) when the template
+        asked for an HTTP error page, otherwise None.
+        """
+        self.contents = contents.lstrip('\n\r\t ')
 
         if Config.TEMPLATE_HTML_MINIFY:
-            self.contents = re.sub(
-                r"^\s+<(?!pre\b|code\b|samp\b|kbd\b|var\b|textarea\b|xmp\b|script\b|style\b|template\b)([^>]+>)",
-                r"<\1",
-                self.contents,
-                flags=re.MULTILINE
-            )
+            self.contents = minify_html(self.contents)
 
         status_code = int(template.get_status_code())
         status_text = template.get_status_text()
@@ -62,11 +115,11 @@ class Template:
             self._set_cookies()
             self.response.headers["Location"] = status_param
             self.response.status_code = status_code
-            return self.response
+            return None
 
         # The template may generate HTTP errors.
         if status_code >= 400:
-            return self.render_error(status_code, status_text, status_param)
+            return status_code, status_text, status_param
 
         if headers:
             for key, value in headers.items():
@@ -75,12 +128,9 @@ class Template:
         self.response.status_code = status_code
         self.response.set_data(self.contents)
         self._set_cookies()
-        return self.response
+        return None
 
-    def render_error(
-        self, status_code=404, status_text="Not Found", status_param=""
-    ) -> Response:
-        """render template ERROR and return response"""
+    def _prepare_error(self, status_code, status_text, status_param) -> None:
         self.data["CURRENT_COMP_ROUTE"] = "HTTP_ERROR"
         self.data["HTTP_ERROR"] = {
             "code": status_code,
@@ -88,21 +138,10 @@ class Template:
             "param": status_param,
         }
 
-        if Config.NEUTRAL_IPC:
-            template = NeutralIpcTemplate(self.data['TEMPLATE_ERROR'], json.dumps(self.schema.properties))
-        else:
-            template = NeutralTemplate(self.data['TEMPLATE_ERROR'], schema_obj=self.schema.properties)
-
-        self.contents = template.render()
-
-        self.contents = self.contents.lstrip('\n\r\t ')
+    def _finish_error(self, status_code, contents) -> Response:
+        self.contents = contents.lstrip('\n\r\t ')
         if Config.TEMPLATE_HTML_MINIFY:
-            self.contents = re.sub(
-                r"^\s+<(?!pre\b|code\b|samp\b|kbd\b|var\b|textarea\b|xmp\b|script\b|style\b|template\b)([^>]+>)",
-                r"<\1",
-                self.contents,
-                flags=re.MULTILINE
-            )
+            self.contents = minify_html(self.contents)
 
         self.response.status_code = status_code
         self.response.set_data(self.contents)
@@ -15,9 +15,12 @@ from constants import (
     PIN_TARGET_REMINDER,
     RBAC_DEFAULT_ROLES,
 )
+from utils.cursor import decode_cursor, encode_cursor
 from utils.sbase64url import sbase64url_sha256, sbase64url_token
 from app.config import Config
 from .model import Model
+from .schema_state import ensure_schema, is_schema_ready
+from .user_cache import runtime_user_cache
 # import pprint
 
 USERNAME_REGEX = regex.compile(r"^[a-z0-9](?:[a-z0-9-]*[a-z0-9])?$")
@@ -35,6 +38,10 @@ RESERVED_USERNAMES = (
     "whatsapp",
 )
 
+# RBAC tables are migrated by app.bootstrap_db; User only checks the ready flag.
+RBAC_SCHEMA_VERSION = 1
+RBAC_SCHEMA_STEPS = (("user", "setup-rbac"),)
+
 
 class User:  # pylint: disable=too-many-public-methods
     """User creation and authentication handler.
@@ -45,13 +52,17 @@ class User:  # pylint: disable=too-many-public-methods
     The high method count reflects the comprehensive nature of user management.
     """
 
+    # Max ids per "IN (...)" query in batched admin listings
+    IN_BATCH_SIZE = 500
+
     def __init__(self, db_url=Config.DB_PWA, db_type=Config.DB_PWA_TYPE):
         """Initialize the User class with a database connection."""
         self._db_url = db_url
         self._db_type = db_type
         self.model = Model(db_url, db_type)
         self.now = int(time.time())
-        self._setup_rbac()
+        if not is_schema_ready(db_url, "rbac"):
+            self._setup_rbac()
 
     def _is_memory_sqlite(self) -> bool:
         return self._db_type == "sqlite" and ":memory:" in str(self._db_url)
@@ -148,8 +159,15 @@ class User:  # pylint: disable=too-many-public-methods
         return user_data
 
     def _setup_rbac(self) -> None:
-        """Create RBAC tables but do not insert roles (now managed via constants)."""
-        self.model.exec("user", "setup-rbac")
+        """Migrate RBAC tables once per process if bootstrap has not done it yet.
+
+        Roles are not inserted (managed via constants). On failure the error stays
+        in self.model and the check is retried by the next User instance.
+        """
+        try:
+            ensure_schema(self.model, self._db_url, "rbac", RBAC_SCHEMA_VERSION, RBAC_SCHEMA_STEPS)
+        except RuntimeError:
+            pass
 
     def _build_user_params(self, user_id, login, data):
         return {
@@ -560,9 +578,7 @@ class User:  # pylint: disable=too-many-public-methods
                         "now": self.now
                     })
                     if result_pin and result_pin['rows'] and result_pin['rows'][0] and result_pin['rows'][0][0]:
-                        self.model.exec('user', 'delete-disabled', {
-                            "reason": unconfirmed, "userId": user_data_list[0]['userId']
-                        })
+                        self.delete_user_disabled(user_data_list[0]['userId'], unconfirmed)
                         self.model.exec(
                             'user',
                             'delete-pin',
@@ -582,6 +598,10 @@ class User:  # pylint: disable=too-many-public-methods
         if not user_id:
             return self._default_runtime_user()
 
+        cached = runtime_user_cache.get(user_id)
+        if cached is not None:
+            return cached
+
         result = self.model.exec("user", "get-by-userid", {"userId": user_id})
         if self.model.has_error or not result or not result.get("rows"):
             self.model.clear_error()
@@ -589,7 +609,27 @@ class User:  # pylint: disable=too-many-public-methods
 
         columns = list(dict.fromkeys(result["columns"]))
         user_rows = [dict(zip(columns, row)) for row in result["rows"]]
-        return self._build_runtime_user_data(user_rows)
+        user_data = self._build_runtime_user_data(user_rows)
+        if user_data["auth"]:
+            runtime_user_cache.set(user_id, user_data)
+        return user_data
+
+    def invalidate_runtime_user(self, user_id) -> None:
+        """Drop the cached runtime user after a change to its user data."""
+        runtime_user_cache.invalidate(str(user_id or "").strip())
+
+    def invalidate_runtime_user_by_profile(self, profile_id) -> None:
+        """Drop the cached runtime user owning profile_id.
+
+        Uses its own Model so the error state of the caller's write is kept.
+        """
+        if not profile_id or runtime_user_cache.backend is None:
+            return
+        model = Model(self._db_url, self._db_type)
+        result = model.exec("user", "get-profile-by-profileid", {"profileId": profile_id})
+        if model.has_error or not result or not result.get("rows"):
+            return
+        self.invalidate_runtime_user(result["rows"][0][1])
 
     def get_user(self, login):
         """Retrieve user data based on login."""
@@ -929,6 +969,7 @@ class User:  # pylint: disable=too-many-public-methods
             "assign-role-by-code",
             {"profileId": profile_id, "code": code, "created": self.now},
         )
+        self.invalidate_runtime_user_by_profile(profile_id)
         if self.model.has_error:
             return False
         if result and result.get("rowcount", 0) > 0:
@@ -971,6 +1012,7 @@ class User:  # pylint: disable=too-many-public-methods
             "remove-role-by-code",
             {"profileId": profile_id, "code": code},
         )
+        self.invalidate_runtime_user_by_profile(profile_id)
         if self.model.has_error:
             return False
         if result and result.get("rowcount", 0) > 0:
@@ -1007,6 +1049,33 @@ class User:  # pylint: disable=too-many-public-methods
             res.append(d)
         return res
 
+    def _exec_grouped(
+        self,
+        operation: str,
+        param: str,
+        ids,
+        key_column: str,
+        keep_key: bool = False,
+    ) -> dict[str, list[dict]]:
+        """Run an "IN :param" user query for ids and group row dicts by key_column.
+
+        Ids are sent in chunks of IN_BATCH_SIZE. A failing chunk leaves its ids
+        without rows, like the per-id queries it replaces.
+        """
+        grouped = {}
+        unique_ids = list(dict.fromkeys(str(value) for value in ids if value))
+        for start in range(0, len(unique_ids), self.IN_BATCH_SIZE):
+            result = self.model.exec(
+                "user", operation, {param: unique_ids[start:start + self.IN_BATCH_SIZE]}
+            )
+            if self.model.has_error:
+                self.model.clear_error()
+                continue
+            for row in self._rows_to_dicts(result):
+                key = str(row[key_column] if keep_key else row.pop(key_column))
+                grouped.setdefault(key, []).append(row)
+        return grouped
+
     @staticmethod
     def _format_unix_timestamp(value) -> str:
         """Format unix timestamp to UTC datetime string for template display."""
@@ -1026,8 +1095,13 @@ class User:  # pylint: disable=too-many-public-methods
         disabled_reason="",
         limit=100,
         offset=0,
+        cursor="",
     ) -> list[dict]:
-        """List users for admin views with roles and disabled flags."""
+        """List users for admin views with roles and disabled flags.
+
+        A cursor from admin_users_cursor() selects keyset pagination for the
+        "created" and "modified" orders; otherwise limit/offset is used.
+        """
         operation_map = {
             "created": "admin-list-by-created",
             "modified": "admin-list-by-modified",
@@ -1037,7 +1111,12 @@ class User:  # pylint: disable=too-many-public-methods
             # Backward compatibility with previous single disabled ordering key
             "disabled_date": "admin-list-by-disabled-modified-date",
         }
-        operation = operation_map.get(order_by, "admin-list-by-created")
+        keyset_operation_map = {
+            "created": "admin-list-by-created-after",
+            "modified": "admin-list-by-modified-after",
+        }
+        order_by = order_by if order_by in operation_map else "created"
+        operation = operation_map[order_by]
 
         normalized_disabled_reason = ""
         if str(disabled_reason).strip():
@@ -1046,17 +1125,19 @@ class User:  # pylint: disable=too-many-public-methods
             except (TypeError, ValueError):
                 normalized_disabled_reason = ""
 
-        result = self.model.exec(
-            "user",
-            operation,
-            {
-                "search": (search or "").strip(),
-                "code": self._normalize_role_code(code),
-                "disabled_reason": normalized_disabled_reason,
-                "limit": int(limit),
-                "offset": int(offset),
-            },
-        )
+        params = {
+            "search": (search or "").strip(),
+            "code": self._normalize_role_code(code),
+            "disabled_reason": normalized_disabled_reason,
+            "limit": int(limit),
+            "offset": int(offset),
+        }
+        position = decode_cursor(cursor, f"users:{order_by}") if order_by in keyset_operation_map else None
+        if position:
+            operation = keyset_operation_map[order_by]
+            params["cursor_value"], params["cursor_id"] = position
+
+        result = self.model.exec("user", operation, params)
         if self.model.has_error:
             return []
 
@@ -1071,29 +1152,40 @@ class User:  # pylint: disable=too-many-public-methods
         users = self._rows_to_dicts(result)
         for user_row in users:
             decode_dict(user_row)
+
+        # Profiles, roles and disabled flags for the whole page, one IN query each
+        user_ids = [user_row.get("userId") for user_row in users]
+        profiles_by_user = self._exec_grouped(
+            "admin-get-profiles-by-userids", "userIds", user_ids, "userId", keep_key=True
+        )
+        roles_by_user = self._exec_grouped("get-roles-by-userids", "userIds", user_ids, "userId")
+        disabled_by_user = self._exec_grouped(
+            "admin-get-disabled-by-userids", "userIds", user_ids, "userId"
+        )
+        profile_ids = [
+            profile.get("profileId")
+            for profiles in profiles_by_user.values()
+            for profile in profiles
+        ]
+        profile_disabled_by_profile = self._exec_grouped(
+            "admin-get-profile-disabled-by-profileids", "profileIds", profile_ids, "profileId"
+        )
+
+        for user_row in users:
             user_row["created_human"] = self._format_unix_timestamp(user_row.get("created"))
             user_row["modified_human"] = self._format_unix_timestamp(user_row.get("modified"))
             user_row["lasttime_human"] = self._format_unix_timestamp(user_row.get("lasttime"))
-            user_id = user_row.get("userId")
+            user_id = str(user_row.get("userId"))
 
-            # Fetch all profiles for this user
-            p_res = self.model.exec("user", "admin-get-profiles-by-userid", {"userId": user_id})
-            if self.model.has_error:
-                user_row["profiles"] = []
-                self.model.clear_error()
-            else:
-                user_row["profiles"] = self._rows_to_dicts(p_res)
+            user_row["profiles"] = profiles_by_user.get(user_id, [])
 
             # Keep compatibility for existing templates/logic that might look at user-level roles
             # We use roles from any of the user's profiles
-            user_row["roles"] = self.get_roles(user_id)
+            user_row["roles"] = sorted({
+                str(row["code"]) for row in roles_by_user.get(user_id, []) if row.get("code")
+            })
 
-            disabled_result = self.model.exec("user", "admin-get-disabled-by-userid", {"userId": user_id})
-            if self.model.has_error:
-                user_row["disabled"] = []
-                self.model.clear_error()
-            else:
-                user_row["disabled"] = self._rows_to_dicts(disabled_result)
+            user_row["disabled"] = disabled_by_user.get(user_id, [])
             for disabled_row in user_row["disabled"]:
                 disabled_row["created_human"] = self._format_unix_timestamp(disabled_row.get("created"))
                 disabled_row["modified_human"] = self._format_unix_timestamp(disabled_row.get("modified"))
@@ -1102,19 +1194,22 @@ class User:  # pylint: disable=too-many-public-methods
             user_row["profile_disabled"] = []
             for profile in user_row["profiles"]:
                 p_id = profile.get("profileId")
-                p_disabled_result = self.model.exec("user", "admin-get-profile-disabled-by-profileid", {"profileId": p_id})
-                if self.model.has_error:
-                    self.model.clear_error()
-                else:
-                    p_disabled = self._rows_to_dicts(p_disabled_result)
-                    for p_row in p_disabled:
-                        p_row["profileId"] = p_id
-                        p_row["created_human"] = self._format_unix_timestamp(p_row.get("created"))
-                        p_row["modified_human"] = self._format_unix_timestamp(p_row.get("modified"))
-                    user_row["profile_disabled"].extend(p_disabled)
+                p_disabled = profile_disabled_by_profile.get(str(p_id), [])
+                for p_row in p_disabled:
+                    p_row["profileId"] = p_id
+                    p_row["created_human"] = self._format_unix_timestamp(p_row.get("created"))
+                    p_row["modified_human"] = self._format_unix_timestamp(p_row.get("modified"))
+                user_row["profile_disabled"].extend(p_disabled)
 
         return users
 
+    @staticmethod
+    def admin_users_cursor(user_row: dict, order_by="created") -> str:
+        """Cursor pointing after user_row for admin_list_users(), "" if the order has no keyset."""
+        if order_by not in ("created", "modified") or not user_row:
+            return ""
+        return encode_cursor(f"users:{order_by}", user_row.get(order_by), user_row.get("userId"))
+
     def set_user_disabled(self, user_id, reason, description="") -> bool:
         """Add or update a disabled reason for a user."""
         result = self.model.exec(
@@ -1128,6 +1223,7 @@ class User:  # pylint: disable=too-many-public-methods
                 "modified": self.now,
             },
         )
+        self.invalidate_runtime_user(user_id)
         if self.model.has_error:
             return False
         return bool(result and result.get("success"))
@@ -1145,6 +1241,7 @@ class User:  # pylint: disable=too-many-public-methods
                 "modified": self.now,
             },
         )
+        self.invalidate_runtime_user_by_profile(profile_id)
         if self.model.has_error:
             return False
         return bool(result and result.get("success"))
@@ -1159,6 +1256,7 @@ class User:  # pylint: disable=too-many-public-methods
                 "profileId": profile_id,
             },
         )
+        self.invalidate_runtime_user_by_profile(profile_id)
         if self.model.has_error:
             return False
         return bool(result and result.get("success"))
@@ -1173,6 +1271,7 @@ class User:  # pylint: disable=too-many-public-methods
                 "userId": user_id,
             },
         )
+        self.invalidate_runtime_user(user_id)
         if self.model.has_error:
             return False
         return bool(result and result.get("success"))
@@ -1180,6 +1279,7 @@ class User:  # pylint: disable=too-many-public-methods
     def delete_user(self, user_id) -> bool:
         """Delete user and all cascaded dependent records."""
         result = self.model.exec("user", "admin-delete-user", {"userId": user_id})
+        self.invalidate_runtime_user(user_id)
         if self.model.has_error:
             return False
         return bool(result and result.get("success"))
@@ -1233,13 +1333,19 @@ class User:  # pylint: disable=too-many-public-methods
         disabled_reason="",
         limit=100,
         offset=0,
+        cursor="",
     ) -> list[dict]:
-        """List profiles for admin views with roles and disabled flags."""
+        """List profiles for admin views with roles and disabled flags.
+
+        A cursor from admin_profiles_cursor() selects keyset pagination;
+        otherwise limit/offset is used.
+        """
         operation_map = {
             "created": "admin-profile-list-by-created",
             "modified": "admin-profile-list-by-modified",
         }
-        operation = operation_map.get(order_by, "admin-profile-list-by-created")
+        order_by = order_by if order_by in operation_map else "created"
+        operation = operation_map[order_by]
 
         normalized_disabled_reason = ""
         if str(disabled_reason).strip():
@@ -1248,17 +1354,19 @@ class User:  # pylint: disable=too-many-public-methods
             except (TypeError, ValueError):
                 normalized_disabled_reason = ""
 
-        result = self.model.exec(
-            "user",
-            operation,
-            {
-                "search": (search or "").strip(),
-                "code": self._normalize_role_code(code),
-                "disabled_reason": normalized_disabled_reason,
-                "limit": int(limit),
-                "offset": int(offset),
-            },
-        )
+        params = {
+            "search": (search or "").strip(),
+            "code": self._normalize_role_code(code),
+            "disabled_reason": normalized_disabled_reason,
+            "limit": int(limit),
+            "offset": int(offset),
+        }
+        position = decode_cursor(cursor, f"profiles:{order_by}")
+        if position:
+            operation = f"{operation}-after"
+            params["cursor_value"], params["cursor_id"] = position
+
+        result = self.model.exec("user", operation, params)
         if self.model.has_error:
             return []
 
@@ -1271,28 +1379,46 @@ class User:  # pylint: disable=too-many-public-methods
                     decode_dict(v)
 
         profiles = self._rows_to_dicts(result)
+        profile_ids = [
+            profile_row.get("user_profile", {}).get("profileId") for profile_row in profiles
+        ]
+        roles_by_profile = self._exec_grouped(
+            "get-roles-by-profileids", "profileIds", profile_ids, "profileId"
+        )
+        profile_disabled_by_profile = self._exec_grouped(
+            "admin-get-profile-disabled-by-profileids", "profileIds", profile_ids, "profileId"
+        )
+
         for profile_row in profiles:
             decode_dict(profile_row)
             profile_row["created_human"] = self._format_unix_timestamp(profile_row.get("created"))
             profile_row["modified_human"] = self._format_unix_timestamp(profile_row.get("modified"))
             profile_row["lasttime_human"] = self._format_unix_timestamp(profile_row.get("lasttime"))
 
-            profile_id = profile_row.get("user_profile", {}).get("profileId")
+            profile_id = str(profile_row.get("user_profile", {}).get("profileId"))
 
-            profile_row["roles"] = self.get_roles_by_profile(profile_id)
+            profile_row["roles"] = sorted({
+                str(row["code"]) for row in roles_by_profile.get(profile_id, []) if row.get("code")
+            })
 
-            p_disabled_result = self.model.exec("user", "admin-get-profile-disabled-by-profileid", {"profileId": profile_id})
-            if self.model.has_error:
-                profile_row["profile_disabled"] = []
-                self.model.clear_error()
-            else:
-                profile_row["profile_disabled"] = self._rows_to_dicts(p_disabled_result)
-                for p_row in profile_row["profile_disabled"]:
-                    p_row["created_human"] = self._format_unix_timestamp(p_row.get("created"))
-                    p_row["modified_human"] = self._format_unix_timestamp(p_row.get("modified"))
+            profile_row["profile_disabled"] = profile_disabled_by_profile.get(profile_id, [])
+            for p_row in profile_row["profile_disabled"]:
+                p_row["created_human"] = self._format_unix_timestamp(p_row.get("created"))
+                p_row["modified_human"] = self._format_unix_timestamp(p_row.get("modified"))
 
         return profiles
 
+    @staticmethod
+    def admin_profiles_cursor(profile_row: dict, order_by="created") -> str:
+        """Cursor pointing after profile_row for admin_list_profiles()."""
+        if order_by not in ("created", "modified") or not profile_row:
+            return ""
+        return encode_cursor(
+            f"profiles:{order_by}",
+            profile_row.get(order_by),
+            profile_row.get("user_profile", {}).get("profileId"),
+        )
+
     def set_login(self, user_id, new_email) -> bool:
         """Update user login."""
         login_b64 = self.hash_login(new_email.strip())
@@ -1301,6 +1427,7 @@ class User:  # pylint: disable=too-many-public-methods
             "set-login",
             {"userId": user_id, "login": login_b64, "modified": self.now}
         )
+        self.invalidate_runtime_user(user_id)
         if self.model.has_error:
             return False
         return bool(result and result.get("success"))
@@ -1313,6 +1440,7 @@ class User:  # pylint: disable=too-many-public-methods
             "set-password",
             {"userId": user_id, "password": hashed_pwd, "modified": self.now}
         )
+        self.invalidate_runtime_user(user_id)
         if self.model.has_error:
             return False
         return bool(result and result.get("success"))
@@ -1325,6 +1453,7 @@ class User:  # pylint: disable=too-many-public-methods
             "set-birthdate",
             {"userId": user_id, "birthdate": hashed_birthdate, "modified": self.now}
         )
+        self.invalidate_runtime_user(user_id)
         if self.model.has_error:
             return False
         return bool(result and result.get("success"))
@@ -1391,6 +1520,7 @@ class User:  # pylint: disable=too-many-public-methods
             "update-profile",
             params
         )
+        self.invalidate_runtime_user_by_profile(profile_id)
         if self.model.has_error:
             return False
         return bool(result and result.get("success"))
@@ -0,0 +1,150 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+Cache for the runtime USER structure built by User.get_runtime_user().
+
+Entries are keyed by userId and stored as orjson bytes, so every hit returns a
+fresh copy that request code can mutate freely. Backends:
+
+- "local": in-process TTL + LRU (default).
+- "flask": the Flask-Caching instance from app.extensions (shared when it is
+  configured with a shared store).
+- "none": caching disabled.
+
+User mutators (roles, disabled states, profile/login changes, deletion) call
+invalidate() explicitly; the TTL bounds staleness across processes that do
+not share the backend.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import orjson
+
+from app.config import Config
+from app.extensions import cache as flask_cache
+
+
+class LocalUserCache:
+    """In-process TTL + LRU store."""
+
+    def __init__(self, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Return the stored value or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value) -> None:
+        """Store value, evicting the least recently used entries when full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove key if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+class FlaskUserCache:
+    """Store backed by the app's Flask-Caching instance.
+
+    Flask-Caching needs an application context; outside one (scripts) every
+    call is a miss/no-op.
+    """
+
+    PREFIX = "runtime_user:"
+
+    def __init__(self, ttl: int, cache=flask_cache):
+        self.ttl = ttl
+        self.cache = cache
+
+    def get(self, key: str):
+        """Return the stored value or None."""
+        try:
+            return self.cache.get(self.PREFIX + key)
+        except RuntimeError:
+            return None
+
+    def set(self, key: str, value) -> None:
+        """Store value with the configured TTL."""
+        try:
+            self.cache.set(self.PREFIX + key, value, timeout=self.ttl)
+        except RuntimeError:
+            pass
+
+    def delete(self, key: str) -> None:
+        """Remove key if present."""
+        try:
+            self.cache.delete(self.PREFIX + key)
+        except RuntimeError:
+            pass
+
+    def clear(self) -> None:
+        """Flask-Caching has no prefix clear; entries expire by TTL."""
+
+
+class RuntimeUserCache:
+    """Runtime user cache facade over a pluggable backend."""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+
+    def get(self, user_id: str) -> dict | None:
+        """Return a private copy of the cached runtime user, or None."""
+        if self.backend is None or not user_id:
+            return None
+        value = self.backend.get(str(user_id))
+        return orjson.loads(value) if value is not None else None
+
+    def set(self, user_id: str, user_data: dict) -> None:
+        """Cache the runtime user for user_id."""
+        if self.backend is None or not user_id:
+            return
+        self.backend.set(str(user_id), orjson.dumps(user_data))
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop the cached runtime user for user_id."""
+        if self.backend is None or not user_id:
+            return
+        self.backend.delete(str(user_id))
+
+    def clear(self) -> None:
+        """Drop every cached runtime user (tests)."""
+        if self.backend is not None:
+            self.backend.clear()
+
+
+def create_backend(name: str, ttl: int, max_entries: int):
+    """Build the backend selected by USER_CACHE_BACKEND."""
+    name = (name or "").strip().lower()
+    if ttl <= 0 or name in ("", "none"):
+        return None
+    if name == "flask":
+        return FlaskUserCache(ttl)
+    return LocalUserCache(ttl, max_entries)
+
+
+runtime_user_cache = RuntimeUserCache(
+    create_backend(Config.USER_CACHE_BACKEND, Config.USER_CACHE_TTL, Config.USER_CACHE_MAX_ENTRIES)
+)
@@ -3,4 +3,5 @@ Neutral IPC Template package.
 https://github.com/FranBarInstance/neutral-ipc
 """
 
-from .neutral_ipc_template import NeutralIpcTemplate, NeutralIpcRecord
+from .neutral_ipc_template import NeutralIpcTemplate, NeutralIpcRecord, NeutralIpcConnectionPool
+from .neutral_ipc_async import AsyncNeutralIpcTemplate, AsyncNeutralIpcConnectionPool
@@ -0,0 +1,245 @@
+"""
+Asyncio variant of the Neutral Python IPC client.
+https://github.com/FranBarInstance/neutral-ipc
+"""
+# pylint: disable=too-few-public-methods
+# pylint: disable=too-many-positional-arguments
+# pylint: disable=too-many-arguments
+
+import asyncio
+import os
+import threading
+import time
+
+from . import neutral_ipc_config
+from .neutral_ipc_template import NeutralIpcRecord, NeutralIpcTemplate, json_loads
+
+
+class AsyncNeutralIpcConnectionPool:
+    """Pool of persistent asyncio stream connections to the IPC server.
+
+    Streams belong to the event loop that opened them, so idle connections are
+    only handed out to coroutines running on that same loop. Several loops
+    (one per thread) can share the pool. Streams of loops that have been
+    closed (asyncio.run(), async_to_sync() per request) are evicted and their
+    sockets closed on the next acquire or release.
+    """
+
+    def __init__(self, host, port, timeout, unix_socket='', pool_size=8, idle_timeout=60):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.unix_socket = unix_socket
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._idle = []
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        """Return (reader, writer, reused) with a live pooled stream or a new one."""
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        while True:
+            entry = self._pop_idle(loop)
+            if entry is None:
+                break
+            reader, writer, last_used = entry
+            if now - last_used <= self.idle_timeout and self._is_alive(reader, writer):
+                return reader, writer, True
+            self._close(writer)
+
+        reader, writer = await asyncio.wait_for(self._connect(), self.timeout)
+        return reader, writer, False
+
+    def release(self, reader, writer):
+        """Give a healthy stream back to the pool (closed if the pool is full)."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            stale = self._evict_closed_loops()
+            if len(self._idle) < self.pool_size:
+                self._idle.append((loop, reader, writer, time.monotonic()))
+                writer = None
+        for stale_writer in stale:
+            self._close_orphan(stale_writer)
+        if writer is not None:
+            self._close(writer)
+
+    def discard(self, writer):
+        """Close a stream that is broken or in an unknown state."""
+        self._close(writer)
+
+    def clear(self):
+        """Forget every idle stream, closing each one on the loop that owns it."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for loop, _, writer, _ in idle:
+            if loop.is_closed():
+                self._close_orphan(writer)
+            else:
+                loop.call_soon_threadsafe(self._close, writer)
+
+    def _pop_idle(self, loop):
+        entry = None
+        with self._lock:
+            stale = self._evict_closed_loops()
+            for index in range(len(self._idle) - 1, -1, -1):
+                if self._idle[index][0] is loop:
+                    _, reader, writer, last_used = self._idle.pop(index)
+                    entry = reader, writer, last_used
+                    break
+        for stale_writer in stale:
+            self._close_orphan(stale_writer)
+        return entry
+
+    def _evict_closed_loops(self):
+        """Drop idle streams of closed loops and return their writers (lock held)."""
+        stale = [writer for loop, _, writer, _ in self._idle if loop.is_closed()]
+        if stale:
+            self._idle = [entry for entry in self._idle if not entry[0].is_closed()]
+        return stale
+
+    def _connect(self):
+        if self.unix_socket:
+            return asyncio.open_unix_connection(self.unix_socket)
+        return asyncio.open_connection(self.host, self.port)
+
+    @staticmethod
+    def _is_alive(reader, writer):
+        # A pooled stream must have nothing pending: EOF or stray bytes mean it is unusable.
+        return not writer.is_closing() and not reader.at_eof() and not reader._buffer  # pylint: disable=protected-access
+
+    @staticmethod
+    def _close(writer):
+        try:
+            writer.close()
+        except (OSError, RuntimeError):
+            pass
+
+    @classmethod
+    def _close_orphan(cls, writer):
+        """Close a stream whose loop is closed: its transport can no longer do it."""
+        cls._close(writer)
+        sock = getattr(writer.transport, "_sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def _reset_after_fork(self):
+        """Fork hook: streams inherited from the parent must not be shared."""
+        self._lock = threading.Lock()
+        self._idle = []
+
+
+# Shared async pool for the process, configured from /etc/neutral-ipc-cfg.json.
+async_connection_pool = AsyncNeutralIpcConnectionPool(
+    neutral_ipc_config.HOST,
+    neutral_ipc_config.PORT,
+    neutral_ipc_config.TIMEOUT,
+    neutral_ipc_config.UNIX_SOCKET,
+    neutral_ipc_config.POOL_SIZE,
+    neutral_ipc_config.IDLE_TIMEOUT,
+)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=async_connection_pool._reset_after_fork)  # pylint: disable=protected-access
+
+
+class AsyncNeutralIpcClient:
+    """Neutral IPC client for asyncio."""
+
+    def __init__(self, control, format1, content1, format2, content2, pool=None):
+        """Initialize IPC client with parameters."""
+        self.control = control
+        self.format1 = format1
+        self.content1 = content1
+        self.format2 = format2
+        self.content2 = content2
+        self.pool = pool or async_connection_pool
+        self.result = {}
+
+    async def start(self):
+        """Send the record and await the response.
+
+        As in the blocking client, a pooled stream closed by the server before
+        any response byte arrives is replaced and the record is sent again once.
+        """
+        request = NeutralIpcRecord.encode_parts(
+            self.control, self.format1, self.content1, self.format2, self.content2
+        )
+
+        while True:
+            reader, writer, reused = await self.pool.acquire()
+            try:
+                response_header = await asyncio.wait_for(
+                    self._exchange(reader, writer, request), self.pool.timeout
+                )
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                self.pool.discard(writer)
+                closed = isinstance(e, ConnectionError) or not e.partial
+                if reused and closed:
+                    continue
+                if isinstance(e, ConnectionError):
+                    raise
+                raise ValueError("Incomplete header received") from e
+            except BaseException:
+                self.pool.discard(writer)
+                raise
+            break
+
+        try:
+            response = NeutralIpcRecord.decode_header(response_header)
+            length1 = response['length-1']
+            buffer = await asyncio.wait_for(
+                reader.readexactly(length1 + response['length-2']), self.pool.timeout
+            )
+        except asyncio.IncompleteReadError as e:
+            self.pool.discard(writer)
+            raise ValueError("Error reading from stream") from e
+        except BaseException:
+            self.pool.discard(writer)
+            raise
+
+        self.pool.release(reader, writer)
+        view = memoryview(buffer)
+        self.result = NeutralIpcRecord.decode_record(
+            response_header, str(view[:length1], 'utf-8'), str(view[length1:], 'utf-8')
+        )
+        return self.result
+
+    @staticmethod
+    async def _exchange(reader, writer, request):
+        """Send the record buffers and read the response header."""
+        writer.writelines(part for part in request if len(part))
+        await writer.drain()
+        return await reader.readexactly(NeutralIpcRecord.HEADER_LEN)
+
+
+class AsyncNeutralIpcTemplate(NeutralIpcTemplate):
+    """Neutral IPC Template rendered with await instead of a blocking socket."""
+
+    def __init__(self, template, schema=None, tpl_type=NeutralIpcRecord.CONTENT_PATH,
+                 schema_type=NeutralIpcRecord.CONTENT_JSON, schema_obj=None, pool=None):
+        """Initialize template with schema and content."""
+        super().__init__(template, schema, tpl_type, schema_type, schema_obj)
+        self.pool = pool
+
+    async def render(self):  # pylint: disable=invalid-overridden-method
+        """Render template with schema."""
+        record = AsyncNeutralIpcClient(
+            NeutralIpcRecord.CTRL_PARSE_TEMPLATE,
+            self.schema_type,
+            self.schema,
+            self.tpl_type,
+            self.template,
+            pool=self.pool,
+        )
+        result = await record.start()
+        self.result = {
+            'status': result['control'],
+            'result': json_loads(result['content-1']),
+            'content': result['content-2'],
+        }
+
+        return self.result['content']
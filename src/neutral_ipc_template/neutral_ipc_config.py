@@ -22,6 +22,9 @@ class NeutralIpcConfig:
         PORT (int): Default port number (4273)
         TIMEOUT (int): Default timeout in seconds (10)
         BUFFER_SIZE (int): Default buffer size in bytes (8192)
+        UNIX_SOCKET (str): Unix domain socket path, used instead of HOST:PORT when set ('')
+        POOL_SIZE (int): Idle connections kept open for reuse, 0 disables pooling (8)
+        IDLE_TIMEOUT (int): Seconds an idle pooled connection is kept (60)
     """
 
     # Default values
@@ -29,6 +32,9 @@ class NeutralIpcConfig:
     PORT = 4273
     TIMEOUT = 10
     BUFFER_SIZE = 8192
+    UNIX_SOCKET = ''
+    POOL_SIZE = 8
+    IDLE_TIMEOUT = 60
 
     # The IPC server configuration file
     CONFIG_FILE = '/etc/neutral-ipc-cfg.json'
@@ -69,9 +75,9 @@ class NeutralIpcConfig:
             return default_value
 
         # Type validation for specific keys
-        if key == 'host' and isinstance(value, str):
+        if key in ['host', 'unix_socket'] and isinstance(value, str):
             return value
-        elif key in ['port', 'timeout', 'buffer_size'] and isinstance(value, int):
+        elif key in ['port', 'timeout', 'buffer_size', 'pool_size', 'idle_timeout'] and isinstance(value, int):
             return value
 
         return default_value
@@ -100,9 +106,30 @@ class NeutralIpcConfig:
         config = cls.load_config()
         return cls.get_config_value(config, 'buffer_size', cls.BUFFER_SIZE)
 
+    @classmethod
+    def get_unix_socket(cls):
+        """Get configured Unix domain socket path."""
+        config = cls.load_config()
+        return cls.get_config_value(config, 'unix_socket', cls.UNIX_SOCKET)
+
+    @classmethod
+    def get_pool_size(cls):
+        """Get configured number of idle pooled connections."""
+        config = cls.load_config()
+        return cls.get_config_value(config, 'pool_size', cls.POOL_SIZE)
+
+    @classmethod
+    def get_idle_timeout(cls):
+        """Get configured idle timeout for pooled connections."""
+        config = cls.load_config()
+        return cls.get_config_value(config, 'idle_timeout', cls.IDLE_TIMEOUT)
+
 
 # Set module-level variables with appropriate values using public methods
 HOST = NeutralIpcConfig.get_host()
 PORT = NeutralIpcConfig.get_port()
 TIMEOUT = NeutralIpcConfig.get_timeout()
 BUFFER_SIZE = NeutralIpcConfig.get_buffer_size()
+UNIX_SOCKET = NeutralIpcConfig.get_unix_socket()
+POOL_SIZE = NeutralIpcConfig.get_pool_size()
+IDLE_TIMEOUT = NeutralIpcConfig.get_idle_timeout()
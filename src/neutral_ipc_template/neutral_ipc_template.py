@@ -7,13 +7,36 @@ https://github.com/FranBarInstance/neutral-ipc
 # pylint: disable=too-many-arguments
 
 import json
+import os
 import socket
 import struct
+import threading
+import time
 
 import msgpack
 
+from . import neutral_ipc_config
 from .neutral_ipc_config import NeutralIpcConfig
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def json_dumps(obj):
+    """Serialize obj to JSON (bytes with orjson, str with the stdlib fallback)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj)
+
+
+def json_loads(content):
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
 
 class NeutralIpcRecord:
     """Neutral IPC record."""
@@ -72,20 +95,30 @@ class NeutralIpcRecord:
             int(length2)
         )
 
+    @staticmethod
+    def encode_parts(control, format1, content1, format2, content2):
+        """Encode IPC record as (header, content1, content2) buffers.
+
+        The buffers are not joined; they are sent with scatter-gather I/O, so
+        bytes content (msgpack schema) is never copied on the client side.
+        """
+        content1_bytes = NeutralIpcRecord._to_bytes(content1)
+        content2_bytes = NeutralIpcRecord._to_bytes(content2)
+        header = NeutralIpcRecord.encode_header(
+            control, format1, len(content1_bytes), format2, len(content2_bytes)
+        )
+        return header, content1_bytes, content2_bytes
+
     @staticmethod
     def encode_record(control, format1, content1, format2, content2):
         """Encode complete IPC record."""
-        if isinstance(content1, bytes):
-            length1 = len(content1)
-        else:
-            length1 = len(content1.encode('utf-8'))
-        length2 = len(content2.encode('utf-8'))
-        header = NeutralIpcRecord.encode_header(control, format1, length1, format2, length2)
-        if isinstance(content1, bytes):
-            content1_bytes = content1
-        else:
-            content1_bytes = content1.encode('utf-8')
-        return header + content1_bytes + content2.encode('utf-8')
+        return b''.join(NeutralIpcRecord.encode_parts(control, format1, content1, format2, content2))
+
+    @staticmethod
+    def _to_bytes(content):
+        if isinstance(content, (bytes, bytearray)):
+            return content
+        return content.encode('utf-8')
 
     @staticmethod
     def decode_record(header, content1, content2):
@@ -101,95 +134,262 @@ class NeutralIpcRecord:
         return record
 
 
+class NeutralIpcConnectionPool:
+    """Thread-safe pool of persistent connections to the IPC server.
+
+    Idle sockets are reused (most recently used first) instead of opening a
+    new connection per record. A socket is health-checked before reuse and
+    dropped when the server has closed it or it has been idle longer than
+    idle_timeout. Connections are made to unix_socket when it is set,
+    otherwise to host:port.
+    """
+
+    def __init__(self, host, port, timeout, unix_socket='', pool_size=8, idle_timeout=60):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.unix_socket = unix_socket
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Return (connection, reused) with a live pooled socket or a new one."""
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, last_used = self._idle.pop()
+            if now - last_used <= self.idle_timeout and self._is_alive(conn):
+                return conn, True
+            self._close(conn)
+
+        return self._connect(), False
+
+    def release(self, conn):
+        """Give a healthy connection back to the pool (closed if the pool is full)."""
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append((conn, time.monotonic()))
+                return
+        self._close(conn)
+
+    def discard(self, conn):
+        """Close a connection that is broken or in an unknown state."""
+        self._close(conn)
+
+    def clear(self):
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
+
+    def _connect(self):
+        if self.unix_socket:
+            conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                conn.settimeout(self.timeout)
+                conn.connect(self.unix_socket)
+            except OSError:
+                conn.close()
+                raise
+            return conn
+
+        conn = socket.create_connection((self.host, self.port), self.timeout)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return conn
+
+    @staticmethod
+    def _is_alive(conn):
+        """A pooled socket must have nothing to read: EOF or stray bytes mean it is unusable."""
+        timeout = conn.gettimeout()
+        try:
+            conn.setblocking(False)
+            try:
+                conn.recv(1, socket.MSG_PEEK)
+                return False
+            finally:
+                conn.settimeout(timeout)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except OSError:
+            pass
+
+    def _reset_after_fork(self):
+        """Fork hook: sockets inherited from the parent must not be shared."""
+        self._lock = threading.Lock()
+        self._idle = []
+
+
+# Shared pool for the process, configured from /etc/neutral-ipc-cfg.json.
+connection_pool = NeutralIpcConnectionPool(
+    neutral_ipc_config.HOST,
+    neutral_ipc_config.PORT,
+    neutral_ipc_config.TIMEOUT,
+    neutral_ipc_config.UNIX_SOCKET,
+    neutral_ipc_config.POOL_SIZE,
+    neutral_ipc_config.IDLE_TIMEOUT,
+)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=connection_pool._reset_after_fork)  # pylint: disable=protected-access
+
+
 class NeutralIpcClient:
     """Neutral IPC client."""
 
-    def __init__(self, control, format1, content1, format2, content2):
+    def __init__(self, control, format1, content1, format2, content2, pool=None):
         """Initialize IPC client with parameters."""
         self.control = control
         self.format1 = format1
         self.content1 = content1
         self.format2 = format2
         self.content2 = content2
+        self.pool = pool or connection_pool
         self.result = {}
 
     def start(self):
-        """Start IPC communication and process response."""
-        with socket.create_connection((NeutralIpcConfig.HOST, NeutralIpcConfig.PORT),
-                                    NeutralIpcConfig.TIMEOUT) as conn:
-            request = NeutralIpcRecord.encode_record(
-                self.control, self.format1, self.content1, self.format2, self.content2
-            )
-            conn.sendall(request)
-
-            response_header = conn.recv(NeutralIpcRecord.HEADER_LEN)
-            if len(response_header) != NeutralIpcRecord.HEADER_LEN:
-                raise ValueError("Incomplete header received")
+        """Start IPC communication and process response.
+
+        A pooled connection that turns out to be closed by the server before
+        any response byte arrives is replaced by a new one and the record is
+        sent again (once).
+        """
+        request = NeutralIpcRecord.encode_parts(
+            self.control, self.format1, self.content1, self.format2, self.content2
+        )
 
+        while True:
+            conn, reused = self.pool.acquire()
+            try:
+                response_header = self._exchange(conn, request)
+            except ConnectionError:
+                self.pool.discard(conn)
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                self.pool.discard(conn)
+                raise
+            break
+
+        try:
             response = NeutralIpcRecord.decode_header(response_header)
+            content1, content2 = self._read_contents(conn, response['length-1'], response['length-2'])
+        except BaseException:
+            self.pool.discard(conn)
+            raise
 
-            content1 = self._read_content(conn, response['length-1'])
-            content2 = self._read_content(conn, response['length-2'])
+        self.pool.release(conn)
+        self.result = NeutralIpcRecord.decode_record(response_header, content1, content2)
+        return self.result
 
-            self.result = NeutralIpcRecord.decode_record(response_header, content1, content2)
+    @staticmethod
+    def _exchange(conn, request):
+        """Send the record buffers and read the response header."""
+        NeutralIpcClient._send_parts(conn, request)
+        header = bytearray(NeutralIpcRecord.HEADER_LEN)
+        received = conn.recv_into(header)
+        if not received:
+            raise ConnectionResetError("Connection closed by IPC server")
+        NeutralIpcClient._recv_into(conn, memoryview(header)[received:], "Incomplete header received")
+        return bytes(header)
 
-            return self.result
+    @staticmethod
+    def _send_parts(conn, parts):
+        """Send buffers with sendmsg (scatter-gather), without joining them."""
+        views = [memoryview(part) for part in parts if len(part)]
+        if not hasattr(conn, 'sendmsg'):
+            for view in views:
+                conn.sendall(view)
+            return
+
+        while views:
+            sent = conn.sendmsg(views)
+            while sent:
+                if sent >= views[0].nbytes:
+                    sent -= views[0].nbytes
+                    views.pop(0)
+                else:
+                    views[0] = views[0][sent:]
+                    sent = 0
 
-    def _read_content(self, conn, length):
-        """Read content from connection with specified length."""
-        chunks = []
+    @staticmethod
+    def _recv_into(conn, view, error="Error reading from stream"):
+        """Fill view from the connection."""
         buffer_size = NeutralIpcConfig.BUFFER_SIZE
+        while view.nbytes:
+            received = conn.recv_into(view, min(buffer_size, view.nbytes))
+            if not received:
+                raise ValueError(error)
+            view = view[received:]
 
-        while length > 0:
-            chunk = conn.recv(min(buffer_size, length))
-            if not chunk:
-                raise ValueError("Error reading from stream")
-            chunks.append(chunk)
-            length -= len(chunk)
-
-        return b''.join(chunks).decode('utf-8')
+    def _read_contents(self, conn, length1, length2):
+        """Read both contents into one preallocated buffer and decode each once."""
+        buffer = bytearray(length1 + length2)
+        view = memoryview(buffer)
+        self._recv_into(conn, view)
+        return str(view[:length1], 'utf-8'), str(view[length1:], 'utf-8')
 
 
 class NeutralIpcTemplate:
     """Neutral IPC Template."""
 
-    def __init__(self, template, schema, tpl_type=NeutralIpcRecord.CONTENT_PATH, schema_type=NeutralIpcRecord.CONTENT_JSON):
-        """Initialize template with schema and content."""
+    def __init__(self, template, schema=None, tpl_type=NeutralIpcRecord.CONTENT_PATH,
+                 schema_type=NeutralIpcRecord.CONTENT_JSON, schema_obj=None):
+        """Initialize template with schema and content.
+
+        schema_obj (a dict, as accepted by neutraltemplate.NeutralTemplate) is
+        sent as MsgPack. Dicts are encoded once; JSON uses orjson when available.
+        """
         self.template = template
         self.tpl_type = tpl_type
+        if schema_obj is not None:
+            schema = schema_obj
+            schema_type = NeutralIpcRecord.CONTENT_MSGPACK
         self.schema_type = schema_type
-        if schema_type == NeutralIpcRecord.CONTENT_MSGPACK:
+        self.schema = self._encode_schema(schema if schema is not None else {})
+        self.result = {}
+
+    def _encode_schema(self, schema):
+        if self.schema_type == NeutralIpcRecord.CONTENT_MSGPACK:
             # If schema is already bytes, use it directly; otherwise serialize
             if isinstance(schema, bytes):
-                self.schema = schema
-            elif isinstance(schema, str):
+                return schema
+            if isinstance(schema, str):
                 # If it's a string, parse as JSON first then serialize
-                self.schema = msgpack.packb(json.loads(schema), use_bin_type=False)
-            else:
-                # It's a dict, serialize it
-                self.schema = msgpack.packb(schema, use_bin_type=False)
-        else:
-            self.schema = json.dumps(schema) if not isinstance(schema, str) else schema
-        self.result = {}
+                return msgpack.packb(json_loads(schema), use_bin_type=True)
+            return msgpack.packb(schema, use_bin_type=True)
+        return schema if isinstance(schema, (str, bytes)) else json_dumps(schema)
 
-    def render(self):
-        """Render template with schema."""
+    def _decode_schema(self):
         if self.schema_type == NeutralIpcRecord.CONTENT_MSGPACK:
-            schema_content = self.schema
-        else:
-            schema_content = self.schema
+            return msgpack.unpackb(self.schema, raw=False)
+        return json_loads(self.schema)
 
+    def render(self):
+        """Render template with schema."""
         record = NeutralIpcClient(
             NeutralIpcRecord.CTRL_PARSE_TEMPLATE,
             self.schema_type,
-            schema_content,
+            self.schema,
             self.tpl_type,
             self.template
         )
         result = record.start()
         self.result = {
             'status': result['control'],
-            'result': json.loads(result['content-1']),
+            'result': json_loads(result['content-1']),
             'content': result['content-2'],
         }
 
@@ -207,9 +407,8 @@ class NeutralIpcTemplate:
 
     def merge_schema(self, schema):
         """Merge new schema with existing schema."""
-        current_schema = json.loads(self.schema)
-        new_schema = json.loads(schema) if isinstance(schema, str) else schema
-        self.schema = json.dumps(deep_merge(current_schema, new_schema))
+        new_schema = json_loads(schema) if isinstance(schema, (str, bytes)) else schema
+        self.schema = self._encode_schema(deep_merge(self._decode_schema(), new_schema))
 
     def has_error(self):
         """Check if template has errors."""
@@ -20,7 +20,7 @@ from .sbase64url import (
     sbase64url_token,
 )
 
-from .utils import get_ip, format_ua, merge_dict, parse_vars
+from .utils import get_ip, format_ua, merge_dict, merge_shared, parse_vars
 
 __all__ = [
     # Funciones de tokens
@@ -43,5 +43,6 @@ __all__ = [
     "get_ip",
     "format_ua",
     "merge_dict",
+    "merge_shared",
     "parse_vars",
 ]
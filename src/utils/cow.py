@@ -0,0 +1,93 @@
+"""Copy-on-write dictionary layered over an immutable base."""
+
+_MISSING = object()
+
+
+def _layer(value):
+    """Private copy of a base value: dicts are layered, lists shallow copied."""
+    if isinstance(value, dict):
+        return CowDict(value)
+    if isinstance(value, list):
+        return [_layer(item) for item in value]
+    return value
+
+
+class CowDict(dict):
+    """Dict that starts as a shallow copy of base and copies branches on access.
+
+    The base is shared between many CowDicts (one per request) and must never
+    be modified. A nested dict or list still shared with the base is replaced
+    by a private copy (a CowDict for dicts) the first time it is read through
+    this mapping, so writes at any depth only touch copies, and only the
+    branches a caller reaches are ever copied.
+
+    It is a real dict: msgpack, orjson and NeutralTemplate serialize it as a
+    plain mapping, and untouched branches stay the very objects of the base.
+    """
+
+    __slots__ = ("_base",)
+
+    def __init__(self, base: dict):
+        super().__init__(base)
+        self._base = base
+
+    def _own(self, key, value):
+        if (
+            isinstance(value, (dict, list))
+            and dict.get(self._base, key, _MISSING) is value
+        ):
+            value = _layer(value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __getitem__(self, key):
+        return self._own(key, dict.__getitem__(self, key))
+
+    # Overridden so dict(cow) and {**cow} copy through __getitem__ instead of
+    # handing out branches of the base.
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def get(self, key, default=None):
+        value = dict.get(self, key, _MISSING)
+        if value is _MISSING:
+            return default
+        return self._own(key, value)
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        dict.__setitem__(self, key, default)
+        return default
+
+    def pop(self, key, *default):
+        if key in self:
+            self._own(key, dict.__getitem__(self, key))
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        if self:
+            key = next(reversed(dict.keys(self)))
+            self._own(key, dict.__getitem__(self, key))
+        return dict.popitem(self)
+
+    def values(self):
+        self._own_all()
+        return dict.values(self)
+
+    def items(self):
+        self._own_all()
+        return dict.items(self)
+
+    def copy(self):
+        clone = CowDict(self._base)
+        dict.update(clone, dict.items(self))
+        return clone
+
+    def __reduce__(self):
+        return (dict, (dict(self.items()),))
+
+    def _own_all(self):
+        for key, value in dict.items(self):
+            if isinstance(value, (dict, list)):
+                self._own(key, value)
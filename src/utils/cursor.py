@@ -0,0 +1,43 @@
+"""Opaque cursor tokens for keyset pagination."""
+
+import hashlib
+import hmac
+import json
+
+from app.config import Config
+
+from .sbase64url import sbase64url_decode, sbase64url_encode
+
+
+def _sign(payload: str) -> str:
+    key = (Config.SECRET_KEY or "").encode("utf-8")
+    return hmac.new(key, payload.encode("utf-8"), hashlib.sha256).hexdigest()[:24]
+
+
+def encode_cursor(order: str, value: int, row_id) -> str:
+    """Build a signed cursor pointing after the row (value, row_id) for an ordering."""
+    payload = sbase64url_encode(json.dumps([order, int(value or 0), str(row_id)], separators=(",", ":")))
+    return f"{payload}.{_sign(payload)}"
+
+
+def decode_cursor(token: str, order: str) -> tuple[int, str] | None:
+    """Return (value, row_id) for a valid cursor of the given ordering, else None.
+
+    Tampered, malformed or foreign-order tokens are ignored (None), so callers
+    fall back to the first page / offset pagination.
+    """
+    if not token or "." not in token:
+        return None
+
+    payload, signature = token.rsplit(".", 1)
+    if not hmac.compare_digest(signature, _sign(payload)):
+        return None
+
+    try:
+        cursor_order, value, row_id = json.loads(sbase64url_decode(payload))
+    except (ValueError, TypeError, UnicodeDecodeError):
+        return None
+
+    if cursor_order != order or not isinstance(value, int) or not isinstance(row_id, str):
+        return None
+    return value, row_id
@@ -0,0 +1,152 @@
+# Copyright (C) 2025 https://github.com/FranBarInstance/neutral-starter-py (See LICENCE)
+"""
+HTML minifier for TEMPLATE_HTML_MINIFY and for .ntpl sources.
+
+Removes the indentation and blank lines before tags in one pass: raw blocks
+(pre, textarea, script, style, xmp) and comments are located with a single
+scan and copied verbatim, and every stretch between them is stripped with
+one substitution. Indentation before pre, code, samp, kbd, var, textarea,
+xmp, script, style and template tags is kept; indentation before the closing
+tag of a script or style block is removed, as it is not content.
+
+HtmlMinifier does the same work chunk by chunk: feed() returns the output
+that later chunks cannot change and holds back the rest until close().
+"""
+
+import re
+
+_KEPT = r"(?:pre|code|samp|kbd|var|textarea|xmp|script|style|template)\b"
+
+# Indentation and blank lines before a tag, unless the tag keeps it (case
+# sensitive like the regex it replaces, and faster than a lookahead)
+_INDENT = re.compile(r"\n\s+<(?!" + _KEPT + ")")
+_LEADING = re.compile(r"\s+<(?!" + _KEPT + ")")
+
+# Start of a raw block or a comment
+# (the first lookahead lets the scan skip most "<" quickly)
+_RAW_OPEN = re.compile(
+    r"<(?=[pPtTsSxX!])(?:(pre|textarea|script|style|xmp)(?=[\s>/]|\Z)|!--)", re.IGNORECASE
+)
+
+# End of each raw block
+_RAW_CLOSE = {
+    name: re.compile(rf"</{name}(?=[\s>/]|\Z)", re.IGNORECASE)
+    for name in ("pre", "textarea", "script", "style", "xmp")
+}
+_RAW_CLOSE[None] = re.compile(r"-->")
+
+# Blocks whose closing tag indentation is not content
+_TRIM_CLOSE = ("script", "style")
+
+
+class HtmlMinifier:
+    """Streaming minifier: feed() the chunks in order, then close().
+
+    Text is released only at safe points, right before a newline that
+    follows non-whitespace and outside any raw block or comment, so each
+    released piece minifies exactly as it would inside the whole document.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._started = False
+
+    def feed(self, chunk: str) -> str:
+        """Add chunk and return the part of the output that is already final."""
+        text = self._pending + chunk
+        blocks = _raw_blocks(text)
+        end = _safe_end(text, blocks)
+        if end <= 0:
+            self._pending = text
+            return ""
+
+        self._pending = text[end:]
+        output = _minify(text[:end], [b for b in blocks if b[0] < end], not self._started)
+        self._started = True
+        return output
+
+    def close(self) -> str:
+        """Return the rest of the output and reset the minifier."""
+        text = self._pending
+        output = _minify(text, _raw_blocks(text), not self._started)
+        self._pending = ""
+        self._started = False
+        return output
+
+
+def minify_html(html: str) -> str:
+    """Minify a complete document."""
+    return _minify(html, _raw_blocks(html), True)
+
+
+def _raw_blocks(text: str) -> list:
+    """Locate the raw blocks and comments of text.
+
+    Each item is (start, body, keep, close, end): the opener starts at start
+    and ends at body, the contents up to keep are copied, then the closing tag
+    from close to end. end is None when the block is not terminated.
+    """
+    blocks = []
+    pos = 0
+    while True:
+        opener = _RAW_OPEN.search(text, pos)
+        if opener is None:
+            return blocks
+
+        name = opener.group(1)
+        closer = _RAW_CLOSE[name and name.lower()].search(text, opener.end())
+        if closer is None:
+            blocks.append((opener.start(), opener.end(), len(text), len(text), None))
+            return blocks
+
+        keep = close = closer.start()
+        if name and name.lower() in _TRIM_CLOSE:
+            keep = _indent_start(text, opener.end(), close)
+        blocks.append((opener.start(), opener.end(), keep, close, closer.end()))
+        pos = closer.end()
+
+
+def _indent_start(text: str, start: int, end: int) -> int:
+    """Where the indentation ending at end can be cut, keeping its first newline."""
+    trimmed = start + len(text[start:end].rstrip())
+    newline = text.find("\n", trimmed, end)
+    return end if newline < 0 or newline + 1 == end else newline + 1
+
+
+def _safe_end(text: str, blocks: list) -> int:
+    """Last position where text can be split without changing the output (0 if none)."""
+    limit = len(text)
+    for start, _body, _keep, _close, end in reversed(blocks):
+        if end is None:
+            limit = start
+        break
+
+    while True:
+        end = text.rfind("\n", 0, limit)
+        if end <= 0:
+            return 0
+        if text[end - 1].isspace():
+            limit = end
+            continue
+        inside = [b for b in blocks if b[0] < end and (b[4] is None or b[4] > end)]
+        if not inside:
+            return end
+        limit = inside[0][0]
+
+
+def _minify(text: str, blocks: list, leading: bool) -> str:
+    out = []
+    pos = 0
+    if leading:
+        match = _LEADING.match(text)
+        if match:
+            pos = match.end() - 1
+
+    for _start, body, keep, close, end in blocks:
+        out.append(_INDENT.sub("\n<", text[pos:body]))
+        out.append(text[body:keep])
+        out.append(text[close:end])
+        pos = len(text) if end is None else end
+
+    out.append(_INDENT.sub("\n<", text[pos:]))
+    return "".join(out)
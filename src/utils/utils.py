@@ -79,6 +79,21 @@ def merge_dict(a, b):
     recursive_merge(a, b)
 
 
+def merge_shared(a, b):
+    """Return a new dictionary with b merged recursively over a.
+
+    Unlike merge_dict, a is left untouched: only the branches b reaches are
+    copied, every other branch is shared with a.
+    """
+    merged = dict(a)
+    for key, value in b.items():
+        if isinstance(merged.get(key), dict) and isinstance(value, dict):
+            merged[key] = merge_shared(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
 def parse_vars(template, data):
     """Parse variables in template with [:; ... :] delimiters and "->" for nested keys."""
 
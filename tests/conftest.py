@@ -24,6 +24,10 @@ class TestConfig(Config):
     DB_IMAGE = "sqlite:///:memory:"
     # Disable features that might require external services
     MAIL_METHOD = "dummy"
+    # Do not write compressed siblings into the source tree on every app creation
+    COMPRESSION_PRECOMPRESS = False
+    # Hashing public/ on every app creation slows the suite down
+    STATIC_ETAG_PRECOMPUTE = False
 
 
 @pytest.fixture(name="flask_app")
@@ -0,0 +1,89 @@
+"""Tests for response compression and precompressed static files."""
+
+import gzip
+import os
+
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+from core.compression import Compression, compression
+from core.static_files import send_static
+
+
+def test_accepted_follows_the_client_q_values():
+    """Encodings the client refuses or that are not installed are left out."""
+    comp = Compression(["br", "zstd", "gzip", "unknown"], 1024, ["text/css"])
+    accept = _accept("gzip;q=0.5, deflate, *;q=0.1")
+
+    assert comp.accepted(accept)[0] == "gzip"
+    assert "unknown" not in comp.accepted(accept)
+    assert not comp.accepted(_accept("gzip;q=0"))
+    assert not comp.accepted(_accept(None))
+
+
+def test_rendered_page_is_compressed(client):
+    """Pages are gzipped when accepted and vary on Accept-Encoding either way."""
+    plain = client.get("/")
+    compressed = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert "Accept-Encoding" in plain.vary
+    assert "Content-Encoding" not in plain.headers
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.vary
+    assert int(compressed.headers["Content-Length"]) < len(plain.get_data())
+    assert b"</html>" in gzip.decompress(compressed.get_data())
+
+
+def test_refused_encoding_is_not_used(client):
+    """q=0 disables an encoding."""
+    response = client.get("/", headers={"Accept-Encoding": "gzip;q=0"})
+
+    assert "Content-Encoding" not in response.headers
+
+
+def test_precompress_directory_writes_fresh_siblings(tmp_path):
+    """Only compressible files over the minimum size get siblings, once."""
+    comp = Compression(["gzip"], 1024, ["text/css"])
+    (tmp_path / "big.css").write_text("body { color: red; }\n" * 200)
+    (tmp_path / "small.css").write_text("a{}")
+    (tmp_path / "font.woff2").write_bytes(os.urandom(4096))
+
+    assert comp.precompress_directory(str(tmp_path)) == 1
+    assert gzip.decompress((tmp_path / "big.css.gz").read_bytes()) == (tmp_path / "big.css").read_bytes()
+    assert not (tmp_path / "small.css.gz").exists()
+    assert not (tmp_path / "font.woff2.gz").exists()
+    assert comp.precompress_directory(str(tmp_path)) == 0
+
+    stale = os.stat(tmp_path / "big.css.gz").st_mtime - 10
+    os.utime(tmp_path / "big.css.gz", (stale, stale))
+    assert comp.precompress_directory(str(tmp_path)) == 1
+
+
+def test_send_static_serves_the_precompressed_sibling(flask_app, tmp_path):
+    """The sibling keeps the original type and gets its own ETag and 304s."""
+    (tmp_path / "app.css").write_text("body { color: red; }\n" * 200)
+    compression.precompress_directory(str(tmp_path))
+
+    with flask_app.test_request_context("/app.css", headers={"Accept-Encoding": "gzip"}):
+        response = send_static(str(tmp_path), "app.css")
+        response.direct_passthrough = False
+        etag = response.get_etag()[0]
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.mimetype == "text/css"
+        assert "Accept-Encoding" in response.vary
+        assert gzip.decompress(response.get_data()) == (tmp_path / "app.css").read_bytes()
+
+    with flask_app.test_request_context("/app.css"):
+        plain = send_static(str(tmp_path), "app.css")
+        assert "Content-Encoding" not in plain.headers
+        assert "Accept-Encoding" in plain.vary
+        assert plain.get_etag()[0] != etag
+
+    with flask_app.test_request_context(
+        "/app.css", headers={"Accept-Encoding": "gzip", "If-None-Match": f'"{etag}"'}
+    ):
+        assert send_static(str(tmp_path), "app.css").status_code == 304
+
+
+def _accept(value):
+    return parse_accept_header(value, Accept)
@@ -0,0 +1,130 @@
+"""Tests for conditional GET on static files and image variants."""
+
+import hashlib
+import os
+
+import pytest
+
+from app.config import Config
+from core.image import Image, ImageVariant
+from core.static_files import StaticEtags
+from core.user import User
+
+ICONS_CSS = os.path.join(
+    Config.COMPONENT_DIR, "cmp_1100_materialicons", "static", "materialdesignicons.min.css"
+)
+
+
+@pytest.fixture(name="variant_calls")
+def fixture_variant_calls(monkeypatch):
+    """Serve fake public variants and record the image ids whose data is loaded."""
+    calls = []
+    public = {"img-etag"}
+
+    def get_public_meta(_self, image_id):
+        return {"imageId": image_id} if image_id in public else None
+
+    def get_public_variant(_self, image_id, _variant):
+        calls.append(image_id)
+        return ImageVariant(b"webp-data", 16, 16) if image_id in public else None
+
+    monkeypatch.setattr(Image, "get_public_meta", get_public_meta)
+    monkeypatch.setattr(Image, "get_public_variant", get_public_variant)
+    return calls
+
+
+def test_static_etag_is_the_content_hash(client):
+    """Static files get a strong ETag from their content, not their mtime."""
+    response = client.get("/materialicons/materialdesignicons.min.css")
+    with open(ICONS_CSS, "rb") as file:
+        digest = hashlib.sha256(file.read()).hexdigest()[:32]
+
+    assert response.get_etag() == (digest, False)
+    assert response.last_modified is not None
+
+
+def test_static_revalidation_gets_304(client):
+    """Matching If-None-Match or If-Modified-Since is answered without a body."""
+    response = client.get("/materialicons/materialdesignicons.min.css")
+    etag, last_modified = response.headers["ETag"], response.headers["Last-Modified"]
+
+    by_etag = client.get("/materialicons/materialdesignicons.min.css", headers={"If-None-Match": etag})
+    by_date = client.get(
+        "/materialicons/materialdesignicons.min.css", headers={"If-Modified-Since": last_modified}
+    )
+    stale = client.get("/materialicons/materialdesignicons.min.css", headers={"If-None-Match": '"other"'})
+
+    for not_modified in (by_etag, by_date):
+        assert not_modified.status_code == 304
+        assert not_modified.get_data() == b""
+        assert not_modified.headers["Cache-Control"] == Config.STATIC_CACHE_CONTROL
+    assert by_etag.headers["ETag"] == etag
+    assert stale.status_code == 200
+
+
+def test_static_etags_follow_file_changes(tmp_path):
+    """A changed file is hashed again; an unchanged one is not read."""
+    etags = StaticEtags()
+    path = tmp_path / "app.js"
+    path.write_text("one")
+
+    assert etags.precompute(str(tmp_path)) == 1
+    first = etags.get(str(path), os.stat(path))
+    path.write_text("two!")
+
+    assert etags.get(str(path), os.stat(path)) != first
+
+
+def test_image_variant_revalidation_skips_the_data(client, variant_calls):
+    """A variant's ETag comes from imageId and variant; a 304 does not load the data."""
+    response = client.get("/i/v/img-etag/thumb")
+    revalidated = client.get("/i/v/img-etag/thumb", headers={"If-None-Match": response.headers["ETag"]})
+
+    assert response.status_code == 200
+    assert revalidated.status_code == 304
+    assert revalidated.headers["Cache-Control"] == Config.STATIC_CACHE_IMG_CONTROL
+    assert variant_calls == ["img-etag"]
+
+
+def test_hidden_image_is_not_revalidated(client, variant_calls):
+    """An image that is no longer public gets a 404, not a 304."""
+    hidden = client.get("/i/v/img-hidden/medium", headers={"If-None-Match": "*"})
+
+    assert hidden.status_code == 404
+    assert variant_calls == ["img-hidden"]
+
+
+def test_profile_image_revalidation_follows_the_cached_response(client, monkeypatch):
+    """/p/ revalidations are answered from the cache, and a profile change moves the ETag."""
+    profiles = {"etag-user": "img-old"}
+    lookups = []
+
+    def get_public_profile_by_username(_self, username):
+        lookups.append(username)
+        return {"imageId": profiles.get(username, "")}
+
+    def get_variant(_self, image_id, _variant):
+        return ImageVariant(image_id.encode(), 16, 16)
+
+    monkeypatch.setattr(User, "get_public_profile_by_username", get_public_profile_by_username)
+    monkeypatch.setattr(Image, "get_variant", get_variant)
+
+    first = client.get("/i/p/etag-user")
+    etag = first.headers["ETag"]
+    revalidated = client.get("/i/p/etag-user", headers={"If-None-Match": etag})
+
+    assert first.get_data() == b"img-old"
+    assert revalidated.status_code == 304
+    assert revalidated.headers["Cache-Control"] == Config.STATIC_CACHE_IMG_PROFILE_CONTROL
+    assert lookups == ["etag-user"]
+
+    profiles["etag-user"] = "img-new"
+    Image("sqlite:///:memory:", "sqlite").invalidate_public_username_cache("etag-user", "/i/p")
+    changed = client.get("/i/p/etag-user", headers={"If-None-Match": etag})
+    again = client.get("/i/p/etag-user", headers={"If-None-Match": changed.headers["ETag"]})
+
+    assert changed.status_code == 200
+    assert changed.get_data() == b"img-new"
+    assert changed.headers["ETag"] != etag
+    assert again.status_code == 304
+    assert lookups == ["etag-user", "etag-user"]
@@ -0,0 +1,82 @@
+"""Tests for the copy-on-write request schema."""
+
+from __future__ import annotations
+
+import copy
+import pickle
+
+import msgpack
+import orjson
+
+from utils.cow import CowDict
+
+
+def _base() -> dict:
+    return {
+        "config": {"cache_prefix": "neutral"},
+        "data": {
+            "CONTEXT": {"GET": {}, "HEADERS": {}},
+            "current": {"site": {"languages": ["en", "es"]}, "theme": {"theme": "light"}},
+            "items": [{"name": "one"}],
+        },
+    }
+
+
+def test_writes_never_reach_the_base():
+    """Writes at any depth, through any accessor, only touch the layered copies."""
+    base = _base()
+    snapshot = copy.deepcopy(base)
+    layered = CowDict(base)
+
+    layered["config"]["cache_prefix"] += "-ipc"
+    layered["data"]["CONTEXT"]["GET"].update({"q": "1"})
+    layered.get("data")["current"]["site"]["languages"].append("fr")
+    layered["data"].setdefault("current", {})["theme"]["theme"] = "dark"
+    layered["data"]["items"][0]["name"] = "changed"
+    for _key, value in layered["data"].items():
+        if isinstance(value, dict):
+            value["touched"] = True
+    plain = dict(layered["data"]["current"])
+    plain["site"]["host"] = "example.com"
+    layered["data"].pop("CONTEXT")["GET"]["popped"] = True
+
+    assert base == snapshot
+    assert layered["config"]["cache_prefix"] == "neutral-ipc"
+    assert layered["data"]["current"]["site"] == {"languages": ["en", "es", "fr"], "host": "example.com"}
+    assert layered["data"]["current"]["theme"] == {"theme": "dark"}
+    assert "CONTEXT" not in layered["data"]
+
+
+def test_untouched_branches_are_shared_with_the_base():
+    """Only the branches read through the mapping are copied."""
+    base = _base()
+    layered = CowDict(base)
+    layered["data"]["CONTEXT"]["GET"]["q"] = "1"
+
+    assert dict.__getitem__(layered, "config") is base["config"]
+    assert dict.__getitem__(layered["data"], "current") is base["data"]["current"]
+    assert layered["data"] is not base["data"]
+
+
+def test_assigned_values_are_kept_by_reference():
+    """Values a caller assigns are not copied, so later changes stay visible."""
+    layered = CowDict(_base())
+    user = {"alias": "user"}
+    layered["data"]["USER"] = user
+    user["id"] = 1
+
+    assert layered["data"]["USER"] is user
+    assert layered["data"]["USER"]["id"] == 1
+
+
+def test_serializes_as_a_plain_dict():
+    """msgpack, orjson, copy and pickle all see the layered contents."""
+    layered = CowDict(_base())
+    layered["data"]["CONTEXT"]["GET"]["q"] = "1"
+    expected = orjson.loads(orjson.dumps(layered))
+
+    assert expected["data"]["CONTEXT"]["GET"] == {"q": "1"}
+    assert msgpack.unpackb(msgpack.packb(layered)) == expected
+    assert copy.deepcopy(layered) == expected
+    assert pickle.loads(pickle.dumps(layered)) == expected
+    assert type(pickle.loads(pickle.dumps(layered))) is dict  # pylint: disable=unidiomatic-typecheck
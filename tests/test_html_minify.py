@@ -0,0 +1,103 @@
+"""Tests for the TEMPLATE_HTML_MINIFY minifier."""
+
+import random
+import re
+
+from utils.html_minify import HtmlMinifier, minify_html
+
+LEGACY = re.compile(
+    r"^\s+<(?!pre\b|code\b|samp\b|kbd\b|var\b|textarea\b|xmp\b|script\b|style\b|template\b)([^>]+>)",
+    re.MULTILINE,
+)
+
+PAGE = """
+  <!DOCTYPE html>
+<html>
+    <head>
+        <style>
+            body { color: red; }
+        </style>
+        <!--
+            <b>comment</b>
+        -->
+    </head>
+
+    <body>
+        <div class="a">
+            text
+            <span>x</span>
+
+        </div>
+        <pre>
+    <b>kept</b>
+        </pre>
+        <code>x</code>
+        <textarea>
+    <i>kept</i>
+        </textarea>
+        <script nonce="n">
+            if (a < b) { el.innerHTML = "x"; }
+              <!-- not a tag -->
+        </script>
+    </body>
+</html>
+"""
+
+
+def _stream(text: str, sizes) -> str:
+    minifier = HtmlMinifier()
+    out = []
+    pos = 0
+    for size in sizes:
+        out.append(minifier.feed(text[pos:pos + size]))
+        pos += size
+    out.append(minifier.feed(text[pos:]))
+    out.append(minifier.close())
+    return "".join(out)
+
+
+def test_strips_indentation_before_tags():
+    """Indentation and blank lines before tags go, text lines are kept."""
+    html = minify_html(PAGE)
+
+    assert html.startswith("<!DOCTYPE html>\n<html>\n<head>\n        <style>")
+    assert "\n<body>\n<div class=\"a\">\n            text\n<span>x</span>\n</div>" in html
+    assert "\n        <pre>" in html
+    assert "\n        <code>x</code>" in html
+
+
+def test_raw_blocks_and_comments_are_verbatim():
+    """pre, textarea, script, style and comment contents are not touched."""
+    html = minify_html(PAGE)
+
+    assert "<pre>\n    <b>kept</b>\n        </pre>" in html
+    assert "<textarea>\n    <i>kept</i>\n        </textarea>" in html
+    assert "<!--\n            <b>comment</b>\n        -->" in html
+    assert "\n              <!-- not a tag -->\n</script>" in html
+    assert "            body { color: red; }\n</style>" in html
+
+
+def test_matches_legacy_regex_outside_raw_blocks():
+    """Same output as the previous regex where it did not reach into raw blocks."""
+    page = re.sub(r"\n\s+<(b|i)>kept", "kept", PAGE).replace("<b>comment</b>", "comment")
+    page = page.replace("\n              <!-- not a tag -->", "")
+    page = page.replace("\n        </pre>", "</pre>").replace("\n        </textarea>", "</textarea>")
+
+    assert minify_html(page) == LEGACY.sub(r"<\1", page)
+
+
+def test_streaming_matches_whole_document():
+    """Any chunking gives the same output as minifying the whole document."""
+    expected = minify_html(PAGE)
+    rng = random.Random(7)
+
+    for _ in range(200):
+        sizes = [rng.randint(1, 40) for _ in range(rng.randint(1, 30))]
+        assert _stream(PAGE, sizes) == expected
+    assert _stream(PAGE, [1] * len(PAGE)) == expected
+
+
+def test_unterminated_raw_block_is_kept():
+    """A raw block without closing tag is copied to the end."""
+    assert minify_html("<div>\n  <script>\n    <b>x") == "<div>\n  <script>\n    <b>x"
+    assert _stream("<div>\n  <script>\n    <b>x", [5, 9]) == "<div>\n  <script>\n    <b>x"
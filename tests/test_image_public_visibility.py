@@ -109,3 +109,35 @@ def test_public_variant_is_hidden_for_disabled_profile(tmp_path, monkeypatch):
     assert user.set_profile_disabled(created["profileId"], Config.DISABLED[MODERATED], "hidden") is True
 
     assert image_helper.get_public_variant(image_id, "thumb") is None
+
+
+def test_batch_delete_and_move_only_touch_owned_images(tmp_path, monkeypatch):
+    """Batch helpers skip foreign ids and write the rest in one go."""
+    user, image_helper = _bootstrap_helpers(tmp_path, monkeypatch)
+    created, first_id = _create_image_owner(user, image_helper)
+    profile_id = str(created["profileId"])
+    uploaded = image_helper.upload_images(
+        [_UploadFile(_png_bytes()), _UploadFile(_png_bytes())], profile_id, "gallery"
+    )
+    second_id, third_id = (item["imageId"] for item in uploaded)
+
+    moved = image_helper.move_images([first_id, second_id, "missing"], profile_id, "trips")
+    deleted = image_helper.delete_images([third_id, "missing"], profile_id)
+
+    assert sorted(moved) == sorted([first_id, second_id])
+    assert deleted == [third_id]
+    assert image_helper.get_meta(first_id)["albumCode"] == "trips"
+    assert image_helper.get_meta(third_id) is None
+    assert image_helper.delete_images([third_id], profile_id) == []
+    assert image_helper.move_images([first_id], "other-profile", "gallery") == []
+
+
+def test_batch_actions_skip_disabled_images(tmp_path, monkeypatch):
+    """As with the per-image get_meta() check they replace, disabled images are skipped and not counted."""
+    user, image_helper = _bootstrap_helpers(tmp_path, monkeypatch)
+    created, image_id = _create_image_owner(user, image_helper)
+    profile_id = str(created["profileId"])
+    assert image_helper.delete_images([image_id], profile_id) == [image_id]
+
+    assert image_helper.move_images([image_id], profile_id, "trips") == []
+    assert image_helper.delete_images([image_id], profile_id) == []
@@ -0,0 +1,75 @@
+"""Tests for the lazily materialized PreparedRequest."""
+
+import pytest
+
+from app.config import Config
+from core.model import Model
+from core.prepared_request import PreparedRequest
+
+
+@pytest.fixture(name="db_calls")
+def fixture_db_calls(monkeypatch):
+    """Record the (table, query) pairs executed through Model."""
+    calls = []
+    exec_ = Model.exec
+
+    def counting_exec(self, target, query, *args, **kwargs):
+        calls.append((target, query))
+        return exec_(self, target, query, *args, **kwargs)
+
+    monkeypatch.setattr(Model, "exec", counting_exec)
+    return calls
+
+
+def _build(flask_app, path, **kwargs):
+    component_bp = flask_app.blueprints["bp_cmp_7000_info"]
+    return PreparedRequest(flask_app.test_request_context(path, **kwargs).request).build(
+        component_bp=component_bp, full_path=path
+    )
+
+
+def test_anonymous_policy_needs_no_session_user_or_view(flask_app, db_calls):
+    """A public route is allowed without building Session, User, Template or tokens."""
+    with flask_app.test_request_context("/info/"):
+        pr = _build(flask_app, "/info/")
+
+        assert pr.allowed
+        assert not db_calls
+        assert pr._session is None and pr._user is None and pr._view is None  # pylint: disable=protected-access
+        assert "LTOKEN" not in pr._data  # pylint: disable=protected-access
+
+
+def test_first_access_materializes_the_context(flask_app, db_calls):
+    """Reading schema_data or view builds the request context once."""
+    with flask_app.test_request_context("/info/"):
+        pr = _build(flask_app, "/info/")
+        data = pr.schema_data
+
+        assert data["USER"]["auth"] is False
+        assert data["HAS_SESSION_STR"] == "false"
+        assert data["LTOKEN"] and data["CSP_NONCE"]
+        assert pr.view is pr.view
+        assert pr.schema_data["CSP_NONCE"] == data["CSP_NONCE"]
+        assert not db_calls
+
+
+def test_session_cookie_loads_the_user_for_the_policy(flask_app, db_calls):
+    """With a session cookie the policy checks the session, which is then reused."""
+    headers = {"Cookie": f"{Config.SESSION_KEY}=unknown-session"}
+    with flask_app.test_request_context("/info/", headers=headers):
+        pr = _build(flask_app, "/info/", headers=headers)
+
+        assert pr.allowed
+        assert db_calls == [("session", "get")]
+        assert pr.schema_data["HAS_SESSION"] is None
+        assert db_calls == [("session", "get")]
+
+
+def test_rendered_page_sets_the_request_cookies(client):
+    """Handlers that render still get the token and preference cookies."""
+    response = client.get("/")
+
+    assert response.status_code == 200
+    cookies = " ".join(response.headers.getlist("Set-Cookie"))
+    assert Config.UTOKEN_KEY in cookies
+    assert Config.TAB_CHANGES_KEY in cookies
@@ -0,0 +1,74 @@
+"""Tests for light routes (manifest "light_routes")."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from core.prepared_request import LightPreparedRequest, PreparedRequest
+
+
+@pytest.fixture(name="build_calls")
+def fixture_build_calls(monkeypatch):
+    """Record the paths that ran the full PreparedRequest.build."""
+    calls = []
+    build = PreparedRequest.build
+
+    def counting_build(self, *args, **kwargs):
+        calls.append(self.req.path)
+        return build(self, *args, **kwargs)
+
+    monkeypatch.setattr(PreparedRequest, "build", counting_build)
+    return calls
+
+
+def _blueprint(route: str, routes_auth: dict, light_routes: dict):
+    manifest = {
+        "uuid": "light_0yt2sa",
+        "route": route,
+        "security": {"routes_auth": routes_auth, "routes_role": {"/": ["*"]}},
+        "light_routes": light_routes,
+    }
+    return SimpleNamespace(manifest=manifest, component={"name": "cmp_light", "manifest": manifest})
+
+
+def test_static_assets_skip_the_build(client, build_calls):
+    """Component and public static files are served without building the request."""
+    assert client.get("/materialicons/materialdesignicons.min.css").status_code == 200
+    assert client.get("/favicon.ico").status_code == 200
+    assert client.get("/ftoken/ftoken.min.js").status_code == 200
+
+    assert not build_calls
+
+
+def test_handler_use_builds_on_demand(client, build_calls):
+    """A light route whose handler renders a page builds the request once."""
+    response = client.get("/no-such-file.css")
+
+    assert response.status_code == 404
+    assert build_calls == ["/no-such-file.css"]
+
+
+def test_undeclared_routes_are_built(client, build_calls):
+    """Only the declared prefixes are light."""
+    client.get("/info/")
+
+    assert build_calls == ["/info/"]
+
+
+def test_prefix_matching():
+    """light_routes keys are prefixes relative to the manifest route."""
+    bp = _blueprint("/assets", {"/": False}, {"/": False, "/js": True})
+
+    assert LightPreparedRequest.matches(bp, "/assets/js/app.js")
+    assert not LightPreparedRequest.matches(bp, "/assets/page")
+    assert not LightPreparedRequest.matches(SimpleNamespace(manifest={}), "/assets/js/app.js")
+
+
+def test_policies_that_need_a_user_are_not_light(flask_app):
+    """Routes that require auth fall back to the full build, which checks the user."""
+    bp = _blueprint("/assets", {"/": False, "/private": True}, {"/": True})
+
+    with flask_app.test_request_context("/assets/private/app.js") as ctx:
+        assert not LightPreparedRequest(ctx.request, bp, "/assets/private/app.js").allowed
+    with flask_app.test_request_context("/assets/app.js") as ctx:
+        assert LightPreparedRequest(ctx.request, bp, "/assets/app.js").allowed
@@ -0,0 +1,57 @@
+"""Tests for the process-wide SQLAlchemy engine registry."""
+
+# pylint: disable=protected-access
+
+from __future__ import annotations
+
+from core import engine as engine_registry
+from core.model import Model
+
+
+def test_models_share_engine_for_same_database(tmp_path):
+    """Model instances for the same URL/type must borrow one engine."""
+    db_url = f"sqlite:///{tmp_path / 'shared.db'}"
+
+    first = Model(db_url, "sqlite")
+    second = Model(db_url, "sqlite")
+
+    assert first.engine is second.engine
+
+
+def test_different_databases_get_different_engines(tmp_path):
+    """Each database URL keeps its own engine and pool."""
+    first = Model(f"sqlite:///{tmp_path / 'one.db'}", "sqlite")
+    second = Model(f"sqlite:///{tmp_path / 'two.db'}", "sqlite")
+
+    assert first.engine is not second.engine
+
+
+def test_pool_options_applied_to_file_databases(tmp_path, monkeypatch):
+    """Configured pool size is used for pooled (non-memory) databases."""
+    monkeypatch.setattr(engine_registry.Config, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(engine_registry.Config, "DB_MAX_OVERFLOW", 2)
+
+    model = Model(f"sqlite:///{tmp_path / 'pool.db'}", "sqlite")
+
+    assert model.engine.pool.size() == 3
+
+
+def test_memory_sqlite_engine_is_created():
+    """In-memory SQLite must not receive QueuePool-only options."""
+    model = Model("sqlite:///:memory:", "sqlite")
+    result = model.exec("app", "sentence-example")
+
+    assert not model.has_error
+    assert result["rows"][0][0] == 1
+
+
+def test_engines_are_discarded_in_forked_child(tmp_path, monkeypatch):
+    """A pid change (fork) must drop inherited engines and build new ones."""
+    db_url = f"sqlite:///{tmp_path / 'fork.db'}"
+    parent_engine = engine_registry.get_engine(db_url, "sqlite")
+
+    monkeypatch.setattr(engine_registry, "_engines_pid", -1)
+    child_engine = engine_registry.get_engine(db_url, "sqlite")
+
+    assert child_engine is not parent_engine
+    assert engine_registry._engines_pid != -1
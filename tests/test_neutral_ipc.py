@@ -0,0 +1,238 @@
+"""Tests for the Neutral IPC clients (pooled, zero-copy and asyncio)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+import socketserver
+import threading
+from types import SimpleNamespace
+
+import msgpack
+
+from core.template import Template
+from neutral_ipc_template.neutral_ipc_async import AsyncNeutralIpcConnectionPool, AsyncNeutralIpcTemplate
+from neutral_ipc_template.neutral_ipc_template import (
+    NeutralIpcClient,
+    NeutralIpcConnectionPool,
+    NeutralIpcRecord,
+    NeutralIpcTemplate,
+)
+
+
+def _read_exact(sock, length) -> bytes:
+    data = b""
+    while len(data) < length:
+        chunk = sock.recv(length - len(data))
+        if not chunk:
+            return b""
+        data += chunk
+    return data
+
+
+class _EchoHandler(socketserver.BaseRequestHandler):
+    """Fake IPC server: answers every record with its template content.
+
+    When server.keep_alive is False the connection is closed after one record,
+    like a server without persistent connection support.
+    """
+
+    def handle(self):
+        self.server.connections += 1
+        while True:
+            header = _read_exact(self.request, NeutralIpcRecord.HEADER_LEN)
+            if not header:
+                return
+            decoded = NeutralIpcRecord.decode_header(header)
+            _read_exact(self.request, decoded["length-1"])
+            content2 = _read_exact(self.request, decoded["length-2"]) if decoded["length-2"] else b""
+            self.request.sendall(
+                NeutralIpcRecord.encode_record(
+                    NeutralIpcRecord.CTRL_STATUS_OK,
+                    NeutralIpcRecord.CONTENT_JSON,
+                    json.dumps({"status_code": "200"}),
+                    NeutralIpcRecord.CONTENT_TEXT,
+                    content2.decode("utf-8"),
+                )
+            )
+            if not self.server.keep_alive:
+                return
+
+
+def _start_server(server_class, address, keep_alive=True):
+    server = server_class(address, _EchoHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.keep_alive = keep_alive
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _render(pool, text) -> str:
+    client = NeutralIpcClient(
+        NeutralIpcRecord.CTRL_PARSE_TEMPLATE,
+        NeutralIpcRecord.CONTENT_JSON,
+        "{}",
+        NeutralIpcRecord.CONTENT_TEXT,
+        text,
+        pool=pool,
+    )
+    return client.start()["content-2"]
+
+
+def test_pool_reuses_tcp_connection():
+    """Consecutive records share one TCP connection."""
+    server = _start_server(socketserver.ThreadingTCPServer, ("127.0.0.1", 0))
+    pool = NeutralIpcConnectionPool("127.0.0.1", server.server_address[1], 5)
+    try:
+        assert [_render(pool, f"page {index}") for index in range(3)] == ["page 0", "page 1", "page 2"]
+        assert server.connections == 1
+    finally:
+        pool.clear()
+        server.shutdown()
+        server.server_close()
+
+
+def test_pool_reconnects_when_server_closes():
+    """A pooled socket closed by the server is replaced transparently."""
+    server = _start_server(socketserver.ThreadingTCPServer, ("127.0.0.1", 0), keep_alive=False)
+    pool = NeutralIpcConnectionPool("127.0.0.1", server.server_address[1], 5)
+    try:
+        assert _render(pool, "one") == "one"
+        assert _render(pool, "two") == "two"
+        assert server.connections == 2
+    finally:
+        pool.clear()
+        server.shutdown()
+        server.server_close()
+
+
+def test_pool_drops_idle_connections_and_supports_unix_sockets(tmp_path):
+    """Unix domain sockets are used when configured; expired idle sockets are closed."""
+    path = str(tmp_path / "ipc.sock")
+    server = _start_server(socketserver.ThreadingUnixStreamServer, path)
+    pool = NeutralIpcConnectionPool("", 0, 5, unix_socket=path, idle_timeout=0)
+    try:
+        assert _render(pool, "a") == "a"
+        conn, reused = pool.acquire()
+        assert reused is False
+        assert conn.family == socket.AF_UNIX
+        pool.discard(conn)
+    finally:
+        pool.clear()
+        server.shutdown()
+        server.server_close()
+
+
+def test_large_records_round_trip_without_joining():
+    """Large payloads survive partial sendmsg/recv_into calls."""
+    server = _start_server(socketserver.ThreadingTCPServer, ("127.0.0.1", 0))
+    pool = NeutralIpcConnectionPool("127.0.0.1", server.server_address[1], 5)
+    page = "ñ" * 400_000
+    try:
+        assert _render(pool, page) == page
+        header, content1, content2 = NeutralIpcRecord.encode_parts(
+            NeutralIpcRecord.CTRL_PARSE_TEMPLATE, NeutralIpcRecord.CONTENT_MSGPACK, b"\x80", NeutralIpcRecord.CONTENT_TEXT, "x"
+        )
+        assert header + content1 + content2 == NeutralIpcRecord.encode_record(
+            NeutralIpcRecord.CTRL_PARSE_TEMPLATE, NeutralIpcRecord.CONTENT_MSGPACK, b"\x80", NeutralIpcRecord.CONTENT_TEXT, "x"
+        )
+    finally:
+        pool.clear()
+        server.shutdown()
+        server.server_close()
+
+
+def test_async_client_reuses_streams():
+    """The asyncio client keeps one pooled stream per loop and reconnects when it is closed."""
+    server = _start_server(socketserver.ThreadingTCPServer, ("127.0.0.1", 0))
+    closing_server = _start_server(socketserver.ThreadingTCPServer, ("127.0.0.1", 0), keep_alive=False)
+    pool = AsyncNeutralIpcConnectionPool("127.0.0.1", server.server_address[1], 5)
+    closing_pool = AsyncNeutralIpcConnectionPool("127.0.0.1", closing_server.server_address[1], 5)
+
+    async def render(target_pool, text):
+        template = AsyncNeutralIpcTemplate(text, "{}", tpl_type=NeutralIpcRecord.CONTENT_TEXT, pool=target_pool)
+        return await template.render()
+
+    async def scenario():
+        pages = await asyncio.gather(*(render(pool, f"page {index}") for index in range(3)))
+        pages.append(await render(pool, "again"))
+        pages.append(await render(closing_pool, "one"))
+        pages.append(await render(closing_pool, "two"))
+        pool.clear()
+        closing_pool.clear()
+        return pages
+
+    try:
+        assert asyncio.run(scenario()) == ["page 0", "page 1", "page 2", "again", "one", "two"]
+        assert server.connections == 3
+        assert closing_server.connections == 2
+    finally:
+        for target in (server, closing_server):
+            target.shutdown()
+            target.server_close()
+
+
+def test_async_pool_evicts_streams_of_closed_loops():
+    """Each asyncio.run() (like async_to_sync per request) leaves a stream on a dead loop.
+
+    Those are evicted and their sockets closed, so the pool keeps only streams
+    it can hand out and does not leak descriptors.
+    """
+    server = _start_server(socketserver.ThreadingTCPServer, ("127.0.0.1", 0))
+    pool = AsyncNeutralIpcConnectionPool("127.0.0.1", server.server_address[1], 5, pool_size=3)
+
+    async def render(text):
+        template = AsyncNeutralIpcTemplate(text, "{}", tpl_type=NeutralIpcRecord.CONTENT_TEXT, pool=pool)
+        return await template.render()
+
+    released = []
+    try:
+        for index in range(6):
+            assert asyncio.run(render(f"page {index}")) == f"page {index}"
+            assert len(pool._idle) == 1  # pylint: disable=protected-access
+            released.append(pool._idle[0][2])  # pylint: disable=protected-access
+
+        assert server.connections == 6
+        assert all(writer.get_extra_info("socket").fileno() == -1 for writer in released[:-1])
+
+        pool.clear()
+        assert released[-1].get_extra_info("socket").fileno() == -1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_template_render_async_matches_render(flask_app, tmp_path):
+    """Template.render_async builds the same response as render(), also as a Flask async view."""
+    layout = tmp_path / "layout.ntpl"
+    layout.write_text("Hello {:;name:}", encoding="utf-8")
+
+    def make_template():
+        schema = SimpleNamespace(properties={"data": {"TEMPLATE_LAYOUT": str(layout), "name": "World"}})
+        return Template(schema)
+
+    with flask_app.test_request_context("/"):
+        sync_response = make_template().render()
+        async_response = asyncio.run(make_template().render_async())
+        view_response = flask_app.ensure_sync(make_template().render_async)()
+
+    assert async_response.status_code == sync_response.status_code == 200
+    assert async_response.get_data(as_text=True) == sync_response.get_data(as_text=True) == "Hello World"
+    assert view_response.get_data(as_text=True) == "Hello World"
+
+
+def test_ipc_template_encodes_schema_once_with_msgpack():
+    """schema_obj is packed with msgpack (as Template and MailTemplate pass it) and merges keep the format."""
+    template = NeutralIpcTemplate("layout.ntpl", schema_obj={"data": {"a": 1}})
+
+    assert template.schema_type == NeutralIpcRecord.CONTENT_MSGPACK
+    assert msgpack.unpackb(template.schema, raw=False) == {"data": {"a": 1}}
+
+    template.merge_schema({"data": {"b": 2}})
+    assert msgpack.unpackb(template.schema, raw=False) == {"data": {"a": 1, "b": 2}}
+
+    json_template = NeutralIpcTemplate("layout.ntpl", {"data": {"a": 1}})
+    json_template.merge_schema('{"data": {"b": 2}}')
+    assert json.loads(json_template.schema) == {"data": {"a": 1, "b": 2}}
@@ -0,0 +1,86 @@
+"""Tests for the anonymous page cache."""
+
+import re
+
+import pytest
+
+from core.page_cache import page_cache
+from core.prepared_request import PreparedRequest
+
+
+@pytest.fixture(name="build_calls")
+def fixture_build_calls(monkeypatch):
+    """Count PreparedRequest.build calls, i.e. requests not served from the cache."""
+    page_cache.clear()
+    calls = []
+    build = PreparedRequest.build
+
+    def counting_build(self, *args, **kwargs):
+        calls.append(self.req.path)
+        return build(self, *args, **kwargs)
+
+    monkeypatch.setattr(PreparedRequest, "build", counting_build)
+    yield calls
+    page_cache.clear()
+
+
+def _nonce(response) -> str:
+    return re.search(r"'nonce-([^']+)'", response.headers["Content-Security-Policy"]).group(1)
+
+
+def _warm(client, path):
+    """First request sets the negotiated cookies; the second one fills the cache."""
+    client.get(path)
+    return client.get(path)
+
+
+def test_anonymous_page_is_served_from_cache(client, build_calls):
+    """Repeated anonymous requests skip the request build and the render."""
+    stored = _warm(client, "/")
+    calls = len(build_calls)
+    hit = client.get("/")
+
+    assert hit.status_code == 200
+    assert len(build_calls) == calls
+    assert hit.headers["Content-Type"] == stored.headers["Content-Type"]
+    assert hit.get_data().replace(_nonce(hit).encode(), b"") == stored.get_data().replace(
+        _nonce(stored).encode(), b""
+    )
+
+
+def test_per_request_values_are_substituted(client, build_calls):
+    """Every response carries its own nonce and tokens, never the placeholders."""
+    stored = _warm(client, "/")
+    hit = client.get("/")
+
+    for response in (stored, hit):
+        body = response.get_data(as_text=True)
+        assert f'nonce="{_nonce(response)}"' in body
+        for placeholder in (page_cache.nonce, page_cache.ltoken, page_cache.utoken):
+            assert placeholder not in body
+    assert _nonce(hit) != _nonce(stored)
+    assert build_calls
+
+    cookies = hit.headers.getlist("Set-Cookie")
+    assert any(cookie.startswith("USER_SECURITY=") for cookie in cookies)
+    assert any(cookie.startswith("tabstatus=") for cookie in cookies)
+    assert any(cookie.startswith("lang=") for cookie in cookies)
+
+
+def test_session_requests_bypass_the_cache(client, build_calls):
+    """Requests with a session cookie are always built and rendered."""
+    _warm(client, "/")
+    client.set_cookie("SESSION", "not-a-session")
+    calls = len(build_calls)
+    client.get("/")
+
+    assert len(build_calls) == calls + 1
+
+
+def test_routes_without_opt_in_are_not_cached(client, build_calls):
+    """Only routes with "page_cache" in their manifest are cached."""
+    _warm(client, "/sign/in")
+    calls = len(build_calls)
+    client.get("/sign/in")
+
+    assert len(build_calls) == calls + 1
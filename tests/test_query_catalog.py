@@ -0,0 +1,192 @@
+"""Tests for the compiled model query catalog."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+
+from app import create_app
+from app.config import Config
+from core.model import Model
+from core.query_catalog import QueryCatalog, query_catalog
+
+
+def _write_model(model_dir, name, content) -> str:
+    path = model_dir / f"{name}.json"
+    path.write_text(json.dumps(content), encoding="utf-8")
+    return str(path)
+
+
+def test_catalog_resolves_dialect_alias_once(tmp_path):
+    """Dialect aliases resolve to the referenced SQL and are memoized."""
+    _write_model(tmp_path, "demo", {
+        "one": {"@portable": "SELECT 1", "@mysql": "SELECT 2", "@mariadb": "@mysql"},
+    })
+    catalog = QueryCatalog(str(tmp_path))
+
+    mariadb = catalog.get("demo", "one", "mariadb")
+    sqlite = catalog.get("demo", "one", "sqlite")
+
+    assert mariadb.statements[0].sql == "SELECT 2"
+    assert sqlite.statements[0].sql == "SELECT 1"
+    assert sqlite.statements[0].operation == "SELECT"
+    assert catalog.get("demo", "one", "sqlite") is sqlite
+
+
+def test_catalog_does_not_reread_files(tmp_path):
+    """Once loaded, queries are served without touching the file."""
+    path = _write_model(tmp_path, "demo", {"one": {"@portable": "SELECT 1"}})
+    catalog = QueryCatalog(str(tmp_path))
+    catalog.get("demo", "one", "sqlite")
+
+    os.remove(path)
+
+    assert catalog.get("demo", "one", "sqlite").statements[0].sql == "SELECT 1"
+
+
+def test_catalog_reloads_changed_file_when_enabled(tmp_path):
+    """Debug reload picks up edits based on file mtime."""
+    path = _write_model(tmp_path, "demo", {"one": {"@portable": "SELECT 1"}})
+    catalog = QueryCatalog(str(tmp_path))
+    catalog.reload_on_change = True
+    catalog.get("demo", "one", "sqlite")
+
+    _write_model(tmp_path, "demo", {"one": {"@portable": "SELECT 3"}})
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    assert catalog.get("demo", "one", "sqlite").statements[0].sql == "SELECT 3"
+
+
+def test_preload_reports_invalid_definitions(tmp_path):
+    """Preload validates every key for the requested db types."""
+    _write_model(tmp_path, "demo", {
+        "ok": {"@portable": ["SELECT 1", "SELECT 2"]},
+        "bad": {"@portable": 5},
+        "mysql-only": {"@mysql": "SELECT 1"},
+    })
+    catalog = QueryCatalog(str(tmp_path))
+
+    problems = catalog.preload(db_types={"sqlite"})
+
+    assert catalog.get("demo", "ok", "sqlite").is_transaction is True
+    assert len(problems) == 2
+
+
+def test_create_app_logs_catalog_problems_outside_debug(monkeypatch, caplog):
+    """Invalid model definitions are logged as warnings, not only printed in debug."""
+
+    class _CatalogConfig(Config):
+        TESTING = True
+        SECRET_KEY = "test_secret_key"
+        DB_PWA = "sqlite:///:memory:"
+        DB_SAFE = "sqlite:///:memory:"
+        DB_IMAGE = "sqlite:///:memory:"
+        MAIL_METHOD = "dummy"
+
+    monkeypatch.setattr(query_catalog, "preload", lambda *_args, **_kwargs: ["demo.json bad: invalid SQL"])
+
+    with caplog.at_level(logging.WARNING, logger="app"):
+        create_app(_CatalogConfig, debug=False)
+
+    assert ("app", logging.WARNING, "model demo.json bad: invalid SQL") in caplog.record_tuples
+
+
+def test_model_exec_uses_model_dir_override(tmp_path):
+    """Component model_dir overrides are compiled and executed like core models."""
+    _write_model(tmp_path, "component_queries", {"get-value": {"@portable": "SELECT :value"}})
+    model = Model("sqlite:///:memory:", "sqlite")
+
+    result = model.exec("component_queries", "get-value", {"value": 7}, model_dir=str(tmp_path))
+
+    assert not model.has_error
+    assert result["rows"][0][0] == 7
+
+
+def test_model_exec_error_codes(tmp_path):
+    """Missing files, missing keys and invalid content keep their error codes."""
+    _write_model(tmp_path, "demo", {"bad": {"@portable": {"sql": "SELECT 1"}}})
+    model = Model("sqlite:///:memory:", "sqlite")
+
+    assert model.exec("missing", "any", model_dir=str(tmp_path)) is None
+    assert model.error_code == "FILE_ACCESS_ERROR"
+
+    assert model.exec("demo", "missing", model_dir=str(tmp_path)) is None
+    assert model.error_code == "OPERATION_NOT_FOUND"
+
+    assert model.exec("demo", "bad", model_dir=str(tmp_path)) is None
+    assert model.error_code == "INVALID_CONFIG"
+
+
+def test_in_parameter_expands_list(tmp_path):
+    """"IN :name" parameters accept a list of values."""
+    _write_model(tmp_path, "demo", {
+        "pick": {"@portable": "SELECT value FROM (SELECT 1 AS value UNION SELECT 2 UNION SELECT 3) WHERE value IN :values ORDER BY value"},
+    })
+    model = Model("sqlite:///:memory:", "sqlite")
+
+    result = model.exec("demo", "pick", {"values": [1, 3]}, model_dir=str(tmp_path))
+
+    assert not model.has_error
+    assert [row[0] for row in result["rows"]] == [1, 3]
+
+
+def test_exec_iter_streams_rows_in_chunks(tmp_path):
+    """exec_iter yields every row (or dict) of a SELECT without fetchall."""
+    _write_model(tmp_path, "demo", {
+        "numbers": {"@portable": "SELECT value FROM (WITH RECURSIVE n(value) AS (SELECT 1 UNION ALL SELECT value + 1 FROM n WHERE value < :total) SELECT value FROM n)"},
+        "write": {"@portable": "UPDATE missing SET value = 1"},
+    })
+    model = Model("sqlite:///:memory:", "sqlite")
+
+    rows = list(model.exec_iter("demo", "numbers", {"total": 25}, model_dir=str(tmp_path), chunk_size=4))
+    dicts = model.exec_iter("demo", "numbers", {"total": 3}, model_dir=str(tmp_path), as_dict=True)
+
+    assert [row[0] for row in rows] == list(range(1, 26))
+    assert list(dicts) == [{"value": 1}, {"value": 2}, {"value": 3}]
+    assert not model.has_error
+
+    assert not list(model.exec_iter("demo", "write", model_dir=str(tmp_path)))
+    assert model.error_code == "INVALID_OPERATION"
+
+
+def test_exec_many_runs_one_statement_for_many_rows(tmp_path):
+    """exec_many commits all parameter sets together, or reports rows one by one."""
+    _write_model(tmp_path, "demo", {
+        "setup": {"@portable": "CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT)"},
+        "insert": {"@portable": "INSERT INTO item (id, name) VALUES (:id, :name)"},
+        "rename": {"@portable": "UPDATE item SET name = :name WHERE id = :id"},
+        "count": {"@portable": "SELECT COUNT(*) FROM item"},
+    })
+    model = Model(f"sqlite:///{tmp_path / 'bulk.db'}", "sqlite")
+    model.exec("demo", "setup", model_dir=str(tmp_path))
+
+    result = model.exec_many("demo", "insert", [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}], model_dir=str(tmp_path))
+    assert result["success"] is True
+    assert result["rowcount"] == 2
+    assert result["results"] is None
+
+    # A duplicate rolls back the whole executemany batch
+    assert model.exec_many("demo", "insert", [{"id": 3, "name": "c"}, {"id": 1, "name": "dup"}], model_dir=str(tmp_path)) is None
+    assert model.error_code == "TRANSACTION_ERROR"
+    assert model.exec("demo", "count", model_dir=str(tmp_path))["rows"][0][0] == 2
+
+    # per_row keeps the good rows and reports the failing one
+    result = model.exec_many(
+        "demo", "insert", [{"id": 3, "name": "c"}, {"id": 1, "name": "dup"}], model_dir=str(tmp_path), per_row=True
+    )
+    assert result["success"] is False
+    assert [item["success"] for item in result["results"]] == [True, False]
+    assert result["results"][1]["error"]
+    assert model.exec("demo", "count", model_dir=str(tmp_path))["rows"][0][0] == 3
+
+    # per_row reports rows that matched nothing as not successful
+    result = model.exec_many(
+        "demo", "rename", [{"id": 1, "name": "x"}, {"id": 99, "name": "y"}], model_dir=str(tmp_path), per_row=True
+    )
+    assert [(item["success"], item["rowcount"]) for item in result["results"]] == [(True, 1), (False, 0)]
+    assert result["rowcount"] == 1
+
+    assert model.exec_many("demo", "count", [{}], model_dir=str(tmp_path)) is None
+    assert model.error_code == "INVALID_OPERATION"
@@ -0,0 +1,82 @@
+"""Tests for the compiled manifest route policies."""
+
+from core.route_policy import RoutePolicy, normalize_route_path, route_policy
+
+MANIFEST = {
+    "route": "/admin",
+    "security": {
+        "routes_auth": {"/": True, "/public": False, "/public/": True, "/bad": "yes"},
+        "routes_role": {"/": ["Admin ", " moderator", ""], "/public": ["*"]},
+    },
+    "light_routes": {"/static": True},
+    "page_cache": {"/public": 300, "/public/news": 0},
+}
+
+
+def _lookup(path):
+    return RoutePolicy(MANIFEST).lookup(normalize_route_path(path))
+
+
+def test_most_specific_prefix_wins_per_map():
+    """Each map resolves its own longest prefix, on segment boundaries."""
+    rules = _lookup("/admin/public/news/")
+
+    assert rules.require_auth is False
+    assert rules.roles == {"*"}
+    assert rules.page_cache == 0
+    assert rules.light is None
+
+    assert _lookup("/admin/publicity").require_auth is True
+    assert _lookup("/admin/static/app.js").light is True
+    assert _lookup("/other").require_auth is None
+
+
+def test_values_are_normalized_at_compile_time():
+    """Roles become lowercase frozensets and invalid values are skipped."""
+    assert _lookup("/admin").roles == frozenset({"admin", "moderator"})
+    assert _lookup("/admin/bad").require_auth is True
+
+
+def test_relative_keys_without_component_route():
+    """Keys of a component mounted at the root are used as they are."""
+    policy = RoutePolicy({"route": "", "light_routes": {"/": True, "x": False}})
+
+    assert policy.lookup("/").light is True
+    assert policy.lookup("/x/y").light is False
+
+
+def test_route_policy_is_compiled_once_per_blueprint(flask_app):
+    """Components compiles registered blueprints; others compile on first use."""
+    blueprint = flask_app.blueprints["bp_cmp_7040_admin"]
+
+    assert isinstance(blueprint.route_policy, RoutePolicy)
+    assert route_policy(blueprint) is blueprint.route_policy
+    assert route_policy(object()) is None
+
+
+def test_compiled_policies_match_the_prefix_scan(flask_app):
+    """The trie resolves the real manifests like a scan of every prefix."""
+    for blueprint in flask_app.blueprints.values():
+        manifest = getattr(blueprint, "manifest", None)
+        if not isinstance(manifest, dict):
+            continue
+        security = manifest["security"]
+        keys = [*security["routes_auth"], *security["routes_role"]]
+        paths = {"/", "/missing", *(manifest["route"] + key for key in keys)}
+        paths |= {path.rstrip("/") + "/sub/page" for path in paths}
+
+        for path in map(normalize_route_path, paths):
+            rules = blueprint.route_policy.lookup(path)
+            roles = _scan(path, security["routes_role"], list, manifest["route"])
+            assert rules.require_auth == _scan(path, security["routes_auth"], bool, manifest["route"])
+            assert rules.roles == (None if roles is None else {role.strip().lower() for role in roles})
+
+
+def _scan(path, policy_map, expected_type, component_route):
+    best, best_value = None, None
+    for prefix, value in policy_map.items():
+        prefix = normalize_route_path(component_route + prefix if component_route else prefix)
+        matches = prefix == "/" or path == prefix or path.startswith(prefix + "/")
+        if matches and isinstance(value, expected_type) and (best is None or len(prefix) > len(best)):
+            best, best_value = prefix, value
+    return best_value
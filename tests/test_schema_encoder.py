@@ -0,0 +1,72 @@
+"""Tests for incremental schema encoding."""
+
+from __future__ import annotations
+
+import copy
+
+import msgpack
+
+from core.schema_encoder import SchemaEncoder
+
+
+def _base() -> dict:
+    return {
+        "config": {"site": {"name": "Neutral", "theme": "default"}, "debug": False},
+        "data": {
+            "CONTEXT": {"ROUTE": "", "SESSION": None},
+            "current": {"site": {"name": "Neutral"}, "locale": ["en", "es"]},
+        },
+        "inherit": {"locale": {"current": "en", "trans": {"en": {"Hello": "Hello"}}}},
+    }
+
+
+def _decode(encoded: bytes) -> dict:
+    return msgpack.unpackb(encoded, raw=False)
+
+
+def test_encode_matches_plain_msgpack_for_unchanged_base():
+    """An untouched copy of the base encodes to the same bytes as msgpack.packb."""
+    base = _base()
+    encoder = SchemaEncoder(base)
+    properties = copy.deepcopy(base)
+
+    assert encoder.encode(properties) == msgpack.packb(base, use_bin_type=True)
+    assert encoder.encode(base) == msgpack.packb(base, use_bin_type=True)
+    assert encoder.base_size == len(msgpack.packb(base, use_bin_type=True))
+
+
+def test_encode_changed_added_and_removed_keys():
+    """Changes at any depth are encoded; the result decodes to the request schema."""
+    encoder = SchemaEncoder(_base())
+    properties = copy.deepcopy(_base())
+    properties["data"]["CONTEXT"]["ROUTE"] = "home"
+    properties["data"]["CONTEXT"]["SESSION"] = {"id": "abc", "values": list(range(20))}
+    properties["data"]["USER"] = {"alias": "user"}
+    del properties["config"]["debug"]
+    properties["inherit"]["locale"]["trans"]["es"] = {"Hello": "Hola"}
+    properties["data"]["current"]["locale"] = ["es"]
+
+    assert _decode(encoder.encode(properties)) == properties
+
+
+def test_encode_large_maps():
+    """Maps longer than a fixmap get the right msgpack header."""
+    base = {"data": {f"key{index}": index for index in range(20)}}
+    encoder = SchemaEncoder(base)
+    properties = copy.deepcopy(base)
+    properties["data"].update({f"extra{index}": index for index in range(70000)})
+
+    assert _decode(encoder.encode(properties)) == properties
+
+
+def test_shared_base_branches_reuse_encoded_bytes():
+    """A branch shared with the base is emitted from the cache, not packed again."""
+    base = _base()
+    encoder = SchemaEncoder(base, depth=1)
+    properties = dict(base)
+    properties["data"] = {"CONTEXT": {"ROUTE": "home"}}
+
+    encoded = encoder.encode(properties)
+
+    assert _decode(encoded) == properties
+    assert msgpack.packb(base["inherit"], use_bin_type=True) in encoded
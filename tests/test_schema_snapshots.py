@@ -0,0 +1,37 @@
+"""Tests for the per-component schema snapshots."""
+
+import orjson
+
+from utils.utils import merge_shared
+
+
+def test_merge_shared_copies_only_the_merged_path():
+    """The base is untouched and branches outside the overlay are shared."""
+    base = {"data": {"forms": {"a": 1}, "menu": {"x": 1}}, "inherit": {"locale": {}}}
+    merged = merge_shared(base, {"data": {"forms": {"b": 2}}})
+
+    assert merged == {"data": {"forms": {"a": 1, "b": 2}, "menu": {"x": 1}}, "inherit": {"locale": {}}}
+    assert base["data"]["forms"] == {"a": 1}
+    assert merged["inherit"] is base["inherit"]
+    assert merged["data"]["menu"] is base["data"]["menu"]
+
+
+def test_snapshots_include_blueprint_schema(flask_app):
+    """Components with route/schema.json get base + blueprint schema snapshots."""
+    snapshots = flask_app.schema_snapshots
+    sign_uuid = flask_app.components.schema["data"]["COMPONENTS_MAP_BY_NAME"]["cmp_5100_sign"]
+
+    assert "sign_in_form" in snapshots[sign_uuid]["data"]["current_forms"]
+    assert "sign_in_form" not in flask_app.schema_base["data"].get("current_forms", {})
+    assert snapshots[sign_uuid]["inherit"] is flask_app.schema_base["inherit"]
+
+
+def test_requests_do_not_modify_snapshots(flask_app, client):
+    """Serving component routes leaves the base and every snapshot unchanged."""
+    before = orjson.dumps(flask_app.schema_snapshots)
+
+    assert client.get("/sign/in").status_code == 200
+    assert client.get("/").status_code == 200
+
+    assert orjson.dumps(flask_app.schema_snapshots) == before
+    assert flask_app.schema_base == orjson.loads(flask_app.schema_json)
@@ -0,0 +1,123 @@
+"""Tests for versioned schema state and the in-process ready flags."""
+
+# pylint: disable=duplicate-code
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+from app.bootstrap_db import (
+    APP_SCHEMA_VERSION,
+    IMAGE_SCHEMA_VERSION,
+    SESSION_SCHEMA_VERSION,
+    USER_SCHEMA_VERSION,
+    bootstrap_databases,
+)
+from core import schema_state
+from core.engine import dispose_engines
+from core.model import Model
+from core.user import RBAC_SCHEMA_VERSION, User
+
+
+def _bootstrap_kwargs(tmp_path) -> dict:
+    return {
+        "db_pwa_url": f"sqlite:///{tmp_path / 'pwa.db'}",
+        "db_pwa_type": "sqlite",
+        "db_safe_url": f"sqlite:///{tmp_path / 'safe.db'}",
+        "db_safe_type": "sqlite",
+        "db_image_url": f"sqlite:///{tmp_path / 'image.db'}",
+        "db_image_type": "sqlite",
+    }
+
+
+def _versions(db_path) -> dict:
+    with sqlite3.connect(str(db_path)) as conn:
+        return dict(conn.execute("SELECT scope, version FROM schema_state").fetchall())
+
+
+def test_bootstrap_records_schema_versions(tmp_path):
+    """Every bootstrapped scope stores its version in its database."""
+    bootstrap_databases(**_bootstrap_kwargs(tmp_path))
+
+    assert _versions(tmp_path / "pwa.db") == {
+        "app": APP_SCHEMA_VERSION,
+        "user": USER_SCHEMA_VERSION,
+        "rbac": RBAC_SCHEMA_VERSION,
+    }
+    assert _versions(tmp_path / "safe.db") == {"session": SESSION_SCHEMA_VERSION}
+    assert _versions(tmp_path / "image.db") == {"image": IMAGE_SCHEMA_VERSION}
+
+
+def test_bootstrap_skips_current_scopes(tmp_path):
+    """A scope already at its version is not migrated again."""
+    kwargs = _bootstrap_kwargs(tmp_path)
+    bootstrap_databases(**kwargs)
+    schema_state.reset_schema_ready()
+
+    with sqlite3.connect(str(tmp_path / "image.db")) as conn:
+        conn.execute("DROP TABLE image")
+
+    bootstrap_databases(**kwargs)
+
+    with sqlite3.connect(str(tmp_path / "image.db")) as conn:
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    assert "image" not in tables
+
+
+def test_user_skips_ddl_when_schema_ready(tmp_path, monkeypatch):
+    """After bootstrap, building a User issues no queries at all."""
+    kwargs = _bootstrap_kwargs(tmp_path)
+    bootstrap_databases(**kwargs)
+    calls = []
+    original_exec = Model.exec
+
+    def counting_exec(self, *args, **kwargs):
+        calls.append(args[:2])
+        return original_exec(self, *args, **kwargs)
+
+    monkeypatch.setattr(Model, "exec", counting_exec)
+    User(kwargs["db_pwa_url"], "sqlite")
+    User(kwargs["db_pwa_url"], "sqlite")
+
+    assert not calls
+
+
+def test_user_migrates_rbac_once_without_bootstrap(tmp_path):
+    """A database that was never bootstrapped gets the RBAC tables on first use."""
+    db_path = tmp_path / "legacy.db"
+    db_url = f"sqlite:///{db_path}"
+
+    User(db_url, "sqlite")
+
+    assert schema_state.is_schema_ready(db_url, "rbac")
+    assert _versions(db_path) == {"rbac": RBAC_SCHEMA_VERSION}
+    with sqlite3.connect(str(db_path)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM profile_role").fetchone()[0] == 0
+
+
+def test_memory_sqlite_is_ready_per_thread_and_engine(monkeypatch):
+    """In-memory databases are marked for the thread and engine that hold them."""
+    db_url = "sqlite:///:memory:"
+    User(db_url, "sqlite")
+    calls = []
+    original_exec = Model.exec
+
+    def counting_exec(self, *args, **kwargs):
+        calls.append(args[:2])
+        return original_exec(self, *args, **kwargs)
+
+    monkeypatch.setattr(Model, "exec", counting_exec)
+    User(db_url, "sqlite")
+
+    assert not calls
+    assert schema_state.is_schema_ready(db_url, "rbac")
+
+    other_thread = []
+    thread = threading.Thread(target=lambda: other_thread.append(schema_state.is_schema_ready(db_url, "rbac")))
+    thread.start()
+    thread.join()
+    assert other_thread == [False]
+
+    dispose_engines()
+    assert not schema_state.is_schema_ready(db_url, "rbac")
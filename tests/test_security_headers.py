@@ -0,0 +1,51 @@
+"""Tests for the compiled security headers."""
+
+import re
+
+from werkzeug.wrappers import Response
+
+from app.security_headers import SecurityHeaders
+
+CONFIG = {
+    "CSP_ALLOWED_SCRIPT": ["https://cdn.example", ""],
+    "CSP_ALLOWED_STYLE": [""],
+    "REFERRER_POLICY": "no-referrer",
+}
+
+
+def test_nonce_is_spliced_into_script_and_style():
+    """The same compiled policy gets each response's nonce."""
+    headers = SecurityHeaders(CONFIG)
+
+    csp = headers.csp("n0nce")
+    assert "script-src 'self' 'nonce-n0nce' https://cdn.example;" in csp
+    assert "style-src 'self' 'nonce-n0nce' ;" in csp
+    assert headers.csp("other").count("'nonce-other'") == 2
+    assert "nonce" not in headers.csp(None)
+
+
+def test_unsafe_inline_disables_the_nonce():
+    """A nonce would make browsers ignore 'unsafe-inline'."""
+    headers = SecurityHeaders({**CONFIG, "CSP_ALLOWED_STYLE_UNSAFE_INLINE": True})
+
+    assert "nonce" not in headers.csp("n0nce")
+    assert "style-src 'self' 'unsafe-inline' ;" in headers.csp("n0nce")
+
+
+def test_apply_replaces_existing_headers():
+    """Headers set by a handler are replaced, not duplicated."""
+    response = Response("x", headers={"Referrer-Policy": "unsafe-url"})
+
+    SecurityHeaders(CONFIG).apply(response, None)
+
+    assert response.headers.getlist("Referrer-Policy") == ["no-referrer"]
+    assert "Permissions-Policy" not in response.headers
+
+
+def test_responses_carry_the_request_nonce(client):
+    """The CSP nonce matches the one rendered into the page."""
+    response = client.get("/")
+    nonce = re.search(r"'nonce-([^']+)'", response.headers["Content-Security-Policy"]).group(1)
+
+    assert f'nonce="{nonce}"'.encode() in response.get_data()
+    assert response.headers["X-Frame-Options"] == "DENY"
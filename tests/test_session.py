@@ -0,0 +1,124 @@
+"""Tests for the memoized session load."""
+
+from __future__ import annotations
+
+from app.config import Config
+from constants import SECONDS_MINUTE
+from core.model import Model
+from core.schema_state import run_operation
+from core import session as session_module
+from core.session import Session
+from core.session_touch import SessionTouchQueue
+
+
+def _session_db(tmp_path, modified_ago=0) -> tuple[str, str]:
+    db_url = f"sqlite:///{tmp_path / 'safe.db'}"
+    model = Model(db_url, "sqlite")
+    run_operation(model, "session", "setup-base")
+    session = Session(None, db_url, "sqlite")
+    modified = session.now - modified_ago
+    run_operation(model, "session", "create", {
+        "sessionId": "token-1",
+        "userId": "user-1",
+        "open": Config.SESSION_OPEN['true'],
+        "ua": "pytest",
+        "properties": '{"theme": "dark"}',
+        "modified": modified,
+        "created": modified,
+        "expire": session.now + 3600,
+    })
+    return db_url, "token-1"
+
+
+def _count_exec(monkeypatch) -> list:
+    calls = []
+    original_exec = Model.exec
+
+    def counting_exec(self, *args, **kwargs):
+        calls.append(args[1])
+        return original_exec(self, *args, **kwargs)
+
+    monkeypatch.setattr(Model, "exec", counting_exec)
+    return calls
+
+
+def test_cookie_and_properties_share_one_select(tmp_path, monkeypatch):
+    """get() and get_session_properties() read the session row only once."""
+    db_url, token = _session_db(tmp_path)
+    calls = _count_exec(monkeypatch)
+    session = Session(token, db_url, "sqlite")
+
+    session_id, cookie = session.get()
+
+    assert session_id == token
+    assert cookie[Config.SESSION_KEY]["value"] == token
+    assert session.get_session_properties() == {"theme": "dark"}
+    assert session.expire == session.now + 3600
+    assert calls == ["get"]
+
+
+def test_sliding_expiry_update_runs_once(tmp_path, monkeypatch):
+    """Without the touch queue a stale session gets a single UPDATE per instance."""
+    db_url, token = _session_db(tmp_path, modified_ago=SECONDS_MINUTE * 20)
+    monkeypatch.setattr(session_module, "session_touch_queue", SessionTouchQueue(60, 100, 0))
+    calls = _count_exec(monkeypatch)
+    session = Session(token, db_url, "sqlite")
+
+    session.get()
+    session.get()
+
+    assert calls == ["get", "update"]
+    assert session.expire == session.now + Config.SESSION_IDLE_EXPIRES_SECONDS
+
+
+def test_missing_session_returns_empty(tmp_path):
+    """Unknown tokens produce no session, cookie or properties."""
+    db_url, _ = _session_db(tmp_path)
+    session = Session("unknown", db_url, "sqlite")
+
+    assert session.get() == (None, {})
+    assert session.properties == {}
+    assert session.expire is None
+
+
+def _read_session(db_url, token) -> tuple:
+    model = Model(db_url, "sqlite")
+    result = model.exec("session", "get", {
+        "sessionId": token, "open": Config.SESSION_OPEN['true'], "now": 0,
+    })
+    return result["rows"][0][4], result["rows"][0][5]
+
+
+def test_sliding_expiry_is_written_behind(tmp_path, monkeypatch):
+    """With the touch queue enabled the request thread only queues the update."""
+    db_url, token = _session_db(tmp_path, modified_ago=SECONDS_MINUTE * 20)
+    queue = SessionTouchQueue(flush_interval=60, batch_size=100, max_size=10)
+    monkeypatch.setattr(session_module, "session_touch_queue", queue)
+    calls = _count_exec(monkeypatch)
+    session = Session(token, db_url, "sqlite")
+
+    _, cookie = session.get()
+
+    assert calls == ["get"]
+    assert cookie[Config.SESSION_KEY]["max_age"] == Config.SESSION_IDLE_EXPIRES_SECONDS
+    assert queue.pending() == 1
+
+    queue.stop()
+
+    assert queue.pending() == 0
+    assert _read_session(db_url, token) == (session.now, session.expire)
+
+
+def test_touch_queue_coalesces_and_bounds(tmp_path):
+    """Repeated touches for a session are merged and a full buffer refuses new ones."""
+    db_url, token = _session_db(tmp_path)
+    queue = SessionTouchQueue(flush_interval=60, batch_size=100, max_size=1)
+
+    assert queue.touch(db_url, "sqlite", token, 10, 100)
+    assert queue.touch(db_url, "sqlite", token, 20, 200)
+    assert not queue.touch(db_url, "sqlite", "other", 20, 200)
+    assert not queue.touch("sqlite:///:memory:", "sqlite", token, 20, 200)
+
+    assert queue.flush() == 1
+    assert _read_session(db_url, token) == (20, 200)
+    queue.stop()
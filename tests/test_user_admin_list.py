@@ -0,0 +1,84 @@
+"""Tests for the batched admin user/profile listings."""
+
+# pylint: disable=duplicate-code
+
+from __future__ import annotations
+
+from app.bootstrap_db import bootstrap_databases
+from app.config import Config
+from constants import UNCONFIRMED
+from core.model import Model
+from core.user import User
+
+
+def _bootstrap_users(tmp_path, count: int) -> tuple[User, list[dict]]:
+    pwa_db = tmp_path / "pwa.db"
+    bootstrap_databases(
+        db_pwa_url=f"sqlite:///{pwa_db}",
+        db_pwa_type="sqlite",
+        db_safe_url=f"sqlite:///{tmp_path / 'safe.db'}",
+        db_safe_type="sqlite",
+        db_image_url=f"sqlite:///{tmp_path / 'image.db'}",
+        db_image_type="sqlite",
+    )
+    user = User(f"sqlite:///{pwa_db}", "sqlite")
+    created = []
+    for index in range(count):
+        result = user.create(
+            {
+                "alias": f"Admin List {index}",
+                "email": f"list{index}@example.com",
+                "password": "password123",
+                "birthdate": "2000-01-01",
+                "locale": "en",
+            }
+        )
+        assert result["success"] is True
+        created.append(result)
+    return user, created
+
+
+def _count_queries(monkeypatch) -> list:
+    calls = []
+    original_exec = Model.exec
+
+    def counting_exec(self, *args, **kwargs):
+        calls.append(args[1])
+        return original_exec(self, *args, **kwargs)
+
+    monkeypatch.setattr(Model, "exec", counting_exec)
+    return calls
+
+
+def test_admin_list_users_uses_constant_queries(tmp_path, monkeypatch):
+    """Profiles, roles and disabled flags are fetched once per page, not per user."""
+    user, created = _bootstrap_users(tmp_path, 4)
+    user.assign_role_to_profile(created[0]["profileId"], "admin")
+    user.set_profile_disabled(created[1]["profileId"], Config.DISABLED[UNCONFIRMED], "check")
+    calls = _count_queries(monkeypatch)
+
+    users = user.admin_list_users()
+
+    assert len(calls) == 5
+    by_id = {str(row["userId"]): row for row in users}
+    first = by_id[str(created[0]["userId"])]
+    second = by_id[str(created[1]["userId"])]
+    assert first["roles"] == ["admin"]
+    assert [p["profileId"] for p in first["profiles"]] == [str(created[0]["profileId"])]
+    assert any(item["reason"] == Config.DISABLED[UNCONFIRMED] for item in first["disabled"])
+    assert second["profile_disabled"][0]["profileId"] == str(created[1]["profileId"])
+    assert second["profile_disabled"][0]["description"] == "check"
+
+
+def test_admin_list_profiles_uses_constant_queries(tmp_path, monkeypatch):
+    """Profile roles and disabled flags are fetched once per page."""
+    user, created = _bootstrap_users(tmp_path, 3)
+    user.assign_role_to_profile(created[2]["profileId"], "moderator")
+    calls = _count_queries(monkeypatch)
+
+    profiles = user.admin_list_profiles()
+
+    assert len(calls) == 3
+    by_id = {str(row["user_profile"]["profileId"]): row for row in profiles}
+    assert by_id[str(created[2]["profileId"])]["roles"] == ["moderator"]
+    assert by_id[str(created[0]["profileId"])]["roles"] == []
@@ -0,0 +1,124 @@
+"""Tests for the runtime user cache and its invalidation."""
+
+# pylint: disable=duplicate-code
+
+from __future__ import annotations
+
+import pytest
+
+from app.bootstrap_db import bootstrap_databases
+from app.config import Config
+from constants import UNCONFIRMED
+from core import user as user_module
+from core.model import Model
+from core.user import User
+from core.user_cache import LocalUserCache, RuntimeUserCache
+
+
+@pytest.fixture(name="user_cache")
+def fixture_user_cache(monkeypatch):
+    """Use a fresh local cache per test."""
+    cache = RuntimeUserCache(LocalUserCache(ttl=60, max_entries=100))
+    monkeypatch.setattr(user_module, "runtime_user_cache", cache)
+    return cache
+
+
+def _create_user(tmp_path) -> tuple[User, dict]:
+    pwa_db = tmp_path / "pwa.db"
+    bootstrap_databases(
+        db_pwa_url=f"sqlite:///{pwa_db}",
+        db_pwa_type="sqlite",
+        db_safe_url=f"sqlite:///{tmp_path / 'safe.db'}",
+        db_safe_type="sqlite",
+        db_image_url=f"sqlite:///{tmp_path / 'image.db'}",
+        db_image_type="sqlite",
+    )
+    user = User(f"sqlite:///{pwa_db}", "sqlite")
+    created = user.create(
+        {
+            "alias": "Cached User",
+            "email": "cached@example.com",
+            "password": "password123",
+            "birthdate": "2000-01-01",
+            "locale": "en",
+        }
+    )
+    assert created["success"] is True
+    return user, created
+
+
+def _count_user_queries(monkeypatch) -> list:
+    calls = []
+    original_exec = Model.exec
+
+    def counting_exec(self, *args, **kwargs):
+        calls.append(args[1])
+        return original_exec(self, *args, **kwargs)
+
+    monkeypatch.setattr(Model, "exec", counting_exec)
+    return calls
+
+
+def test_local_cache_ttl_and_lru(monkeypatch):
+    """Entries expire after the TTL and the least recently used is evicted."""
+    now = [100.0]
+    monkeypatch.setattr("core.user_cache.time.monotonic", lambda: now[0])
+    cache = LocalUserCache(ttl=10, max_entries=2)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    now[0] += 11
+    assert cache.get("a") is None
+
+
+def test_runtime_user_is_served_from_cache(tmp_path, monkeypatch, user_cache):
+    """A second lookup skips the get-by-userid query and returns a private copy."""
+    user, created = _create_user(tmp_path)
+    first = user.get_runtime_user(created["userId"])
+    first["profile_roles"]["mutated"] = "mutated"
+    calls = _count_user_queries(monkeypatch)
+
+    second = user.get_runtime_user(created["userId"])
+
+    assert not calls
+    assert second["auth"] is True
+    assert "mutated" not in second["profile_roles"]
+    assert user_cache.get(created["userId"]) is not None
+
+
+def test_mutators_invalidate_cached_user(tmp_path, user_cache):
+    """Role, disabled and profile changes are visible on the next lookup."""
+    user, created = _create_user(tmp_path)
+    user_id = created["userId"]
+    before = user.get_runtime_user(user_id)
+    assert str(Config.DISABLED[UNCONFIRMED]) in before["user_disabled"].values()
+
+    user.delete_user_disabled(user_id, Config.DISABLED[UNCONFIRMED])
+    assert user_cache.get(user_id) is None
+    assert str(Config.DISABLED[UNCONFIRMED]) not in user.get_runtime_user(user_id)["user_disabled"].values()
+
+    assert user.assign_role_to_profile(created["profileId"], "admin") is True
+    assert user.get_runtime_user(user_id)["profile_roles"].get("admin") == "admin"
+
+    assert user.update_profile(created["profileId"], {"alias": "Renamed", "locale": "en"}) is True
+    assert user.get_runtime_user(user_id)["profile"]["alias"] == "Renamed"
+
+    assert user.delete_user(user_id) is True
+    assert user.get_runtime_user(user_id)["auth"] is False
+
+
+def test_pin_confirmation_at_login_invalidates_cached_user(tmp_path, user_cache):
+    """Confirming with a PIN at sign-in drops the cached unconfirmed user."""
+    user, created = _create_user(tmp_path)
+    user_id = created["userId"]
+    assert str(Config.DISABLED[UNCONFIRMED]) in user.get_runtime_user(user_id)["user_disabled"].values()
+
+    assert user.check_login("cached@example.com", "password123", created["pin"]) is not None
+
+    assert user_cache.get(user_id) is None
+    assert str(Config.DISABLED[UNCONFIRMED]) not in user.get_runtime_user(user_id)["user_disabled"].values()